@@ -7,60 +7,37 @@ Date: July 2025
 
 Inputs:
 - The maximum and Minimum values of the parameters to be varied
+- The fixed parameters (extrusion, angle_1, angle_2), filled in for every design point
+- seed, the same seed gives the same Sobol points and ply stacks
+- mode:
+    "new"       fresh DOE of n_samples points
+    "extend"    add n_samples points by continuing the same Sobol stream (state kept in state_file)
+    "adaptive"  add the n_samples points of a large candidate pool where the current RSM bank
+                (Superposition data, same model as '3_Final_GA_RSM.py') is least certain (fea_ga/sampling.py)
+
+The balanced symmetric ply stacks are built directly for all samples at once (fea_ga/layup.py),
+no more redraw-until-balanced loop per row.
 
 Outputs:
-- sobol_composites_10_to_100_plies.csv
+- sobol_composites.npz                      packed DOE read by the downstream stages (fea_ga/doe.py)
+- sobol_composites_10_to_100_plies.csv      wide table, only for pasting into Ansys
+                                            (extend/adaptive: only the new design points)
+- sobol_composites_state.json               Sobol seed and number of points drawn, used by "extend"
 
 Warning:
-- The CSV generaed wont have all the values, will have to input the dp no. and the Extrusion, Angle1, Angle2 using excel.
 - While copying to Ansys, make sure you replace TRUE with 'True and FALSE with 'False, or it will show error
 """
 
+import os
+import sys
 import numpy as np
-import pandas as pd
 from scipy.stats import qmc
-import random
-from collections import Counter
-
-# --- Ply layup generation helpers ---
-def is_balanced(sequence):
-    counts = Counter()
-    for angle in sequence:
-        if abs(angle) not in [0, 90]:
-            counts[abs(angle)] += angle // abs(angle)
-    return all(count == 0 for count in counts.values())
-
-def generate_symmetric_balanced_laminate(n):
-    base_angles = [0, 45, 90]
-    if n % 2 == 0:
-        half_n = n // 2
-        while True:
-            half_sequence = []
-            for _ in range(half_n):
-                base_angle = random.choice(base_angles)
-                if base_angle in [0, 90]:
-                    half_sequence.append(base_angle)
-                else:
-                    sign = random.choice([1, -1])
-                    half_sequence.append(sign * base_angle)
-            full_sequence = half_sequence + list(reversed(half_sequence))
-            if is_balanced(full_sequence):
-                return full_sequence
-    else:
-        half_n = (n - 1) // 2
-        middle_ply = random.choice([0, 90])
-        while True:
-            half_sequence = []
-            for _ in range(half_n):
-                base_angle = random.choice(base_angles)
-                if base_angle in [0, 90]:
-                    half_sequence.append(base_angle)
-                else:
-                    sign = random.choice([1, -1])
-                    half_sequence.append(sign * base_angle)
-            full_sequence = half_sequence + [middle_ply] + list(reversed(half_sequence))
-            if is_balanced(full_sequence):
-                return full_sequence
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.layup import generate_layups, random_ply_counts, active_mask
+from fea_ga.doe import GEOMETRY_COLUMNS, DOE, concat_doe, doe_from_padded, load_doe, save_doe, export_ansys_csv
+from fea_ga.features import rsm_inputs
+from fea_ga.sampling import AdaptiveSampler, load_sobol_state, read_training_sets, save_sobol_state, sobol_stream
 
 # --- Geometric parameter bounds ---
 param_bounds = {
@@ -70,43 +47,85 @@ param_bounds = {
     "frame_fillet_radius": ((0.7*25), (1.3*25)),
 }
 
-n_samples = 4000
+# --- Parameters kept constant over the DOE ---
+fixed_params = {
+    "extrusion": 200,
+    "angle_1": 10,
+    "angle_2": 20,
+}
+
+mode = "new"                                            # "new", "extend" or "adaptive"
+n_samples = 4000                                        # new: size of the DOE, extend/adaptive: points to add
 min_plies = 10
 max_plies = 100
+seed = 2025                                             # Same seed gives the same DOE, change it for a new one
 
-# Sobol sampling for geometric parameters
-l_bounds = np.array([v[0] for v in param_bounds.values()])
-u_bounds = np.array([v[1] for v in param_bounds.values()])
-sampler = qmc.Sobol(d=len(param_bounds), scramble=True)
-sample = sampler.random_base2(m=12)
-scaled_sample = qmc.scale(sample, l_bounds, u_bounds)[:n_samples]
-
-# --- Build dataset ---
-rows = []
-
-for i in range(n_samples):
-    row = list(scaled_sample[i])
-    
-    # Random number of plies between 20 and 50
-    n_plies = random.randint(min_plies, max_plies)
-    layup = generate_symmetric_balanced_laminate(n_plies)
-
-    # Pad angles and active flags
-    padded_angles = layup + [0] * (max_plies - len(layup))
-    active_flags = [1]*len(layup) + [0]*(max_plies - len(layup))
-
+doe_file = "sobol_composites.npz"
+state_file = "sobol_composites_state.json"
+ansys_csv_file = "sobol_composites_10_to_100_plies.csv"   # Set to None to skip the CSV for Ansys
 
-    row.extend(padded_angles)
-    row.extend(active_flags)
-    rows.append(row)
+# --- Adaptive mode only ---
+superposition_path = r"C:\Pranav_folders\Pranav6.1\Entire_thing\Superposition"     # Change the Address here
+n_candidates = 2**16
+adaptive_score = "variance"                             # "variance" or "loo"
 
-# Column names
-columns = list(param_bounds.keys())
-columns += [f"ply_angle_{i+1}" for i in range(max_plies)]
-columns += [f"ply_active_{i+1}" for i in range(max_plies)]
+l_bounds = np.array([v[0] for v in param_bounds.values()])
+u_bounds = np.array([v[1] for v in param_bounds.values()])
 
-# Create DataFrame and export
-df = pd.DataFrame(rows, columns=columns)
-df.to_csv("sobol_composites_10_to_100_plies.csv", index=False)
 
-print("✅ 4000 samples with 10–100 ply stacks saved.")
+def build_points(unit_sample, first_dp, rng):
+    """DOE rows from Sobol points in [0, 1)^d, with fresh balanced symmetric stacks."""
+    n = len(unit_sample)
+    sampled = dict(zip(param_bounds.keys(), qmc.scale(unit_sample, l_bounds, u_bounds).T))
+    geometry = np.column_stack([
+        sampled[name] if name in sampled else np.full(n, float(fixed_params[name]))
+        for name in GEOMETRY_COLUMNS
+    ])
+    ply_counts = random_ply_counts(n, min_plies, max_plies, rng)
+    ply_angles = generate_layups(ply_counts, max_plies, rng)
+    return doe_from_padded(np.arange(first_dp, first_dp + n), geometry, GEOMETRY_COLUMNS,
+                           ply_angles, active_mask(ply_counts, max_plies))
+
+
+if mode == "new":
+    # Sobol sampling for geometric parameters, drawn as a power of 2 block
+    sampler = sobol_stream(len(param_bounds), seed)
+    sample = sampler.random_base2(m=int(np.ceil(np.log2(n_samples))))
+    new_points = build_points(sample[:n_samples], 0, np.random.default_rng([seed, 0]))
+    doe = new_points
+    num_generated = len(sample)
+
+elif mode in ("extend", "adaptive"):
+    state = load_sobol_state(state_file)
+    seed = state["seed"]
+    num_generated = state["num_generated"]
+    doe = load_doe(doe_file)
+    first_dp = int(doe.design_points.max()) + 1
+    rng = np.random.default_rng([seed, num_generated, len(doe)])
+
+    if mode == "extend":
+        # Continue the same scrambled stream where the last run stopped
+        sampler = sobol_stream(len(param_bounds), seed, num_generated)
+        new_points = build_points(sampler.random(n_samples), first_dp, rng)
+        num_generated += n_samples
+    else:
+        # Separate candidate stream, the main stream is left untouched
+        candidate_sampler = qmc.Sobol(d=len(param_bounds), scramble=True, seed=rng)
+        candidates = build_points(candidate_sampler.random(n_candidates), first_dp, rng)
+        picker = AdaptiveSampler(read_training_sets(superposition_path), score=adaptive_score)
+        chosen = candidates.take(picker.select(rsm_inputs(candidates), n_samples))
+        new_points = DOE(np.arange(first_dp, first_dp + len(chosen)), chosen.geometry,
+                         chosen.geometry_names, chosen.ply_angles, chosen.ply_offsets)
+    doe = concat_doe(doe, new_points)
+
+else:
+    raise ValueError(f"❌ Unknown mode '{mode}', use 'new', 'extend' or 'adaptive'.")
+
+# --- Save the DOE, the stream state and the CSV of the points to run in Ansys ---
+save_doe(doe, doe_file)
+save_sobol_state(state_file, seed, len(param_bounds), num_generated, param_bounds)
+if ansys_csv_file:
+    export_ansys_csv(new_points, ansys_csv_file, max_plies)
+
+print(f"✅ {len(new_points)} new samples with {min_plies}–{max_plies} ply stacks, "
+      f"{len(doe)} in total saved to {doe_file}.")
@@ -0,0 +1,232 @@
+"""
+Crash-safe Transfer of Design Point Exports
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Copies the 'Nodes' and 'stresses_load_N' folders of a solved design point from the Ansys working
+directory to destination_base/dpX. Imported by 'Mechanical_python_code.py' and usable from plain
+Python (IronPython 2.7 compatible, no numpy):
+
+    python dp_transfer.py verify <destination_base>
+
+- Every file is streamed in chunks to '<name>.part', checked against the source size, and renamed
+  into place, so a crash never leaves a half written file under its real name.
+- Once all files of one (dp, load) group are in place, one line with their sizes and SHA-1 checksums
+  is appended to destination_base/transfer_manifest.jsonl. Groups that are not in the manifest were
+  not copied completely and get copied again.
+- The destination dp index comes from the manifest: the Workbench dp index plus an offset. The offset
+  stays the same while the Workbench index keeps increasing or repeats (the same dp solved again is
+  completed in place). When the index starts again (Ansys was restarted with the remaining parameters)
+  the new offset continues after the highest dp in the manifest, so no dp that was copied, completely
+  or in part, is written over.
+  This replaces the hand edited 'crash' value, which can still be given to force an offset.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+CHUNK_SIZE = 1 << 20
+MANIFEST_NAME = "transfer_manifest.jsonl"
+LOAD_GROUPS = ["stresses_load_{0}".format(i) for i in range(1, 7)]
+GROUPS = ["Nodes"] + LOAD_GROUPS
+
+
+def group_load(group):
+    """Load case number of a group folder, None for 'Nodes'."""
+    if group.startswith("stresses_load_"):
+        return int(group[len("stresses_load_"):])
+    return None
+
+
+def source_dp_index(workdir):
+    """Workbench design point index, taken from the 'dpX' part of the working directory."""
+    for part in workdir.replace("\\", "/").split("/"):
+        if part.startswith("dp") and part[2:].isdigit():
+            return int(part[2:])
+    return None
+
+
+def _replace(src, dst):
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+    else:                                   # Python 2, rename does not overwrite on Windows
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def copy_file(src, dst, chunk_size=CHUNK_SIZE):
+    """Stream src to dst through a temp file, returns (size, sha1)."""
+    tmp = dst + ".part"
+    digest = hashlib.sha1()
+    size = 0
+    try:
+        with open(src, "rb") as fsrc:
+            with open(tmp, "wb") as fdst:
+                while True:
+                    chunk = fsrc.read(chunk_size)
+                    if not chunk:
+                        break
+                    fdst.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                fdst.flush()
+                os.fsync(fdst.fileno())
+        expected = os.path.getsize(src)
+        if size != expected:
+            raise IOError("Copied {0} of {1} bytes from {2}".format(size, expected, src))
+        _replace(tmp, dst)
+    except Exception:
+        if os.path.exists(tmp):             # no '.part' left in the dp folder, whatever failed
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        raise
+    return size, digest.hexdigest()
+
+
+def file_checksum(path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TransferManifest(object):
+    """Append-only record of the (dp, load) groups that reached the destination completely."""
+
+    def __init__(self, destination_base):
+        self.destination_base = destination_base
+        self.path = os.path.join(destination_base, MANIFEST_NAME)
+        self.entries = []
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        self.entries.append(json.loads(line))
+                    except ValueError:
+                        pass                # a line cut off by a crash, that group is simply not complete
+
+    def completed_groups(self):
+        return set((e["dp"], e["group"]) for e in self.entries)
+
+    def completed_dps(self, groups=GROUPS):
+        done = self.completed_groups()
+        return sorted(set(dp for dp, _ in done if all((dp, g) in done for g in groups)))
+
+    def next_offset(self, source_index):
+        """
+        Offset between Workbench and destination dp index for a newly solved design point: the same as the
+        last entry while the Workbench index does not go back, after the highest dp of the manifest when it
+        does (restart).
+        """
+        if not self.entries:
+            return 0
+        last = self.entries[-1]
+        if source_index >= last["source_index"]:
+            return last["offset"]
+        return max(e["dp"] for e in self.entries) + 1 - source_index
+
+    def record(self, dp, group, source_index, offset, files):
+        entry = {
+            "dp": dp,
+            "group": group,
+            "load": group_load(group),
+            "source_index": source_index,
+            "offset": offset,
+            "files": files,
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries.append(entry)
+
+
+def transfer_group(src_dir, dst_dir):
+    """Copy one folder, returns ([{path, size, sha1}], [(path, error)])."""
+    files, failures = [], []
+    for root, dirs, names in os.walk(src_dir):
+        rel_root = os.path.relpath(root, src_dir)
+        target_dir = os.path.normpath(os.path.join(dst_dir, rel_root))
+        if not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+        for name in sorted(names):
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            try:
+                size, sha1 = copy_file(os.path.join(root, name), os.path.join(target_dir, name))
+                files.append({"path": rel_path.replace("\\", "/"), "size": size, "sha1": sha1})
+            except (IOError, OSError) as e:
+                failures.append((os.path.join(root, name), str(e)))
+    return files, failures
+
+
+def transfer_design_point(workdir, destination_base, groups=GROUPS, crash=None):
+    """
+    Copy the groups of one solved design point, returns (dp_name, failures).
+    crash forces the offset like the old hand edited value, None derives it from the manifest.
+    """
+    source_index = source_dp_index(workdir)
+    if source_index is None:
+        return None, [(workdir, "No dpX folder in the working directory path")]
+    if not os.path.exists(destination_base):
+        os.makedirs(destination_base)
+
+    manifest = TransferManifest(destination_base)
+    offset = manifest.next_offset(source_index) if crash is None else crash
+    dp = source_index + offset
+    dp_name = "dp{0}".format(dp)
+    dp_path = os.path.join(destination_base, dp_name)
+
+    failures = []
+    for group in groups:
+        src_path = os.path.join(workdir, group)
+        if not os.path.exists(src_path):
+            failures.append((src_path, "Folder not found"))
+            continue
+        files, group_failures = transfer_group(src_path, os.path.join(dp_path, group))
+        if group_failures or not files:
+            failures.extend(group_failures or [(src_path, "Folder is empty")])
+            continue
+        manifest.record(dp, group, source_index, offset, files)
+    return dp_name, failures
+
+
+def verify_destination(destination_base):
+    """Re-check size and checksum of every manifest file, returns [(dp, group, path, problem)]."""
+    problems = []
+    manifest = TransferManifest(destination_base)
+    latest = {}
+    for entry in manifest.entries:
+        latest[(entry["dp"], entry["group"])] = entry
+    for (dp, group), entry in sorted(latest.items()):
+        for item in entry["files"]:
+            path = os.path.join(destination_base, "dp{0}".format(dp), group, item["path"])
+            if not os.path.exists(path):
+                problems.append((dp, group, path, "missing"))
+            elif os.path.getsize(path) != item["size"]:
+                problems.append((dp, group, path, "size"))
+            elif file_checksum(path) != item["sha1"]:
+                problems.append((dp, group, path, "checksum"))
+    return problems
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "verify":
+        found = verify_destination(sys.argv[2])
+        for dp, group, path, problem in found:
+            print("dp{0} {1}: {2} ({3})".format(dp, group, path, problem))
+        print("{0} problem(s) found".format(len(found)))
+        sys.exit(1 if found else 0)
+    print("Usage: python dp_transfer.py verify <destination_base>")
+    sys.exit(2)
@@ -0,0 +1,228 @@
+"""
+Result Objects and Text Export for Ansys Mechanical
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Imported by 'Mechanical_python_code.py' inside Mechanical, and plain Python otherwise, so it has to
+stay IronPython 2.7 compatible (no f-strings, no numpy).
+
+The stress results to insert are listed in RESULT_TABLE, one row per result object:
+
+    (label, layer selector, stress component, shell position, load steps)
+
+- label             file name of the export, the 2 digit prefix keeps the sorted file order equal to
+                    the table order, which is the order of STRESS_LABELS in '1_Extract.py'
+- layer selector    "first", "middle", "last" or a 1-based ply number
+- stress component  SX, SY, SZ, SXY, SYZ, SXZ, or UTOT for the total deformation (no layer/position)
+- shell position    "Top", "Middle" or "Bottom"
+- load steps        the result sets to export, ALL_LOAD_STEPS for every load case
+
+Every result is scoped to the union of the le_* / te_* node components written to 'Nodes/*.node' by
+'Mechanical_APDL_code.txt', so each export only holds the nodes that are post-processed.
+
+All calls into the Mechanical API go through MechanicalSession, everything else is plain Python
+and can be run against a fake session or a fake ExtAPI outside Ansys.
+"""
+
+import os
+
+ALL_LOAD_STEPS = (1, 2, 3, 4, 5, 6)
+
+# Stress component -> (Mechanical result type, NormalOrientationType member)
+STRESS_COMPONENTS = {
+    "SX": ("Normal", "XAxis"),
+    "SY": ("Normal", "YAxis"),
+    "SZ": ("Normal", "ZAxis"),
+    "SXY": ("Shear", "XYAxis"),
+    "SYZ": ("Shear", "YZAxis"),
+    "SXZ": ("Shear", "XZAxis"),
+}
+
+# Ply1 = first ply, Ply2 = last ply, Ply3 = middle ply, as in the hand written version
+LAYERS = [("Ply1", "first"), ("Ply2", "last"), ("Ply3", "middle")]
+COMPONENT_ORDER = ["SX", "SY", "SZ", "SXY", "SYZ", "SXZ"]
+
+RESULT_TABLE = [
+    ("{0:02d}_{1}_{2}".format(i * len(COMPONENT_ORDER) + j + 1, ply, comp), layer, comp, "Middle", ALL_LOAD_STEPS)
+    for i, (ply, layer) in enumerate(LAYERS)
+    for j, comp in enumerate(COMPONENT_ORDER)
+] + [
+    ("19_Total_Deformation", None, "UTOT", None, ALL_LOAD_STEPS),
+]
+
+EXPORT_SELECTION_NAME = "export_nodes"
+EXPORT_COMPONENT_PREFIXES = ("le_", "te_")
+
+
+# =========================== Plain Python logic ===========================
+def resolve_layer(selector, num_plies):
+    if selector == "first":
+        return 1
+    if selector == "last":
+        return num_plies
+    if selector == "middle":
+        return (num_plies + 1) // 2
+    layer = int(selector)
+    if not 1 <= layer <= num_plies:
+        raise ValueError("Layer {0} outside 1..{1}".format(layer, num_plies))
+    return layer
+
+
+def read_node_file(path):
+    """Node numbers of an NWRITE file, the first field may run into a negative coordinate."""
+    node_ids = []
+    with open(path) as f:
+        for line in f:
+            token = line.strip().split()
+            if token:
+                node_ids.append(int(token[0].split("-")[0]))
+    return node_ids
+
+
+def export_node_ids(node_dir, prefixes=EXPORT_COMPONENT_PREFIXES):
+    """Sorted union of the node numbers of every le_* / te_* .node file."""
+    nodes = set()
+    for name in os.listdir(node_dir):
+        if name.endswith(".node") and name.lower().startswith(prefixes):
+            nodes.update(read_node_file(os.path.join(node_dir, name)))
+    return sorted(nodes)
+
+
+def create_results(session, table, num_plies, selection=None):
+    """Insert one result object per table row, returns [(row, result)]."""
+    created = []
+    for row in table:
+        label, layer, component, position, _ = row
+        if component == "UTOT":
+            result = session.add_deformation(label)
+        else:
+            kind, axis = STRESS_COMPONENTS[component]
+            result = session.add_stress(label, kind, axis, resolve_layer(layer, num_plies), position)
+        if selection is not None:
+            session.scope(result, selection)
+        created.append((row, result))
+    return created
+
+
+def export_results(session, created, workdir):
+    """Evaluate once per load step and export every result that asks for that step."""
+    steps = sorted(set(step for row, _ in created for step in row[4]))
+    written = []
+    for load_case in steps:
+        output_folder = os.path.join(workdir, "stresses_load_{0}".format(load_case))
+        if not os.path.exists(output_folder):
+            os.mkdir(output_folder)
+        results = [(row, result) for row, result in created if load_case in row[4]]
+        session.set_load_step([result for _, result in results], load_case)
+        session.evaluate()
+        for row, result in results:
+            export_path = os.path.join(output_folder, "{0}.txt".format(row[0]))
+            session.export(result, export_path)
+            written.append((load_case, export_path))
+    return written
+
+
+def run_exports(session, table=RESULT_TABLE, scope_to_components=True):
+    """Everything after_solve does up to the copy: insert, scope, evaluate and export the results."""
+    session.delete_text_exports()
+    num_plies = session.count_plies()
+    if not num_plies:
+        raise ValueError("No plies found in ModelingGroup.1")
+    print("Number of plies in ModelingGroup.1: {0}".format(num_plies))
+
+    selection = None
+    node_dir = os.path.join(session.working_dir, "Nodes")
+    if scope_to_components and os.path.isdir(node_dir):
+        node_ids = export_node_ids(node_dir)
+        if node_ids:
+            selection = session.node_selection(EXPORT_SELECTION_NAME, node_ids)
+            print("Exports scoped to {0} le/te nodes".format(len(node_ids)))
+
+    created = create_results(session, table, num_plies, selection)
+    return export_results(session, created, session.working_dir)
+
+
+# =========================== Mechanical API ===========================
+class MechanicalSession(object):
+    """
+    Thin wrapper over ExtAPI. The Mechanical enums only exist in the Python Code object's namespace,
+    so they are handed over from there.
+    """
+
+    def __init__(self, ext_api, ShellFaceType, NormalOrientationType, SetDriverStyle, SelectionTypeEnum):
+        self.ext_api = ext_api
+        self.model = ext_api.DataModel.Project.Model
+        self.analysis = self.model.Analyses[0]
+        self.solution = self.analysis.Solution
+        self.ShellFaceType = ShellFaceType
+        self.NormalOrientationType = NormalOrientationType
+        self.SetDriverStyle = SetDriverStyle
+        self.SelectionTypeEnum = SelectionTypeEnum
+
+    @property
+    def working_dir(self):
+        return self.analysis.WorkingDir
+
+    def delete_text_exports(self):
+        for result in list(self.solution.Children):
+            if hasattr(result, "ExportToTextFile"):
+                result.Delete()
+
+    def _child(self, parent, name_part):
+        if parent is None:
+            return None
+        for child in parent.Children:
+            if name_part in child.Name:
+                return child
+        return None
+
+    def count_plies(self):
+        # Model -> Imported Plies -> ACP (Pre) -> ModelingGroup.1
+        imported_plies = self._child(self.model, "Imported Plies")
+        acp_pre = self._child(imported_plies, "ACP (Pre)")
+        modeling_group = self._child(acp_pre, "ModelingGroup.1")
+        return len(modeling_group.Children) if modeling_group is not None else 0
+
+    def add_stress(self, name, kind, axis, layer, position):
+        if kind == "Normal":
+            result = self.solution.AddNormalStress()
+        else:
+            result = self.solution.AddShearStress()
+        result.Name = name
+        result.Layer = layer
+        result.Position = getattr(self.ShellFaceType, position)
+        result.NormalOrientation = getattr(self.NormalOrientationType, axis)
+        result.By = self.SetDriverStyle.ResultSet         # ResultSet so the load case can be changed easily
+        return result
+
+    def add_deformation(self, name):
+        result = self.solution.AddTotalDeformation()
+        result.Name = name
+        result.By = self.SetDriverStyle.ResultSet
+        return result
+
+    def node_selection(self, name, node_ids):
+        if self.model.NamedSelections is not None:
+            for ns in list(self.model.NamedSelections.Children):
+                if ns.Name == name:
+                    ns.Delete()
+        selection = self.ext_api.SelectionManager.CreateSelectionInfo(self.SelectionTypeEnum.MeshNodes)
+        selection.Ids = list(node_ids)
+        named = self.model.AddNamedSelection()
+        named.Name = name
+        named.Location = selection
+        return named
+
+    def scope(self, result, selection):
+        result.Location = selection
+
+    def set_load_step(self, results, step):
+        for result in results:
+            result.SetNumber = step
+
+    def evaluate(self):
+        self.solution.EvaluateAllResults()
+
+    def export(self, result, path):
+        result.ExportToTextFile(path)
@@ -0,0 +1,35 @@
+"""
+Pack the Exports of one Design Point into a single Bundle
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Optional step at solve time, started by 'Mechanical_python_code.py' with a CPython that has numpy
+(Mechanical's own Python has none). Can also be run by hand on design points already copied:
+
+    python pack_dp_bundle.py <dp folder> [<dp folder> ...] [--compress]
+
+Reads 'Nodes/*.node' and 'stresses_load_N/*.txt' of the folder and writes 'Bundle/dp_bundle.npz'
+(format in fea_ga/dp_bundle.py), which '1_Extract.py' reads instead of the text files.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.dp_bundle import pack_design_point
+
+if __name__ == "__main__":
+    compress = "--compress" in sys.argv[1:]
+    folders = [arg for arg in sys.argv[1:] if arg != "--compress"]
+    if not folders:
+        print("Usage: python pack_dp_bundle.py <dp folder> [<dp folder> ...] [--compress]")
+        sys.exit(2)
+    failed = 0
+    for folder in folders:
+        try:
+            print(f"📦 Packed {pack_design_point(folder, compress=compress)}")
+        except Exception as e:
+            print(f"❌ Could not pack {folder}: {e}")
+            failed += 1
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,111 @@
+"""
+Checks of dp_transfer.py
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Plain Python, no Ansys needed (also collected by pytest):
+
+    python test_dp_transfer.py
+
+- A restart after a manifest with a gap (one group of dp2 missing) continues after the highest dp and
+  never writes into a dp that is already there.
+- The same Workbench dp solved again is completed in place.
+- A copy that fails half way leaves no '<name>.part' behind.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import dp_transfer
+
+
+def make_workdir(root, source_index, groups):
+    workdir = os.path.join(root, "wb", "dp{0}".format(source_index))
+    for group in groups:
+        folder = os.path.join(workdir, group)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(os.path.join(folder, "values.txt"), "w") as f:
+            f.write("dp{0} {1}\n".format(source_index, group))
+    return workdir
+
+
+def manifest_with_gap(destination):
+    """dp0 ... dp9 recorded with offset 0, stresses_load_3 of dp2 missing."""
+    manifest = dp_transfer.TransferManifest(destination)
+    for dp in range(10):
+        for group in dp_transfer.GROUPS:
+            if (dp, group) != (2, "stresses_load_3"):
+                manifest.record(dp, group, dp, 0, [{"path": "values.txt", "size": 1, "sha1": "x"}])
+    return manifest
+
+
+def test_restart_continues_after_highest_dp():
+    root = tempfile.mkdtemp()
+    try:
+        destination = os.path.join(root, "out")
+        os.makedirs(destination)
+        manifest = manifest_with_gap(destination)
+        assert manifest.completed_dps() == [0, 1, 3, 4, 5, 6, 7, 8, 9]
+
+        for source_index, expected in [(0, "dp10"), (1, "dp11"), (2, "dp12")]:
+            workdir = make_workdir(root, source_index, dp_transfer.GROUPS)
+            dp_name, failures = dp_transfer.transfer_design_point(workdir, destination)
+            assert not failures, failures
+            assert dp_name == expected, (source_index, dp_name)
+        for dp in range(10):
+            assert not os.path.exists(os.path.join(destination, "dp{0}".format(dp)))
+    finally:
+        shutil.rmtree(root)
+
+
+def test_same_source_is_completed_in_place():
+    root = tempfile.mkdtemp()
+    try:
+        destination = os.path.join(root, "out")
+        os.makedirs(destination)
+        manifest_with_gap(destination)
+        workdir = make_workdir(root, 9, dp_transfer.GROUPS)
+        dp_name, failures = dp_transfer.transfer_design_point(workdir, destination)
+        assert not failures, failures
+        assert dp_name == "dp9", dp_name
+        assert dp_transfer.TransferManifest(destination).next_offset(9) == 0
+    finally:
+        shutil.rmtree(root)
+
+
+def test_failed_copy_leaves_no_part_file():
+    root = tempfile.mkdtemp()
+    fsync = dp_transfer.os.fsync
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    try:
+        src = os.path.join(root, "values.txt")
+        with open(src, "w") as f:
+            f.write("stresses\n")
+        dst = os.path.join(root, "copy.txt")
+        dp_transfer.os.fsync = failing_fsync
+        try:
+            dp_transfer.copy_file(src, dst)
+            raise AssertionError("copy_file did not raise")
+        except OSError:
+            pass
+        finally:
+            dp_transfer.os.fsync = fsync
+        assert not os.path.exists(dst + ".part")
+        assert not os.path.exists(dst)
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print("{0}: ok".format(name))
@@ -0,0 +1,230 @@
+"""
+Checks of mechanical_results.py against a Fake ExtAPI
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Plain Python, no Ansys needed (also collected by pytest):
+
+    python test_mechanical_results.py
+
+A small stand-in for the part of ExtAPI that MechanicalSession uses (model tree with the ACP plies,
+solution, named selections, selection manager) records every result object that is inserted and every
+export. The checks:
+
+- one result per RESULT_TABLE row, with its name, normal/shear kind, layer, shell position, orientation
+- old text exports and an old export named selection are deleted first
+- every result is scoped to one named selection holding the union of the le_* / te_* nodes only
+- every result is exported once per load step, with the load step set when it is written
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import mechanical_results
+
+
+# =========================== Fake ExtAPI ===========================
+class Enum(object):
+    """ShellFaceType.Middle -> "Middle", and so on."""
+
+    def __getattr__(self, name):
+        return name
+
+
+class Node(object):
+    def __init__(self, name, children=None, parent=None):
+        self.Name = name
+        self.Children = list(children or [])
+        self.parent = parent
+        self.deleted = False
+
+    def Delete(self):
+        self.deleted = True
+        self.parent.Children.remove(self)
+
+
+class FakeResult(Node):
+    def __init__(self, kind, parent, log):
+        Node.__init__(self, "", parent=parent)
+        self.kind = kind
+        self.log = log
+        self.SetNumber = None
+        self.Location = None
+        self.Layer = self.Position = self.NormalOrientation = self.By = None
+
+    def ExportToTextFile(self, path):
+        self.log.append((self.Name, self.SetNumber, path))
+        with open(path, "w") as f:
+            f.write("{0} {1}\n".format(self.Name, self.SetNumber))
+
+
+class FakeSolution(Node):
+    def __init__(self):
+        Node.__init__(self, "Solution")
+        self.exports = []
+        self.evaluations = 0
+
+    def _add(self, kind):
+        result = FakeResult(kind, self, self.exports)
+        self.Children.append(result)
+        return result
+
+    def AddNormalStress(self):
+        return self._add("Normal")
+
+    def AddShearStress(self):
+        return self._add("Shear")
+
+    def AddTotalDeformation(self):
+        return self._add("Deformation")
+
+    def EvaluateAllResults(self):
+        self.evaluations += 1
+
+
+class FakeSelectionInfo(object):
+    def __init__(self, selection_type):
+        self.selection_type = selection_type
+        self.Ids = []
+
+
+class FakeSelectionManager(object):
+    def CreateSelectionInfo(self, selection_type):
+        return FakeSelectionInfo(selection_type)
+
+
+class FakeModel(Node):
+    def __init__(self, num_plies, working_dir):
+        Node.__init__(self, "Model")
+        group = Node("ModelingGroup.1", [Node("Ply.{0}".format(i + 1)) for i in range(num_plies)])
+        self.Children = [Node("Geometry"), Node("Imported Plies", [Node("ACP (Pre)", [group])])]
+        self.NamedSelections = Node("Named Selections")
+        self.solution = FakeSolution()
+        self.Analyses = [Node("Static Structural")]
+        self.Analyses[0].Solution = self.solution
+        self.Analyses[0].WorkingDir = working_dir
+
+    def AddNamedSelection(self):
+        named = Node("Selection", parent=self.NamedSelections)
+        self.NamedSelections.Children.append(named)
+        return named
+
+
+class FakeExtAPI(object):
+    def __init__(self, model):
+        self.SelectionManager = FakeSelectionManager()
+        self.DataModel = Node("DataModel")
+        self.DataModel.Project = Node("Project")
+        self.DataModel.Project.Model = model
+
+
+def fake_session(num_plies, working_dir):
+    model = FakeModel(num_plies, working_dir)
+    session = mechanical_results.MechanicalSession(FakeExtAPI(model), Enum(), Enum(), Enum(), Enum())
+    return session, model
+
+
+def write_node_files(working_dir):
+    """le_1, te_r_2 and a hub component that is not exported; node 7 is in le_1 and te_r_2."""
+    node_dir = os.path.join(working_dir, "Nodes")
+    os.makedirs(node_dir)
+    files = {
+        "le_1.node": ["       3 1.0E+00 2.0E+00 0.0E+00", "       7-1.5E+00 2.0E+00 0.0E+00"],
+        "te_r_2.node": ["       7 1.0E+00 2.0E+00 0.0E+00", "      12 1.0E+00-2.0E+00 0.0E+00"],
+        "hub.node": ["      99 1.0E+00 2.0E+00 0.0E+00"],
+    }
+    for name, lines in files.items():
+        with open(os.path.join(node_dir, name), "w") as f:
+            f.write("\n".join(lines) + "\n")
+    return [3, 7, 12]
+
+
+# =========================== Checks ===========================
+def test_results_of_the_table_scoped_and_exported():
+    working_dir = tempfile.mkdtemp()
+    try:
+        le_te_nodes = write_node_files(working_dir)
+        num_plies = 8
+        session, model = fake_session(num_plies, working_dir)
+        solution = model.solution
+        old_export = FakeResult("Normal", solution, solution.exports)
+        old_export.Name = "old"
+        solution.Children.append(old_export)
+        old_selection = Node(mechanical_results.EXPORT_SELECTION_NAME, parent=model.NamedSelections)
+        model.NamedSelections.Children.append(old_selection)
+
+        written = mechanical_results.run_exports(session)
+
+        assert old_export.deleted and old_selection.deleted
+
+        # One result per row of the table
+        table = mechanical_results.RESULT_TABLE
+        results = [r for r in solution.Children if isinstance(r, FakeResult)]
+        assert [r.Name for r in results] == [row[0] for row in table]
+        for (label, layer, component, position, _), result in zip(table, results):
+            if component == "UTOT":
+                assert result.kind == "Deformation"
+                continue
+            kind, axis = mechanical_results.STRESS_COMPONENTS[component]
+            assert result.kind == kind, label
+            assert result.NormalOrientation == axis, label
+            assert result.Position == position, label
+            assert result.Layer == {"first": 1, "last": num_plies, "middle": 4}[layer], label
+            assert result.By == "ResultSet", label
+
+        # Every result on one named selection of the le_* / te_* nodes, the hub node left out
+        assert len(model.NamedSelections.Children) == 1
+        selection = model.NamedSelections.Children[0]
+        assert selection.Name == mechanical_results.EXPORT_SELECTION_NAME
+        assert selection.Location.selection_type == "MeshNodes"
+        assert sorted(selection.Location.Ids) == le_te_nodes
+        assert all(r.Location is selection for r in results)
+
+        # Every result exported once per load step, after the load step was set
+        steps = mechanical_results.ALL_LOAD_STEPS
+        assert solution.evaluations == len(steps)
+        assert len(solution.exports) == len(written) == len(table) * len(steps)
+        for name, set_number, path in solution.exports:
+            folder = os.path.basename(os.path.dirname(path))
+            assert folder == "stresses_load_{0}".format(set_number), (name, path)
+            assert os.path.basename(path) == name + ".txt"
+        for step in steps:
+            exported = sorted(os.listdir(os.path.join(working_dir, "stresses_load_{0}".format(step))))
+            assert exported == sorted(row[0] + ".txt" for row in table)
+    finally:
+        shutil.rmtree(working_dir)
+
+
+def test_no_node_files_means_no_scoping():
+    working_dir = tempfile.mkdtemp()
+    try:
+        session, model = fake_session(3, working_dir)
+        mechanical_results.run_exports(session)
+        assert not model.NamedSelections.Children
+        assert all(r.Location is None for r in model.solution.Children)
+    finally:
+        shutil.rmtree(working_dir)
+
+
+def test_no_plies_is_an_error():
+    working_dir = tempfile.mkdtemp()
+    try:
+        session, _ = fake_session(0, working_dir)
+        try:
+            mechanical_results.run_exports(session)
+            raise AssertionError("run_exports did not raise")
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(working_dir)
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print("{0}: ok".format(name))
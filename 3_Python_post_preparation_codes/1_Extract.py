@@ -5,8 +5,24 @@ Author: Pranav Deshpande
 Date: July 2025
 
 Changes:
-- Address of the Design Point Data File extracted Out of the Ansys on line 91
-- Change the DP to be Extracted on line 126, can even run multiple python codes with different intervals to extract faster
+- Address of the Design Point Data File extracted Out of the Ansys on line 60
+- dp_range on line 61 is None: every dpX folder of input_base, so newly solved design points are picked up
+  without an edit. Set it (e.g. range(592, 907)) only to restrict a run to those design points
+- workers on line 63 is the number of processes extracting in parallel, 1 runs everything in this process
+- write_component_csv on line 64 also writes the node level stresses of every component (le_1.csv, ...)
+- hash_contents on line 65 signs the source files by their contents instead of size and modification time
+
+The work is a queue of (dp, load) tasks run by a process pool. The node files of a dp are parsed once into
+a node -> component index (fea_ga/components.py) shared by its six load cases, which gives the max/min of
+all components of a load case in one vectorized pass over the stress matrix. Progress is printed in
+dp/load order, errors are collected per task and listed at the end instead of stopping the run.
+
+Re-running is incremental: every extracted (dp, load) is recorded in 'combined_stress_output/ledger.jsonl'
+with a signature of its source files (fea_ga/ledger.py). Only new design points and those whose files
+changed since are extracted again. The same ledger tells '3_Combination.py' which design points to pick up.
+
+Design points packed into 'Bundle/dp_bundle.npz' (see 2_Ansys_mechanical_codes/pack_dp_bundle.py) are read
+from the bundle with memory mapping, older design points from the 'Nodes' and 'stresses_load_N' text files.
 
 Outputs:
 combined_stress_output/
@@ -14,119 +30,271 @@ combined_stress_output/
 ├── dpX/                            # Design point folder (e.g., dp0, dp1, ...)
 │   │       
 │   ├── loadY/                      # Load case folder (e.g., load1, load2, ...)
-│   │   ├── le_1.csv                # Stress result CSV file
-│   │   ├── le_r_2.csv
-│   │   ├── ...
 │   │   ├── stress_summary.csv      # Has the maximum and minimum  stresses at each component
+│   │   ├── le_1.csv                # Stress result CSV file (only with write_component_csv)
+│   │   ├── le_r_2.csv
 │   │   ├── ...
 │   │   └── le_n.csv
 │   │
 │   └── ...
 │
+├── ledger.jsonl                    # (dp, load) pairs extracted, with the signature of their source files
 └── ...
 
 """
 
 import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
 import pandas as pd
 
-# Stress label names
-STRESS_LABELS = [
-    "Ply1_SX", "Ply1_SY", "Ply1_SZ",
-    "Ply1_SXY", "Ply1_SYZ", "Ply1_SXZ",
-    "Ply2_SX", "Ply2_SY", "Ply2_SZ",
-    "Ply2_SXY", "Ply2_SYZ", "Ply2_SXZ",
-    "Ply3_SX", "Ply3_SY", "Ply3_SZ",
-    "Ply3_SXY", "Ply3_SYZ", "Ply3_SXZ"
-]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.ansys_text import read_node_file, read_stress_exports
+from fea_ga.components import ComponentIndex, summary_frame
+from fea_ga.dp_bundle import STRESS_LABELS, open_bundle
+from fea_ga.ledger import Ledger, source_signature
+
+# === CONFIG ===
+input_base = r"C:\Pranav_folders\Pranav6.0"                  #will have to change the Address to your Ansys output file
+dp_range = None                                             #None: every dpX folder, or e.g. range(592, 907) to restrict
+loads = range(1, 7)
+workers = os.cpu_count()
+write_component_csv = False                                 #True also writes one node level CSV per component
+hash_contents = False                                       #True hashes the file contents, slower but ignores touched files
+output_base = os.path.join(os.getcwd(), "combined_stress_output")
+
+SKIPPED = "⚠️ Skipped: required directory not found."
 
 
 def extract_node_ids(node_file_path):
-    node_ids = []
-    with open(node_file_path, 'r') as f:
-        lines = f.readlines()
-    for line in lines:
-        try:
-            first_token = line.strip().split()[0]
-            node_id = int(first_token.split('-')[0])
-            node_ids.append(node_id)
-        except (IndexError, ValueError):
-            raise ValueError(f"❌ Could not parse line: {line.strip()}")
-    return node_ids
+    return read_node_file(node_file_path)
 
 
 def process_stress_files(stress_dir):
-    stress_data = {}
+    """(node_ids, values[n_nodes, 18]) of the 18 exports of one load case."""
     stress_files = sorted([f for f in os.listdir(stress_dir) if f.endswith(".txt")])
     if len(stress_files) < 18:
         raise ValueError(f"❌ Only {len(stress_files)} stress files found in {stress_dir}. Expected 18.")
-    for i, file in enumerate(stress_files[:18]):
-        df = pd.read_csv(os.path.join(stress_dir, file), sep=r'\s+', engine="python")
-        if df.shape[1] >= 2:
-            df = df.iloc[:, :2]
-            df.columns = ['Node', STRESS_LABELS[i]]
-            stress_data[file] = df.set_index("Node")
-        else:
-            raise ValueError(f"❌ Not enough columns in stress file: {file}")
-    return pd.concat(stress_data.values(), axis=1)
-
-
-def generate_summary(output_dir):
-    summary_rows = []
-    csv_files = sorted([f for f in os.listdir(output_dir) if f.endswith(".csv")])
-    for file in csv_files:
-        df = pd.read_csv(os.path.join(output_dir, file))
-        row = {"Component": file}
-        for col in df.columns:
-            if col == "Node":
-                continue
-            row[f"{col}_max"] = df[col].max()
-            row[f"{col}_min"] = df[col].min()
-        summary_rows.append(row)
-    summary_df = pd.DataFrame(summary_rows)
+    return read_stress_exports([os.path.join(stress_dir, f) for f in stress_files[:18]])
+
+
+def generate_summary(output_dir, names, maxima, minima):
     summary_csv = os.path.join(output_dir, "stress_summary.csv")
-    summary_df.to_csv(summary_csv, index=False)
-    print(f"📄 Summary created: {summary_csv}")
+    summary_frame(names, maxima, minima, STRESS_LABELS).to_csv(summary_csv, index=False)
+    return summary_csv
 
 
-def process_load_case(dp_index, load_index):
-    base_dp_path = fr"C:\\Pranav_folders\\Pranav6.0\\dp{dp_index}"                  #will have to change the Address to your Ansys output file
-    node_dir = os.path.join(base_dp_path, "Nodes")
-    stress_dir = os.path.join(base_dp_path, f"stresses_load_{load_index}")
-    if not os.path.exists(node_dir) or not os.path.exists(stress_dir):
-        print(f"⚠️ Skipped dp{dp_index} load{load_index}: required directory not found.")
-        return
+def write_component_files(output_dir, index, node_ids, values):
+    for component, rows in index.component_rows(node_ids, values).items():
+        df = pd.DataFrame(values[rows], columns=STRESS_LABELS)
+        df.insert(0, "Node", node_ids[rows])
+        df.to_csv(os.path.join(output_dir, f"{component}.csv"), index=False)
+
 
+def load_components(dp_index):
+    """Node -> component index of one dp, built once and shared by all its load cases. Returns (index, warnings)."""
+    base_dp_path = os.path.join(input_base, f"dp{dp_index}")
+    warnings = []
     try:
-        stress_df = process_stress_files(stress_dir)
+        bundle = open_bundle(base_dp_path)
     except Exception as e:
-        print(f"❌ Error processing stress files in dp{dp_index} load{load_index}: {e}")
-        return
-
-    output_dir = os.path.join(os.getcwd(), "combined_stress_output", f"dp{dp_index}", f"load{load_index}")
-    os.makedirs(output_dir, exist_ok=True)
+        warnings.append(f"⚠️ Unreadable bundle, using the text files: {e}")
+        bundle = None
+    if bundle is not None:
+        return ComponentIndex(bundle.components()), warnings
 
-    for node_file in os.listdir(node_dir):
+    node_dir = os.path.join(base_dp_path, "Nodes")
+    if not os.path.exists(node_dir):
+        return None, warnings + [SKIPPED]
+    components = {}
+    for node_file in sorted(os.listdir(node_dir)):
         if not node_file.endswith(".node"):
             continue
-        node_file_path = os.path.join(node_dir, node_file)
         try:
-            node_ids = extract_node_ids(node_file_path)
-            filtered_df = stress_df.loc[stress_df.index.isin(node_ids)].reset_index()
-            if filtered_df.empty:
-                raise ValueError("No matching stress values found.")
-            output_file = os.path.join(output_dir, node_file.replace(".node", ".csv"))
-            filtered_df.to_csv(output_file, index=False)
+            components[node_file[:-len(".node")]] = extract_node_ids(os.path.join(node_dir, node_file))
         except Exception as e:
-            print(f"⚠️ Error with {node_file} in dp{dp_index} load{load_index}: {e}")
+            warnings.append(f"⚠️ Error with {node_file}: {e}")
+    return ComponentIndex(components), warnings
+
 
-    generate_summary(output_dir)
+def process_load_case(dp_index, load_index, index):
+    """Extract one (dp, load). Returns (status, warnings), raises when the stresses cannot be read."""
+    base_dp_path = os.path.join(input_base, f"dp{dp_index}")
+    stress_dir = os.path.join(base_dp_path, f"stresses_load_{load_index}")
 
+    try:
+        bundle = open_bundle(base_dp_path)
+    except Exception:
+        bundle = None
 
-# === MAIN LOOP ===
-for dp in range(592, 907):                              #The design Points you wanna extract
-    for load in range(1, 7):                            #can even run multiple Python code with extracting it in interval
-        print(f"\n🔄 Processing dp{dp} load{load}")
-        process_load_case(dp, load)
+    if bundle is not None and load_index in bundle.loads:
+        node_ids, values = bundle.node_ids, bundle.load_stress(load_index)
+    else:
+        if not os.path.exists(stress_dir):
+            return "skipped", [SKIPPED]
+        node_ids, values = process_stress_files(stress_dir)
+    node_ids, values = np.asarray(node_ids), np.asarray(values)
+
+    output_dir = os.path.join(output_base, f"dp{dp_index}", f"load{load_index}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    names, maxima, minima = index.reduce(node_ids, values)
+    generate_summary(output_dir, names, maxima, minima)
+    if write_component_csv:
+        write_component_files(output_dir, index, node_ids, values)
 
-print("\n✅ Done processing all design points and loads.")
+    found = set(names)
+    warnings = [f"⚠️ Error with {component}.node: No matching stress values found."
+                for component in index.names if component not in found]
+    return "done", warnings
+
+
+# === PROGRESS AND ERRORS ===
+class ProgressReport:
+    """Prints task results in (dp, load) order as soon as all earlier tasks are finished."""
+
+    def __init__(self, tasks, on_done=None):
+        self.tasks = list(tasks)
+        self.on_done = on_done
+        self.index = {task: i for i, task in enumerate(self.tasks)}
+        self.results = {}
+        self.next_to_print = 0
+
+    def report(self, task, status, messages):
+        self.results[task] = (status, messages)
+        if status == "done" and self.on_done is not None:
+            self.on_done(task)
+        while self.next_to_print < len(self.tasks) and self.tasks[self.next_to_print] in self.results:
+            dp, load = self.tasks[self.next_to_print]
+            status, messages = self.results[(dp, load)]
+            icon = {"done": "✅", "skipped": "⏭️"}.get(status, "❌")
+            self.next_to_print += 1
+            print(f"[{self.next_to_print}/{len(self.tasks)}] {icon} dp{dp} load{load}: {status}")
+            for message in messages:
+                print(f"      {message}")
+
+    def summary(self):
+        failed = [(task, r[1]) for task, r in self.results.items() if r[0] == "failed"]
+        skipped = [task for task, r in self.results.items() if r[0] == "skipped"]
+        done = sum(1 for r in self.results.values() if r[0] == "done")
+        print(f"\n📊 {done} done, {len(skipped)} skipped, {len(failed)} failed of {len(self.tasks)} (dp, load) tasks")
+        for (dp, load), messages in sorted(failed, key=lambda item: self.index[item[0]]):
+            print(f"❌ dp{dp} load{load}: {messages[-1] if messages else 'unknown error'}")
+        return failed
+
+
+def _error(e):
+    return f"{type(e).__name__}: {e}"
+
+
+def _missing_dp_status(warnings):
+    return "skipped" if warnings and warnings[-1] == SKIPPED else "failed"
+
+
+def find_design_points(base):
+    """Indices of the dpX folders in base, sorted."""
+    found = (re.fullmatch(r"dp(\d+)", name) for name in os.listdir(base))
+    return sorted(int(m.group(1)) for m in found if m)
+
+
+def plan_extraction(dps, loads, ledger):
+    """
+    (dp, load) tasks whose source files are not in the ledger with the same signature, and the
+    signatures to record for them. Missing load cases stay in the list so they are reported as skipped.
+    """
+    tasks, signatures = [], {}
+    for dp in dps:
+        for load in loads:
+            signature = source_signature(os.path.join(input_base, f"dp{dp}"), load, content=hash_contents)
+            summary = os.path.join(output_base, f"dp{dp}", f"load{load}", "stress_summary.csv")
+            if signature is not None and ledger.signature(dp, load) == signature and os.path.exists(summary):
+                continue
+            tasks.append((dp, load))
+            signatures[(dp, load)] = signature
+    return tasks, signatures
+
+
+def run_extraction(tasks, workers=1, on_done=None):
+    """Extract the (dp, load) tasks, on_done(task) is called for every task that finished."""
+    progress = ProgressReport(tasks, on_done)
+    dp_loads = {}
+    for dp, load in tasks:
+        dp_loads.setdefault(dp, []).append(load)
+
+    if workers <= 1:
+        for dp, loads in dp_loads.items():
+            try:
+                components, warnings = load_components(dp)
+            except Exception as e:
+                components, warnings = None, [_error(e)]
+            for load in loads:
+                if components is None:
+                    progress.report((dp, load), _missing_dp_status(warnings), warnings)
+                    continue
+                try:
+                    status, messages = process_load_case(dp, load, components)
+                    progress.report((dp, load), status, warnings + messages)
+                except Exception as e:
+                    progress.report((dp, load), "failed", warnings + [_error(e)])
+        return progress.summary()
+
+    # Node files are parsed by one task per dp, its result feeds the load tasks of that dp.
+    # At most 2 x workers dps are in flight so the parsed components do not pile up in memory.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        dp_queue = iter(dp_loads)
+        node_tasks, load_tasks, dp_warnings = {}, {}, {}
+
+        def submit_next_dp():
+            dp = next(dp_queue, None)
+            if dp is not None:
+                node_tasks[pool.submit(load_components, dp)] = dp
+
+        for _ in range(2 * workers):
+            submit_next_dp()
+
+        pending = set(node_tasks)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in node_tasks:
+                    dp = node_tasks.pop(future)
+                    try:
+                        components, warnings = future.result()
+                    except Exception as e:
+                        components, warnings = None, [_error(e)]
+                    if components is None:
+                        for load in dp_loads[dp]:
+                            progress.report((dp, load), _missing_dp_status(warnings), warnings)
+                        submit_next_dp()
+                        pending |= set(node_tasks)
+                        continue
+                    dp_warnings[dp] = warnings
+                    for load in dp_loads[dp]:
+                        task = pool.submit(process_load_case, dp, load, components)
+                        load_tasks[task] = (dp, load)
+                        pending.add(task)
+                else:
+                    dp, load = load_tasks.pop(future)
+                    try:
+                        status, messages = future.result()
+                        progress.report((dp, load), status, dp_warnings.get(dp, []) + messages)
+                    except Exception as e:
+                        progress.report((dp, load), "failed", dp_warnings.get(dp, []) + [_error(e)])
+                    if not any(d == dp for d, _ in load_tasks.values()):
+                        dp_warnings.pop(dp, None)
+                        submit_next_dp()
+                        pending |= set(node_tasks)
+    return progress.summary()
+
+
+# === MAIN LOOP ===
+if __name__ == "__main__":
+    ledger = Ledger(output_base)
+    dps = find_design_points(input_base) if dp_range is None else dp_range
+    tasks, signatures = plan_extraction(dps, loads, ledger)
+    print(f"🔎 {len(tasks)} (dp, load) tasks to extract, {len(dps) * len(loads) - len(tasks)} up to date in the ledger")
+    failed_tasks = run_extraction(tasks, workers,
+                                  on_done=lambda task: ledger.record(*task, signatures[task]))
+    print("\n✅ Done processing all design points and loads.")
@@ -5,63 +5,54 @@ Author: Pranav Deshpande
 Date: July 2025
 
 As the number of Plies are changing with each design point, the number of paramters are also changing
-this can add complexity to the RSM generation, so the ply angles were replaced by percentage of each 
-angle in the input paaramter, the number of each angle can be easily found by multiplying with, number of 
+this can add complexity to the RSM generation, so the ply angles were replaced by percentage of each
+angle in the input paaramter, the number of each angle can be easily found by multiplying with, number of
 plies and there are very few combinations for the balanced symmetric Lay-up with given number of angles
 
+The fractions are computed for all design points at once from the ply arrays (fea_ga/features.py),
+chunk_size design points at a time so very large DOEs never sit in memory as a wide table.
+
 Changes:
-- Address of the sobol_composites_10_to_100_plies.csv on line 18
+- Address of the DOE written by 'Parameter_Generator.py' on line 38, either the packed sobol_composites.npz
+  or the old wide sobol_composites_10_to_100_plies.csv
+- extra_descriptors on line 39 adds more layup descriptors ("lamination", "outer_ply", "stacking_moments")
+  in a separate file, the cleaned file keeps the 12 columns the later stages expect
 
-Outputs: 
+Outputs:
 - sobol_composites_cleaned.csv
+- sobol_composites_descriptors.csv (only with extra_descriptors)
 """
 
-import pandas as pd
-
-# Load original CSV
-df = pd.read_csv("sobol_composites_10_to_100_plies.csv")                    # can be written as 'df = pd.read_csv(r"path/sobol_composites_10_to_100_plies.csv")'
-
-# Identify ply columns
-ply_angle_cols = [col for col in df.columns if col.startswith('ply_angle')]
-ply_active_cols = [col for col in df.columns if col.startswith('ply_active')]
-
-# Store new data
-frac_0_list = []
-frac_45_list = []
-frac_90_list = []
-num_active_plies = []
-
-# Loop through each design point
-for idx, row in df.iterrows():
-    angles = row[ply_angle_cols].dropna().astype(int).values
-    actives = row[ply_active_cols].dropna().astype(int).values
-
-    # Filter only active plies
-    active_angles = [angle for angle, active in zip(angles, actives) if active == 1]
-    total_active = len(active_angles)
-
-    # Avoid division by zero
-    if total_active == 0:
-        frac_0 = frac_45 = frac_90 = 0
-    else:
-        frac_0 = sum(1 for a in active_angles if a == 0) / total_active
-        frac_90 = sum(1 for a in active_angles if a == 90) / total_active
-        frac_45 = sum(1 for a in active_angles if abs(a) == 45) / total_active
-
-    frac_0_list.append(frac_0)
-    frac_45_list.append(frac_45)
-    frac_90_list.append(frac_90)
-    num_active_plies.append(total_active)
-
-# Add new columns
-df['frac_0_deg'] = frac_0_list
-df['frac_45_deg'] = frac_45_list
-df['frac_90_deg'] = frac_90_list
-df['num_active_plies'] = num_active_plies
-
-# Drop original ply angle & activity columns
-df.drop(columns=ply_angle_cols + ply_active_cols, inplace=True)
-
-# Save to new CSV
-df.to_csv("sobol_composites_cleaned.csv", index=False)
-print("✅ Saved: sobol_composites_cleaned.csv (fractions + active ply count, cleaned)")
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.doe import load_doe
+from fea_ga.features import RSM_FEATURES, csv_feature_frames, doe_feature_frames
+
+# === CONFIG ===
+doe_file = "sobol_composites.npz"                                           # can be written as r"path/sobol_composites.npz"
+extra_descriptors = []                                                      # e.g. ["lamination", "outer_ply"]
+chunk_size = 100_000
+output_file = "sobol_composites_cleaned.csv"
+descriptors_file = "sobol_composites_descriptors.csv"
+
+descriptors = ["fractions"] + list(extra_descriptors)
+if doe_file.endswith(".npz"):
+    frames = doe_feature_frames(load_doe(doe_file), descriptors, chunk_size)
+else:
+    frames = csv_feature_frames(doe_file, descriptors, chunk_size)
+
+# Write chunk by chunk
+n_rows = 0
+for i, df in enumerate(frames):
+    mode, header = ("w", True) if i == 0 else ("a", False)
+    n_cleaned = list(df.columns).index(RSM_FEATURES[-1]) + 1                # Design Points, geometry, fractions, plies
+    df.iloc[:, :n_cleaned].to_csv(output_file, mode=mode, header=header, index=False)
+    if extra_descriptors:
+        df.iloc[:, [0] + list(range(n_cleaned, df.shape[1]))].to_csv(descriptors_file, mode=mode, header=header, index=False)
+    n_rows += len(df)
+
+print(f"✅ Saved: {output_file} ({n_rows} design points, fractions + active ply count, cleaned)")
+if extra_descriptors:
+    print(f"✅ Saved: {descriptors_file} ({', '.join(extra_descriptors)})")
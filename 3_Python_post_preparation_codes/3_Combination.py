@@ -8,98 +8,160 @@ Read the Input parameter generated by 'Input_parameter.py' code and read the 'co
 folder generated by 'Extraction.py' code and merge them together
 
 Changes:
-- Address of the sobol_composites_cleaned.csv on line 48
-- Address of the combined_stress_output folder on line 61
-- The design points to be merged
+- Address of the sobol_composites_cleaned.csv on line 66
+- Address of the combined_stress_output folder on line 67
+- Address of the Component_stresses folder on line 68
 
-Input: 
-- first will have to make the following folder by ourself
+The design points to be merged come from the ledger written by '1_Extract.py' (fea_ga/ledger.py): every
+design point with all six load cases extracted that was not merged yet, or was extracted again since.
+Rows of re-extracted design points are replaced, the merged ones are recorded in Component_stresses/ledger.jsonl.
+
+Every stress_summary.csv is read once into one [dp, load, component, statistic] array, the component names
+are taken from the summaries. The array is stored with the RSM inputs of every dp in the memory mapped
+Component_stresses/stress_store (fea_ga/stress_store.py), which is what '1_Superposition.py' reads.
+
+With write_csv (line 69) the old per component CSVs are written as well, each in one go: new design points
+are appended, a file with re-extracted design points is rewritten. Design points already in a file
+(e.g. merged before the ledger existed) are not added twice.
+
+Input:
+- The Address of the Component_stresses folder on line 68, the load folders are made by the code
 
         Component_stresses/
-        ├── load1                           
+        ├── load1
         ├── load2
-        ├── load3 
-        ├── load4 
+        ├── load3
+        ├── load4
         ├── load5
         └── load6
-        
-- Then give the Address of this folder on line 74
 
-Outputs: 
+Outputs:
 
 Component_stresses/
 │
-├── loadX/              # Where load vary from 1 to 6      
+├── loadX/              # Where load vary from 1 to 6
 │   │
-│   ├── le_1.csv             
-│   ├── le_2.csv            
+│   ├── le_1.csv
+│   ├── le_2.csv
 │   ├── ...
-│   └── le_n.csv   
+│   └── le_n.csv
+├── stress_store/       # [dp, load, component, statistic] float32 + RSM inputs, memory mapped
+├── ledger.jsonl        # design points merged, with the signatures of their extraction
 └── ...
 
 """
 
 
-import pandas as pd
 import os
+import sys
 
-# Read design parameters
-parameters = pd.read_csv("sobol_composites_cleaned.csv")            #Change the location
-
-# Cache to store existing datapoints per file (in memory, fast)
-written_cache = {}
-
-# Loop over all 58 components (k = 0 to 57)
-for k in range(58):
-    print(f"\n▶ Processing component {k}")
-
-    for i in range(727 , 907):                                      # Change the Design Point      
-        datapoint = parameters.iloc[i, 0]
+import numpy as np
+import pandas as pd
 
-        for j in range(1, 7):  # load1 to load6
-            stress_file = fr"combined_stress_output\{datapoint}\load{j}\stress_summary.csv"     #change the location
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.ledger import Ledger
+from fea_ga.stress_store import open_or_create_store
+
+# === CONFIG ===
+parameters_file = "sobol_composites_cleaned.csv"                                #Change the location
+extraction_base = "combined_stress_output"                                      #change the location
+output_base = r"C:\Pranav_folders\Pranav6.1\Component_stresses"                  #change the location of the folders
+write_csv = True                                                                #also write Component_stresses/loadX/*.csv
+loads = range(1, 7)
+
+
+def read_summaries(dps, loads):
+    """
+    All stress_summary.csv of the design points, each read once.
+    Returns (components, statistics, stresses[dp, load, component, statistic], unreadable dps).
+    Missing (dp, component) rows stay NaN.
+    """
+    tables, unreadable = {}, set()
+    for i, dp in enumerate(dps):
+        for j, load in enumerate(loads):
+            stress_file = os.path.join(extraction_base, f"dp{dp}", f"load{load}", "stress_summary.csv")
             try:
-                stresses = pd.read_csv(stress_file)
+                table = pd.read_csv(stress_file, float_precision="round_trip")
+                table["Component"] = table["Component"].astype(str).str.strip()
+                tables[(i, j)] = table.set_index("Component")
             except Exception as e:
                 print(f"❌ Could not read {stress_file}: {e}")
+                unreadable.add(dp)
+
+    if not tables:
+        return [], [], np.zeros((len(dps), len(loads), 0, 0)), unreadable
+    components = sorted(set().union(*(table.index for table in tables.values())))
+    statistics = list(next(iter(tables.values())).columns)
+    position = {name: k for k, name in enumerate(components)}
+
+    stresses = np.full((len(dps), len(loads), len(components), len(statistics)), np.nan)
+    for (i, j), table in tables.items():
+        stresses[i, j, [position[name] for name in table.index]] = table[statistics].to_numpy(dtype=np.float64)
+    return components, statistics, stresses, unreadable
+
+
+def write_component_file(output_file, rows, changed_names):
+    """Append the new rows to one Component_stresses file, or rewrite it when design points changed."""
+    if not os.path.exists(output_file):
+        rows.to_csv(output_file, index=False)
+        return len(rows)
+    present = pd.read_csv(output_file, usecols=[0]).iloc[:, 0].astype(str)
+    if present.isin(changed_names).any():
+        existing = pd.read_csv(output_file, float_precision="round_trip")
+        existing = existing[~present.isin(changed_names)]
+        pd.concat([existing, rows], ignore_index=True).to_csv(output_file, index=False)
+        return len(rows)
+    rows = rows[~rows.iloc[:, 0].astype(str).isin(set(present))]           # resume: already merged
+    if len(rows):
+        rows.to_csv(output_file, mode="a", header=False, index=False)
+    return len(rows)
+
+
+if __name__ == "__main__":
+    # Read design parameters
+    parameters = pd.read_csv(parameters_file, float_precision="round_trip")
+    dp_rows = {str(name): i for i, name in enumerate(parameters.iloc[:, 0])}
+
+    # Design points extracted since the last merge
+    extraction_ledger = Ledger(extraction_base)
+    combination_ledger = Ledger(output_base)
+    new_dps, changed_dps = combination_ledger.pending(extraction_ledger, loads)
+    missing = [dp for dp in new_dps + changed_dps if f"dp{dp}" not in dp_rows]
+    if missing:
+        print(f"⚠️ Not in {parameters_file}, left for a later run: {', '.join(f'dp{dp}' for dp in missing)}")
+    dps_to_merge = [dp for dp in sorted(new_dps + changed_dps) if f"dp{dp}" in dp_rows]
+    print(f"🔎 {len(dps_to_merge)} design points to merge ({len(changed_dps)} re-extracted)")
+
+    components, statistics, stresses, unreadable_dps = read_summaries(dps_to_merge, loads)
+    print(f"📖 Read {len(dps_to_merge) * len(loads)} summaries, {len(components)} components")
+
+    dp_parameters = parameters.iloc[[dp_rows[f"dp{dp}"] for dp in dps_to_merge]].reset_index(drop=True)
+    changed_names = {f"dp{dp}" for dp in changed_dps}
+    readable = np.array([dp not in unreadable_dps for dp in dps_to_merge], dtype=bool)   # the rest on the next run
+
+    # Memory mapped store: new dps are appended, re-extracted ones overwritten in place
+    if readable.any():
+        store_components = [name[:-len(".csv")] if name.endswith(".csv") else name for name in components]
+        store = open_or_create_store(output_base, [f"load{load}" for load in loads], store_components,
+                                     statistics, parameters.columns[1:12])
+        store.write(np.array(dps_to_merge)[readable], dp_parameters.iloc[:, 1:12].to_numpy(dtype=np.float64)[readable],
+                    stresses[readable], component_names=store_components)
+        print(f"💾 Stored {int(readable.sum())} design points in {store.path} ({len(store)} in total)")
+
+    # One table per (load, component): design parameters of the dp + its statistics
+    for j, load in enumerate(loads if write_csv else []):
+        output_folder = os.path.join(output_base, f"load{load}")
+        os.makedirs(output_folder, exist_ok=True)
+        for k, component_name in enumerate(components):
+            values = stresses[:, j, k]
+            has_row = readable & ~np.isnan(values).all(axis=1)
+            if not has_row.any():
                 continue
-
-            try:
-                component_name = str(stresses.iloc[k, 0]).strip()
-            except Exception as e:
-                print(f"❌ Error reading component name at row {k} in {stress_file}: {e}")
-                continue
-
-            output_folder = fr"C:\Pranav_folders\Pranav6.1\Component_stresses\load{j}"          #change the location of the folders
-            os.makedirs(output_folder, exist_ok=True)
-            output_file = os.path.join(output_folder, component_name)
-
-            # Initialize cache for file if not already done
-            if output_file not in written_cache:
-                if os.path.exists(output_file):
-                    try:
-                        existing = pd.read_csv(output_file, usecols=[0])  # Only read Design Point column
-                        written_cache[output_file] = set(existing.iloc[:, 0].astype(str))
-                    except:
-                        written_cache[output_file] = set()
-                else:
-                    written_cache[output_file] = set()
-
-            # Skip if already written
-            if str(datapoint) in written_cache[output_file]:
-                continue
-
-            # Build row
-            stress_row = stresses.iloc[k].drop("Component")
-            dp_row = parameters.iloc[i]
-            combined_data = pd.concat([dp_row, stress_row])
-            final_df = pd.DataFrame([combined_data])
-
-            # Append to file
-            write_header = not os.path.exists(output_file)
-            final_df.to_csv(output_file, mode='a', index=False, header=write_header)
-
-            # Update cache
-            written_cache[output_file].add(str(datapoint))
-
-            print(f"✅ Written {datapoint} → {component_name} (load{j})")
+            rows = pd.concat([dp_parameters[has_row].reset_index(drop=True),
+                              pd.DataFrame(values[has_row], columns=statistics)], axis=1)
+            written = write_component_file(os.path.join(output_folder, component_name), rows, changed_names)
+            print(f"✅ Written {written} design points → {component_name} (load{load})")
+
+    merged_dps = [dp for dp in dps_to_merge if dp not in unreadable_dps]
+    combination_ledger.record_consumed(extraction_ledger, merged_dps, loads)
+    print(f"\n✅ Merged {len(merged_dps)} design points, recorded in {combination_ledger.path}")
@@ -0,0 +1,110 @@
+"""
+Benchmark and Regression Check of the Ansys Text Parsers
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Writes synthetic exports of realistic size into a temp folder (one load case: 18 stress exports and
+58 .node files, with node numbers running into negative coordinates as NWRITE does), then
+
+- checks that fea_ga.ansys_text gives exactly the same node numbers and values as the old pandas path
+  ('sep=r"\\s+", engine="python"' and the line loop of extract_node_ids)
+- prints the time of both for one load case
+
+Changes:
+- n_nodes and n_component_nodes on line 29 and 30 to the size of your own exports
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.ansys_text import read_node_file, read_stress_exports
+
+n_nodes = 50_000                    # nodes per stress export (full model export)
+n_component_nodes = 300             # nodes per .node file
+n_exports = 18
+n_components = 58
+repeats = 3
+
+
+# =================== Old path, as it was in 1_Extract.py ===================
+def old_extract_node_ids(node_file_path):
+    node_ids = []
+    with open(node_file_path, 'r') as f:
+        lines = f.readlines()
+    for line in lines:
+        first_token = line.strip().split()[0]
+        node_ids.append(int(first_token.split('-')[0]))
+    return node_ids
+
+
+def old_process_stress_files(paths):
+    frames = []
+    for i, path in enumerate(paths):
+        df = pd.read_csv(path, sep=r'\s+', engine="python").iloc[:, :2]
+        df.columns = ['Node', f"S{i}"]
+        frames.append(df.set_index("Node"))
+    return pd.concat(frames, axis=1)
+
+
+# =================== Synthetic files ===================
+def write_synthetic(folder, rng):
+    nodes = np.sort(rng.choice(np.arange(1, 10 * n_nodes), n_nodes, replace=False))
+    stress_paths = []
+    for i in range(n_exports):
+        path = os.path.join(folder, f"{i + 1:02d}_export.txt")
+        values = rng.normal(0.0, 1e8, n_nodes)
+        with open(path, "w") as f:
+            f.write("Node Number\tNormal Stress (Pa)\n")
+            f.write("".join(f"{n}\t{v:.6E}\n" for n, v in zip(nodes, values)))
+        stress_paths.append(path)
+
+    node_paths = []
+    for i in range(n_components):
+        path = os.path.join(folder, f"comp_{i}.node")
+        with open(path, "w") as f:
+            for n in rng.choice(nodes, n_component_nodes, replace=False):
+                coords = rng.normal(0.0, 1.0, 3)
+                f.write(f"{n:8d}" + "".join(f"{c:20.13E}" for c in coords) + "\n")
+        node_paths.append(path)
+    return stress_paths, node_paths
+
+
+def best_time(func):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as folder:
+        stress_paths, node_paths = write_synthetic(folder, rng)
+
+        # --- Regression check ---
+        old_df = old_process_stress_files(stress_paths)
+        node_ids, values = read_stress_exports(stress_paths)
+        assert np.array_equal(old_df.index.to_numpy(), node_ids), "❌ Node numbers differ"
+        assert np.array_equal(old_df.to_numpy(), values), "❌ Stress values differ"
+        for path in node_paths:
+            assert np.array_equal(old_extract_node_ids(path), read_node_file(path)), f"❌ Nodes differ in {path}"
+        print("✅ New parsers give the same node numbers and values as the old pandas path")
+
+        # --- Timing ---
+        old_stress = best_time(lambda: old_process_stress_files(stress_paths))
+        new_stress = best_time(lambda: read_stress_exports(stress_paths))
+        old_nodes = best_time(lambda: [old_extract_node_ids(p) for p in node_paths])
+        new_nodes = best_time(lambda: [read_node_file(p) for p in node_paths])
+
+    print(f"\n⏱ One load case, {n_exports} exports x {n_nodes} nodes, {n_components} node files")
+    print(f"  stress exports : old {old_stress:8.3f} s | new {new_stress:8.3f} s | x{old_stress / new_stress:.1f}")
+    print(f"  node files     : old {old_nodes:8.3f} s | new {new_nodes:8.3f} s | x{old_nodes / new_nodes:.1f}")
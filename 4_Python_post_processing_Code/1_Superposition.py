@@ -8,110 +8,172 @@ Date: July 2025
 Do vector Addition of the stresses based on the Load data
 
 Changes:
-- Address of the 'Component_stresses' folder createdby '3_Combination.py' on line 51
-
-Outputs: 
+- Address of the 'Component_stresses' folder createdby '3_Combination.py' on line 66
+- write_csv on line 67 also writes the Superposition/CaseX/*.csv files
+- chunk_cases / chunk_dps on lines 70-71 bound the memory of one superposition block
+- mode on line 72: "envelope" sums the per component extrema of the unit loads, "nodes" superposes the
+  node fields of the Ansys design point folders on line 73 and takes the extrema afterwards
+
+Every row of Forces1.csv is a Case. The multipliers of all rows form one matrix M [case, load] and the
+superposition is a matrix product over the unit load axis (fea_ga/superposition.py), so a load spectrum
+with thousands of rows costs about as much as the six cases did with a loop.
+
+The extrema of the unit loads of a component can sit at different nodes, so "envelope" only estimates the
+extreme of the combined stress. "nodes" is the correct one: the unit node fields of a design point (packed
+bundle or text exports) are combined for every case and the max/min of each component taken from the
+combined field, one design point per task on `workers` processes. It reads the full exports again, so it
+takes about as long as '1_Extract.py'; the memory is one design point per worker plus block_mb per block
+of cases ('benchmark_superposition.py' has the numbers). Both modes store the one of max/min with the
+larger magnitude, so the GA reads either.
+
+The unit load stresses are sliced out of the memory mapped Component_stresses/stress_store written by
+'3_Combination.py' (fea_ga/stress_store.py), the superposed stresses are written block by block into
+Superposition/stress_store with one entry per Case, which is what '3_Final_GA_RSM.py' reads.
+
+Only the design points merged by '3_Combination.py' since the last run are superposed (Component_stresses/
+ledger.jsonl, see fea_ga/ledger.py), their rows are replaced in the existing store. A changed
+Forces1.csv changes every signature, so everything is superposed again.
+
+Outputs:
 
 Superposition/
 │
-├── CaseX/              # Where Case vary from 1 to 6      
+├── CaseX/              # Where X is the row of Forces1.csv (only with write_csv)
 │   │
-│   ├── le_1.csv             
-│   ├── le_2.csv            
+│   ├── le_1.csv
+│   ├── le_2.csv
 │   ├── ...
-│   └── le_n.csv   
+│   └── le_n.csv
+├── stress_store/       # [dp, case, component, stress] float32 + RSM inputs, memory mapped
+├── ledger.jsonl        # design points superposed, with the signatures they were made from
 └── ...
 
 """
 
 import pandas as pd
+import numpy as np
 import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
-# ==== STEP 1: Read multipliers from Forces1.csv ====
-forces_df = pd.read_csv("Forces1.csv")
-
-# Force-to-multiplier conversion
-Mx_mult = forces_df.iloc[:, 3] / 100
-My_mult = forces_df.iloc[:, 4] / 100
-Mz_mult = forces_df.iloc[:, 5] / 100
-Nx_mult = forces_df.iloc[:, 0] / 1000
-Ny_mult = forces_df.iloc[:, 1] / 1000 
-Nz_mult = forces_df.iloc[:, 2] / 1000
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.ledger import Ledger, files_signature
+from fea_ga.stress_store import StressStore, open_store, store_path
+from fea_ga.superposition import dominant_stress, multiplier_matrix, superpose_design_point, superpose_store
 
 # === Paths ===
+forces_file = "Forces1.csv"
 input_base = r"C:\Pranav_folders\Pranav6.1\Component_stresses"     #change the Address here
-load1_path = os.path.join(input_base, "load1")
-component_files = [f for f in os.listdir(load1_path) if f.endswith(".csv")]
-
-# === Loop over DP0 to DP5 ===
-for dp_index in range(6):
-    print(f"\n🚀 Processing Design Point {dp_index} (Case{dp_index+1})")
-
-    # Create output folder for this DP
-    output_base = os.path.join("Superposition", f"Case{dp_index+1}")
-    os.makedirs(output_base, exist_ok=True)
-
-    # Define multipliers for this DP
-    multiplier_map = {
-        1: Mx_mult[dp_index],
-        2: My_mult[dp_index],
-        3: Mz_mult[dp_index],
-        4: Nx_mult[dp_index],
-        5: Ny_mult[dp_index],
-        6: Nz_mult[dp_index]
-    }
-
-    for filename in component_files:
-        print(f"▶ Processing: {filename}")
-        total_sup_stress = None
-        first_12_cols = None
-
-        for load_num in range(1, 7):
-            file_path = os.path.join(input_base, f"load{load_num}", filename)
-
-            try:
-                stresses = pd.read_csv(file_path, on_bad_lines='skip')
-            except Exception as e:
-                print(f"❌ Failed to read {file_path}: {e}")
-                continue
-
-            if stresses.shape[1] < 48:
-                print(f"⚠️ Skipping {filename}, load{load_num}: not enough columns.")
-                continue
-
-            if first_12_cols is None:
-                first_12_cols = stresses.iloc[:, :12].copy()
-
-            stress1 = stresses.iloc[:, 12:]
-            result = pd.DataFrame()
-            cols = stress1.columns.tolist()
-
-            i = 0
-            while i < len(cols) - 1:
-                col_max = cols[i]
-                col_min = cols[i + 1]
-                base_name = col_max.replace('_max', '')
-
-                max_vals = stress1[col_max]
-                min_vals = stress1[col_min]
-
-                dominant = max_vals.where(abs(max_vals) >= abs(min_vals), min_vals)
-                result[base_name] = dominant
-
-                i += 2
-
-            sup_stress = result * multiplier_map[load_num]
-
-            if total_sup_stress is None:
-                total_sup_stress = sup_stress
-            else:
-                total_sup_stress += sup_stress
-
-        # === Combine and save ===
-        if total_sup_stress is not None:
-            final_result = pd.concat([first_12_cols, total_sup_stress], axis=1)
-            output_path = os.path.join(output_base, filename)
+write_csv = False
+output_folder = "Superposition"
+loads = range(1, 7)
+chunk_cases = 64                                                    # cases superposed at once
+chunk_dps = 512                                                     # design points superposed at once
+mode = "envelope"                                                   # "envelope" or "nodes"
+ansys_base = r"C:\Pranav_folders\Pranav6.0"                         # dpX folders of the Ansys output ("nodes")
+workers = os.cpu_count()                                            # processes for "nodes"
+block_mb = 256                                                      # memory of one block of cases ("nodes")
+
+if __name__ == "__main__":
+    # ==== STEP 1: Read multipliers from Forces1.csv: M [case, load] ====
+    forces_df = pd.read_csv(forces_file)
+    multipliers = multiplier_matrix(forces_df)
+    case_names = [f"Case{i + 1}" for i in range(len(multipliers))]
+    print(f"📖 {len(case_names)} cases in {forces_file}")
+
+    # === Design points merged since the last run ===
+    combination_ledger = Ledger(input_base)
+    superposition_ledger = Ledger(output_folder)
+    forces_salt = files_signature([forces_file], content=True) + ("" if mode == "envelope" else f":{mode}")
+    new_dps, changed_dps = superposition_ledger.pending(combination_ledger, loads, salt=forces_salt)
+    unit_store = open_store(input_base)
+    if unit_store is None:
+        sys.exit(f"❌ No stress store in {input_base}, run '3_Combination.py' first")
+
+    # === Superposition store, made again when Forces1.csv has a different number of rows ===
+    stress_names, _ = dominant_stress(np.zeros(len(unit_store.stat_names)), unit_store.stat_names)
+    store = open_store(output_folder, mode="r+")
+    if store is None or store.load_names != case_names or store.stat_names != stress_names \
+            or store.component_names != unit_store.component_names:
+        store = StressStore.create(store_path(output_folder), case_names, unit_store.component_names, stress_names,
+                                   unit_store.feature_names)
+        new_dps = sorted(set(new_dps) | set(combination_ledger.dps(loads)))     # nothing in the new store yet
+        changed_dps = []
+
+    missing = [dp for dp in new_dps + changed_dps if dp not in unit_store]
+    dps_to_superpose = sorted(dp for dp in new_dps + changed_dps if dp in unit_store)
+    print(f"🔎 {len(dps_to_superpose)} design points to superpose ({len(changed_dps)} changed)")
+    if missing:
+        print(f"⚠️ Not in the stress store yet: {', '.join(f'dp{dp}' for dp in missing)}")
+    if not dps_to_superpose:
+        sys.exit(0)
+
+    # === [dp, case, component, stress] ===
+    unit_rows = unit_store.rows(dps_to_superpose)
+    case_rows = store.reserve(dps_to_superpose, np.asarray(unit_store.features[unit_rows]))
+    if mode == "envelope":
+        # in blocks of chunk_dps x chunk_cases
+        superpose_store(unit_store, unit_rows, multipliers, store, case_rows, loads, chunk_cases, chunk_dps)
+        superposed_dps = dps_to_superpose
+    elif mode == "nodes":
+        # one task per design point, at most 2 x workers in flight; written to the store as they finish and
+        # recorded in the ledger every chunk_dps design points, so an interrupted run resumes
+        superposed_dps, recorded, failed = [], 0, []
+        row_of = dict(zip(dps_to_superpose, case_rows))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            dp_queue, running = iter(dps_to_superpose), {}
+
+            def submit_next_dp():
+                dp = next(dp_queue, None)
+                if dp is not None:
+                    running[pool.submit(superpose_design_point, os.path.join(ansys_base, f"dp{dp}"), multipliers,
+                                        store.component_names, loads, block_mb * 2**20)] = dp
+
+            for _ in range(2 * workers):
+                submit_next_dp()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    dp = running.pop(future)
+                    try:
+                        result, warnings = future.result()
+                        store.stress[row_of[dp]] = result
+                        superposed_dps.append(dp)
+                        print(f"[{len(superposed_dps) + len(failed)}/{len(dps_to_superpose)}] ✅ dp{dp}")
+                        for warning in warnings:
+                            print(f"      {warning}")
+                    except Exception as e:
+                        failed.append(dp)
+                        print(f"[{len(superposed_dps) + len(failed)}/{len(dps_to_superpose)}] ❌ dp{dp}: {e}")
+                    submit_next_dp()
+                if len(superposed_dps) - recorded >= chunk_dps:
+                    store.flush()
+                    superposition_ledger.record_consumed(combination_ledger, superposed_dps[recorded:], loads,
+                                                         salt=forces_salt)
+                    recorded = len(superposed_dps)
+        store.flush()
+        superposition_ledger.record_consumed(combination_ledger, superposed_dps[recorded:], loads, salt=forces_salt)
+        if failed:
+            print(f"❌ {len(failed)} design points failed, left for the next run: {', '.join(f'dp{dp}' for dp in failed)}")
+    else:
+        sys.exit(f"❌ Unknown mode {mode!r}, use \"envelope\" or \"nodes\"")
+    print(f"💾 Stored {len(superposed_dps)} design points x {len(case_names)} cases in {store.path} "
+          f"({len(store)} in total)")
+
+    pending_names = {f"dp{dp}" for dp in superposed_dps}
+    for case_name in case_names if write_csv else []:
+        output_base = os.path.join(output_folder, case_name)
+        os.makedirs(output_base, exist_ok=True)
+        for component in unit_store.component_names:
+            final_result = store.frame(case_name, component)
+            final_result = final_result[final_result.iloc[:, 0].isin(pending_names)]
+            output_path = os.path.join(output_base, f"{component}.csv")
+            if os.path.exists(output_path):
+                existing = pd.read_csv(output_path)
+                existing = existing[~existing.iloc[:, 0].astype(str).isin(pending_names)]
+                final_result = pd.concat([existing, final_result], ignore_index=True)
             final_result.to_csv(output_path, index=False)
-            print(f"✅ Saved: {output_path}")
-        else:
-            print(f"⚠️ Skipped: {filename} — no valid data")
+        print(f"✅ Saved: {output_base}")
+
+    if mode == "envelope":
+        superposition_ledger.record_consumed(combination_ledger, superposed_dps, loads, salt=forces_salt)
@@ -1,69 +1,128 @@
 """
-Test the RSM for initial Design conditions
+Cross Validated Model Selection of the RSM
 --------------------------------------------------
 Author: Pranav Deshpande
 Date: July 2025
 
+k-fold cross validation of every (case, component) of the Superposition folder (stress_store or
+CaseX/*.csv, same data as '3_Final_GA_RSM.py') for every polynomial degree x {OLS, ridge, lasso} x alpha,
+one (case, component) per task on `workers` processes (fea_ga/rsm.py cross_validate, all models of a
+pair on the same folds).
+
 Changes:
-- Address of the Super position file on line 20
+- Address of the Superposition folder on line 43
+- degrees, regularizations (with their alphas) and k_folds on lines 44-46
+- r2_tolerance on line 47: a model with fewer terms is preferred when its CV R2 is within this of the best
+
+The score of a model is the out of fold R2 / RMSE of every output, fit time is per fold and predict time is
+for 1000 candidates (feature expansion and product, which grows with the number of terms of the degree).
+For every component the model with the best R2 averaged over its cases and outputs is picked, or the one
+with fewer terms within r2_tolerance of it. Ridge and lasso alphas apply to the outputs scaled to unit
+variance, so one alpha fits every stress.
 
 Outputs:
+
+Superposition/
+│
+├── rsm_cv_results.csv      # one row per (case, component, model): R2, RMSE, fit and predict time
+└── rsm_selection.json      # best model per component, used by '3_Final_GA_RSM.py' (use_rsm_selection)
 """
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-
-# --- Step 1: Load Data ---
-data = pd.read_csv(r'C:\Pranav_folders\Pranav6.1\Entire_thing\Superposition\Case1\le_r_10.csv', on_bad_lines='skip')            #Change the Address Accordingly
-
-# --- Step 2: Define Input and Output Columns ---
-input_cols = data.columns[1:12]   # Columns 1 to 12 (Python 0-indexed)
-output_cols = data.columns[12:]   # Columns 13 onwards
-
-# --- Step 4: Prepare Input and Output Data ---
-X = data[input_cols]
-Y = data[output_cols]
-
-# --- Step 5: Train-Test Split (80% Train, 20% Test) ---
-X_train, X_test, Y_train, Y_test = train_test_split(
-    X, Y, test_size=0.2, random_state=42
-)
-
-# --- Step 6: Fit RSM for Each Output (Quadratic Polynomial Regression) ---
-rsm_models = {}
-r2_scores = {}
-
-poly = PolynomialFeatures(degree=2, include_bias=False)
-X_train_poly = poly.fit_transform(X_train)
-X_test_poly = poly.transform(X_test)
-
-for output in Y.columns:
-    y_train = Y_train[output]
-    y_test = Y_test[output]
-    
-    model = LinearRegression()
-    model.fit(X_train_poly, y_train)
-    
-    r2 = model.score(X_test_poly, y_test)
-    r2_scores[output] = r2
-    
-    rsm_models[output] = {
-        'model': model,
-        'r2_score': r2
-    }
-
-# --- Summary of R² Scores ---
-print("\n📊 R² Scores for Each Output Variable:")
-for output, r2 in r2_scores.items():
-    print(f"{output:20s}: {r2:.4f}")
-
-# --- Step 7: Predict for New Input Parameter ---
-new_input = [[200, 10, 25, 60, 150, 25, 20, 0.3, 0.3, 0.4, 50]]  # Length must match 12 inputs
-new_input_poly = poly.transform(new_input)
-
-print("\n🔮 Predicted Stresses for New Input:")
-for output in Y.columns:
-    prediction = rsm_models[output]['model'].predict(new_input_poly)
-    print(f"{output:20s}: {prediction[0]:.2f}")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.rsm import SELECTION_NAME, cross_validate, save_selection
+from fea_ga.sampling import read_named_training_sets
+
+# === Settings ===
+base_path = r"C:\Pranav_folders\Pranav6.1\Entire_thing\Superposition"             #Change the Address Accordingly
+degrees = [1, 2, 3]
+regularizations = {"ols": [0.0], "ridge": [1e-3, 1e-1, 1.0], "lasso": [1e-3, 1e-2]}
+k_folds = 5
+r2_tolerance = 0.002
+random_state = 42
+workers = os.cpu_count()
+results_file = "rsm_cv_results.csv"
+
+
+def cross_validate_pair(X, Y, models):
+    return cross_validate(X, Y, models, k_folds, random_state)
+
+
+def model_label(degree, regularization, alpha):
+    return f"deg{degree} {regularization}" + (f" a={alpha:g}" if regularization != "ols" else "")
+
+
+if __name__ == "__main__":
+    # --- Step 1: Load every (case, component) ---
+    training_sets, input_cols, output_cols = read_named_training_sets(base_path)
+    keys = list(training_sets)
+    models = [(degree, regularization, alpha) for degree in degrees
+              for regularization, alphas in regularizations.items() for alpha in alphas]
+    print(f"📖 {len(keys)} (case, component) pairs, {len(input_cols)} inputs, {len(output_cols)} outputs")
+    print(f"🔎 {len(models)} models x {k_folds} folds on {workers} workers")
+
+    # --- Step 2: k-fold CV of every model, one pair per task ---
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(cross_validate_pair, [training_sets[key][0] for key in keys],
+                           [training_sets[key][1] for key in keys], [models] * len(keys),
+                           chunksize=max(1, len(keys) // (4 * workers)))
+        rows = []
+        for (case, component), pair_results in zip(keys, results):
+            for result in pair_results:
+                rows.append({
+                    "case": case, "component": component,
+                    "model": model_label(result["degree"], result["regularization"], result["alpha"]),
+                    "degree": result["degree"], "regularization": result["regularization"],
+                    "alpha": result["alpha"], "n_terms": result["n_terms"],
+                    "r2": np.nanmean(result["r2"]) if np.isfinite(result["r2"]).any() else np.nan,
+                    "r2_worst_output": np.nanmin(result["r2"]) if np.isfinite(result["r2"]).any() else np.nan,
+                    "rmse": result["rmse"].mean(),
+                    "fit_ms": result["fit_seconds"] * 1e3,
+                    "predict_ms_per_1000": result["predict_seconds"] * 1e3,
+                })
+    cv = pd.DataFrame(rows)
+    print(f"⏱ Cross validation done in {time.perf_counter() - start:.1f} s")
+    cv.to_csv(os.path.join(base_path, results_file), index=False)
+
+    # --- Step 3: Summary of every model over all pairs ---
+    summary = cv.groupby(["degree", "regularization", "alpha", "model"], sort=True).agg(
+        n_terms=("n_terms", "first"),
+        r2_mean=("r2", "mean"),
+        r2_worst_pair=("r2", "min"),
+        rmse_mean=("rmse", "mean"),
+        fit_ms=("fit_ms", "mean"),
+        predict_ms_per_1000=("predict_ms_per_1000", "mean"),
+    ).reset_index(level="model").reset_index(drop=True)
+    print("\n📊 Cross validated scores of every model (mean over all (case, component) pairs):")
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+
+    # --- Step 4: Best model per component ---
+    per_component = cv.groupby(["component", "degree", "regularization", "alpha"]).agg(
+        n_terms=("n_terms", "first"), r2=("r2", "mean"), r2_worst_case=("r2", "min"),
+        rmse=("rmse", "mean")).reset_index()
+    selection, chosen = {}, []
+    for component, candidates in per_component.groupby("component", sort=False):
+        candidates = candidates.dropna(subset=["r2"])
+        if candidates.empty:
+            print(f"⚠️ {component}: no R2 (constant outputs), left to the default model")
+            continue
+        good = candidates[candidates["r2"] >= candidates["r2"].max() - r2_tolerance]
+        best = good.sort_values(["n_terms", "r2"], ascending=[True, False]).iloc[0]
+        selection[component] = (int(best["degree"]), best["regularization"], float(best["alpha"]))
+        chosen.append({"component": component, "model": model_label(*selection[component]),
+                       "r2": best["r2"], "r2_worst_case": best["r2_worst_case"], "rmse": best["rmse"]})
+    print("\n✅ Best model per component:")
+    print(pd.DataFrame(chosen).to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+
+    selection_path = os.path.join(base_path, SELECTION_NAME)
+    save_selection(selection_path, selection, {"k_folds": k_folds, "random_state": random_state,
+                                               "r2_tolerance": r2_tolerance,
+                                               "models": [list(model) for model in models]})
+    print(f"\n💾 {os.path.join(base_path, results_file)}\n💾 {selection_path}")
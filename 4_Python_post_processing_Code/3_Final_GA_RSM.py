@@ -9,17 +9,39 @@ based on stress predictions using Response Surface Models (RSM) trained from ANS
 The fitness function is based on the Maximum Stress failure criterion.
 
 Main Features:
-- Reads RSM models trained from CSV files (one per component and case)
-- Predicts stresses for random geometry inputs
-- Computes Failure Index (FI) and fitness
-- Evolves inputs across generations via mutation
+- Reads RSM models trained from CSV files (one per component and case), all outputs of all of them
+  fitted together with one least squares solve (fea_ga/rsm.py)
+- Keeps the trained RSMs in rsm_bank.npz of the training folder (use_rsm_cache): later runs load them and
+  only train the (case, component) pairs whose data changed
+- Uses the degree / ridge / lasso model picked per component by the cross validation of '2_RSM_test.py'
+  when its rsm_selection.json is in base_path (use_rsm_selection), quadratic OLS otherwise
+- Predicts stresses for a whole population at once: one feature expansion and one matmul giving
+  [candidate, case, component, output]
+- Computes Failure Index (FI) and fitness of every candidate and (case, component) as arrays
+- Evolves inputs across generations via mutation: the mutants of every key are scored only against that
+  key's (case, component) RSM, all keys of a generation in one prediction call
+- Or (engine = "shared") evolves one population for all keys: every candidate is predicted once for every
+  case and component and ranked per key, by the worst component of each case, by the worst key of the
+  whole frame, or by your own function of the [candidate, key] fitness array (shared_ranking)
+- Or (engine = "islands") runs that shared population as islands on `workers` processes, exchanging their
+  best candidates every migration_interval generations, reproducible for a given seed and worker count
+- Keeps the predicted stresses of the "per_key" GA in a bounded LRU cache keyed on the input rounded to
+  eval_cache_tolerance (use_eval_cache), so repeated and near identical candidates are not predicted again
 - Saves top 10% results every 10 generations and finally
 
 How to Use on Another System:
 -----------------------------
 ✅ Update the following line to your own local path where your CSVs are stored:
     base_path = r"C:\your\own\path\to\Superposition"
-    The folder must contain subfolders: Case1, Case2, ..., each containing component-wise CSVs
+    The folder must contain the stress_store written by '1_Superposition.py' (read by memory mapping),
+    or subfolders: Case1, Case2, ..., each containing component-wise CSVs
+
+✅ Or train on the six unit load cases only (surrogate = "unit_loads"):
+    unit_load_path = r"C:\your\own\path\to\Component_stresses"   (stress_store or load1 ... load6 CSVs)
+    Stress is linear in the load, so every row of forces_file is predicted as the weighted sum of the
+    unit load RSMs (same multipliers as '1_Superposition.py'). That is 6 x components models whatever the
+    number of cases, and a new Forces1.csv needs no superposition run and no retraining. With the default
+    "envelope" superposition the predictions are the same as those of RSMs trained per case.
 
 ✅ Ensure each CSV has:
     - 11 input columns (cols 1 to 11) and >=1 stress output columns (cols 12+)
@@ -42,41 +64,81 @@ Date: July 2025
 
 import random
 import os
+import sys
 import numpy as np
 import pandas as pd
 from collections import defaultdict
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
+from functools import partial
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.eval_cache import CachedPredictor
+from fea_ga.evolution import DesignSpace, SharedPopulationGA
+from fea_ga.failure import MaxStressCriterion, ply_stresses
+from fea_ga.islands import IslandGA
+from fea_ga.ledger import files_signature
+from fea_ga.rsm import CACHE_NAME as RSM_CACHE_NAME, SELECTION_NAME as RSM_SELECTION_NAME, CompiledPredictor, \
+    cached_fit, load_selection
+from fea_ga.stress_store import open_store
+from fea_ga.superposition import dominant_frame, multiplier_matrix
 
 # ==================== CONFIG ==========================================
 base_path = r"C:\Pranav_folders\Pranav6.1\Entire_thing\Superposition"           # Change the Address here
-num_cases = 6
-
-# =============================== STORAGE =================================
-rsm_models_all = {}
-poly_features_all = {}
-
-# =========================== TRAINING ====================================
-for case_num in range(1, num_cases + 1):
-    case_key = f"Case{case_num}"
-    rsm_models_all[case_key] = {}
-    poly_features_all[case_key] = {}
-
-    case_path = os.path.join(base_path, case_key)
-    component_files = [f for f in os.listdir(case_path) if f.endswith(".csv")]
+num_cases = None                                                                # None: every case in the stress store
+surrogate = "cases"                                                             # "cases" or "unit_loads"
+unit_load_path = r"C:\Pranav_folders\Pranav6.1\Component_stresses"                # Change the Address here ("unit_loads")
+forces_file = "Forces1.csv"                                                     # load cases of "unit_loads"
+unit_loads = range(1, 7)
+use_rsm_cache = True                                                            # keep the trained RSMs in rsm_bank.npz
+use_rsm_selection = True                                                        # models picked by '2_RSM_test.py'
+engine = "per_key"                                                              # "per_key", "shared" population or "islands"
+shared_ranking = "per_key"                                                      # "shared": "per_key", "per_case", "worst" or a function
+seed = 0                                                                        # RNG seed of "shared" and "islands"
+workers = os.cpu_count()                                                        # "islands": one island per process
+migration_topology = "ring"                                                     # "islands": "ring", "all", "none" or {i: [j, ...]}
+migration_interval = 5                                                          # "islands": generations between migrations
+n_migrants = 2                                                                  # "islands": best candidates sent per migration
+use_eval_cache = False                                                          # "per_key": reuse stresses of repeated inputs
+eval_cache_tolerance = [0, 0, 1e-3, 1e-3, 1e-3, 1e-3, 0, 1e-4, 1e-4, 1e-4, 1]   # per input, 0 = exact, n: same ply count
+eval_cache_megabytes = 256                                                      # memory kept, least recently used dropped
+
+# The surrogate is only loaded when the script is run, not when the island workers of engine = "islands"
+# import it again (fea_ga/islands.py): they get the compiled RSMs through shared memory.
+if __name__ == "__main__":
+    # =============================== STORAGE =================================
+    if surrogate == "unit_loads":
+        # One RSM per (unit load, component), the cases are superposed by the predictor
+        multipliers = multiplier_matrix(pd.read_csv(forces_file))
+        case_keys = [f"Case{i + 1}" for i in range(len(multipliers))]
+        training_path = unit_load_path
+        training_keys = [f"load{load}" for load in unit_loads]
+        stress_store = open_store(training_path)                                    # None for CSV only folders
+    elif surrogate == "cases":
+        training_path = base_path
+        stress_store = open_store(training_path)                                    # None for CSV only folders
+        if num_cases is None:
+            num_cases = len(stress_store.load_names) if stress_store is not None else 6
+        training_keys = [f"Case{case_num}" for case_num in range(1, num_cases + 1)]
+    else:
+        sys.exit(f"❌ Unknown surrogate {surrogate!r}, use \"cases\" or \"unit_loads\"")
 
-    for comp_file in component_files:
-        file_path = os.path.join(case_path, comp_file)
+    # =========================== TRAINING ====================================
+    def read_training_set(case_key, comp_file):
+        """(X, Y, input names, output names) of one (case, component), None when it cannot be trained."""
+        file_path = os.path.join(training_path, case_key, comp_file)
         try:
-            data = pd.read_csv(file_path, on_bad_lines='skip')
+            if stress_store is not None:
+                data = stress_store.frame(case_key, comp_file[:-len(".csv")])
+            else:
+                data = pd.read_csv(file_path, on_bad_lines='skip')
+            if surrogate == "unit_loads":
+                data = dominant_frame(data)                                         # max/min -> dominant, as superposed
         except Exception as e:
             print(f"❌ {file_path}: {e}")
-            continue
+            return None
 
         if data.shape[1] < 13:
             print(f"⚠️ {comp_file}: Not enough columns.")
-            continue
+            return None
 
         input_cols = data.columns[1:12]
         output_cols = data.columns[12:]
@@ -85,38 +147,72 @@ for case_num in range(1, num_cases + 1):
 
         if len(X) < 10:
             print(f"⚠️ {comp_file}: Too few rows.")
-            continue
+            return None
+        return X.to_numpy(dtype=np.float64), Y.to_numpy(dtype=np.float64), input_cols, output_cols
+
+
+    # Signature of the data of every (case, component): SHA-1 of the store slice or of the CSV bytes, so a
+    # touched or copied CSV is not trained again and a rewritten one always is
+    training_sources = {}
+    for case_key in training_keys:
+        case_path = os.path.join(training_path, case_key)
+        if stress_store is not None:
+            component_files = [f"{name}.csv" for name in stress_store.component_names]
+        else:
+            component_files = [f for f in os.listdir(case_path) if f.endswith(".csv")]
+        for comp_file in component_files:
+            if stress_store is not None:
+                signature = stress_store.signature(case_key, comp_file[:-len(".csv")])
+            else:
+                signature = files_signature([os.path.join(case_path, comp_file)], content=True)
+            training_sources[(case_key, comp_file)] = (signature, partial(read_training_set, case_key, comp_file))
+
+    # Quadratic RSM of every output of every (case, component), 80/20 split: one lstsq per set of
+    # training rows on standardized inputs, one coefficient tensor (fea_ga/rsm.py). Kept in
+    # rsm_bank.npz of the training folder, only pairs whose data changed are trained again.
+    # With rsm_selection.json of '2_RSM_test.py' in base_path every component gets the degree and
+    # regularization its cross validation picked instead.
+    selection = load_selection(os.path.join(base_path, RSM_SELECTION_NAME)) if use_rsm_selection else None
+    rsm_models = {(case_key, comp_file): selection[comp_file[:-len(".csv")]] for case_key, comp_file in training_sources
+                  if comp_file[:-len(".csv")] in selection} if selection else None
+    if rsm_models:
+        print(f"📖 Models of {len(selection)} components from {RSM_SELECTION_NAME}")
+    rsm_cache = os.path.join(training_path, RSM_CACHE_NAME) if use_rsm_cache else None
+    rsm_bank, trained_now = cached_fit(rsm_cache, training_sources, degree=2, test_size=0.2, random_state=42,
+                                       settings={"surrogate": surrogate}, models=rsm_models)
+    print(f"✅ {int(rsm_bank.trained.sum())} RSMs x {len(rsm_bank.output_names)} outputs, "
+          f"{len(trained_now)} trained now" + (f", the rest from {rsm_cache}" if rsm_cache else ""))
+
+    # =================== PREDICTION ======================================
+    # Coefficients of every (case, component, output) stacked into one matrix, so a whole population is one
+    # feature expansion and one matmul (fea_ga/rsm.py). With "unit_loads" the multipliers of the cases are
+    # folded into the coefficients: every case is the weighted sum of the unit load RSMs.
+    if surrogate == "unit_loads":
+        predictor = CompiledPredictor(rsm_bank, multipliers, case_keys)
+    else:
+        predictor = CompiledPredictor(rsm_bank)
+    stress_keys = [(s, c, f"stress_{comp_file.replace('.csv', '')}_case{case_key.replace('Case', '')}")
+                   for s, case_key in sorted(enumerate(predictor.case_names), key=lambda item: item[1])
+                   for c, comp_file in sorted(enumerate(predictor.component_names), key=lambda item: item[1])
+                   if predictor.trained[s, c]]
+    key_pairs = {key: (s, c) for s, c, key in stress_keys}
+
+    # Stresses of inputs already predicted, looked up by the input rounded to eval_cache_tolerance
+    # (fea_ga/eval_cache.py). They are stresses, not fitness, so changing the allowables keeps them valid.
+    # Off by default: the mutants of this GA rarely repeat, watch the hit rate printed every generation.
+    cached_predictor = CachedPredictor(predictor, eval_cache_tolerance, eval_cache_megabytes * 2**20) \
+        if use_eval_cache else predictor
+
+
+def predict_population(inputs):
+    """[P, case, component, output] stresses of P input vectors."""
+    return cached_predictor(np.asarray(inputs, dtype=np.float64))
 
-        try:
-            X_train, _, Y_train, _ = train_test_split(X, Y, test_size=0.2, random_state=42)
-        except:
-            continue
-
-        poly = PolynomialFeatures(degree=2, include_bias=False)
-        X_train_poly = poly.fit_transform(X_train)
-
-        stress_models = {}
-        for output in Y.columns:
-            model = LinearRegression()
-            model.fit(X_train_poly, Y_train[output])
-            stress_models[output] = model
-
-        rsm_models_all[case_key][comp_file] = stress_models
-        poly_features_all[case_key][comp_file] = poly
-
-# =================== PREDICTION ======================================
-def predict_all_cases(new_input_12vals):
-    results = {}
-    for case_key in rsm_models_all:
-        results[case_key] = {}
-        for comp_file in rsm_models_all[case_key]:
-            models = rsm_models_all[case_key][comp_file]
-            poly = poly_features_all[case_key][comp_file]
-            input_df = pd.DataFrame([new_input_12vals], columns=poly.feature_names_in_)
-            input_poly = poly.transform(input_df)
-            predictions = {stress: model.predict(input_poly)[0] for stress, model in models.items()}
-            results[case_key][comp_file] = predictions
-    return results
+
+def predict_keys(inputs, keys):
+    """[P, output] stresses of P input vectors, each only for the (case, component) of its own key."""
+    cases, components = zip(*(key_pairs[key] for key in keys))
+    return cached_predictor.predict_pairs(np.asarray(inputs, dtype=np.float64), cases, components)
 
 # =================== Allowable stresses extracted from Ansys Engineering Data ===========================
 Tensile_X = 513_000_000
@@ -129,34 +225,13 @@ Shear_XY = 120_000_000
 Shear_YZ = 55_000_000
 Shear_XZ = 55_000_000
 
-#=========================Failure Criteria ========================================
-def Max_stress_criteria(stress_dict):
-    FI_dict = {}
-    for key, stress_values in stress_dict.items():
-        max_fi = 0.0
-        for i in range(0, len(stress_values), 6):
-            Sx, Sy, Sz, Sxy, Syz, Sxz = stress_values[i:i+6]
-            fi_sx = abs(Sx) / (Tensile_X if Sx >= 0 else abs(Compressive_X))
-            fi_sy = abs(Sy) / (Tensile_Y if Sy >= 0 else abs(Compressive_Y))
-            fi_sz = abs(Sz) / (Tensile_Z if Sz >= 0 else abs(Compressive_Z))
-            fi_sxy = abs(Sxy) / Shear_XY
-            fi_syz = abs(Syz) / Shear_YZ
-            fi_sxz = abs(Sxz) / Shear_XZ
-            local_max_fi = max(fi_sx, fi_sy, fi_sz, fi_sxy, fi_syz, fi_sxz)
-            max_fi = max(max_fi, local_max_fi)
-        FI_dict[key] = max_fi
-    return FI_dict
-
-#==========================Fitness Function =====================================
-
-def compute_fitness(fi, min_fitness=1e-6, sharpness=8, penalty_power=2.5):
-    fi = max(fi, 1e-6)
-    if fi <= 1:
-        fitness = np.exp(-sharpness * fi)
-    else:
-        penalty_term = (fi - 1) ** penalty_power
-        fitness = np.exp(-sharpness * (1 + penalty_term))
-    return max(min_fitness, min(1.0, fitness))
+allowables = [Tensile_X, Tensile_Y, Tensile_Z, Compressive_X, Compressive_Y, Compressive_Z,
+              Shear_XY, Shear_YZ, Shear_XZ]
+
+#=========================Failure Criteria and Fitness ========================================
+# Maximum Stress FI of every ply of every (case, component) and its fitness for a whole population in a
+# few array passes (fea_ga/failure.py); fitness = exp(-8 FI), penalized above FI = 1, clipped to [1e-6, 1].
+max_stress_criterion = MaxStressCriterion(allowables)
 
 # =================== INPUT GENERATION =============================
 MIN_N = 10
@@ -173,53 +248,41 @@ def generate_random_solution():
     a, b = sorted([random.random(), random.random()])
     return ext, a1, r1, r2, dist, fillet, a2, a, b-a, 1-b, n
 
+# The same design vectors as arrays, for the "shared" engine (fea_ga/evolution.py)
+design_space = DesignSpace(
+    n_inputs=11,
+    fixed={0: 200, 1: 10, 6: 20},                                               # ext, a1, a2
+    uniform={2: (0.7*20, 1.3*20), 3: (0.7*60, 1.3*60), 4: (0.85*150, 1.15*150), 5: (0.7*25, 1.3*25)},
+    fractions=[7, 8, 9],                                                        # seg1, seg2, seg3
+    count=(10, MIN_N, MAX_N),                                                   # n
+    mutated=[2, 3, 4, 5, 7, 8, 9, 10],
+)
+
 # =================== Initial INPUT =============================
 def initial_population(no_solution):
-    population_inputs, population_stress_dicts = [], []
-    for _ in range(no_solution):
-        input_vec = generate_random_solution()
-        stresses_all_cases = predict_all_cases(input_vec)
-        stress_dict = {}
-        for case_key in sorted(stresses_all_cases.keys()):
-            case_num = case_key.replace("Case", "")
-            for comp_file in sorted(stresses_all_cases[case_key].keys()):
-                comp_name = comp_file.replace(".csv", "")
-                stress_key = f"stress_{comp_name}_case{case_num}"
-                stress_vals = list(stresses_all_cases[case_key][comp_file].values())
-                stress_dict[stress_key] = stress_vals
-        population_inputs.append(input_vec)
-        population_stress_dicts.append(stress_dict)
-    return population_inputs, population_stress_dicts
+    population_inputs = [generate_random_solution() for _ in range(no_solution)]
+    return population_inputs, predict_population(population_inputs)
 
 #====================Ranking and Appending==========================
 
-def FI_and_Fitness(inputs, stress_maps):
-    for stress_dict in stress_maps:
-        fi_result = Max_stress_criteria(stress_dict)
-        for key, val in fi_result.items():
-            if len(stress_dict[key]) % 6 == 0:
-                stress_dict[key].append(val)
-    for stress_dict in stress_maps:
-        for key in stress_dict:
-            if key.startswith("stress_") and isinstance(stress_dict[key], list):
-                if len(stress_dict[key]) % 6 == 1:
-                    fi = stress_dict[key][-1]
-                    stress_dict[key].append(compute_fitness(fi))
-    sorted_results = defaultdict(list)
-    for input_vec, stress_dict in zip(inputs, stress_maps):
-        for key in stress_dict:
-            if key.startswith("stress_") and isinstance(stress_dict[key], list):
-                stress_vec = stress_dict[key]
-                fitness = stress_vec[-1]
-                sorted_results[key].append((fitness, input_vec, stress_vec))
-    for key in sorted_results:
-        sorted_results[key].sort(key=lambda x: x[0], reverse=True)
+def FI_and_Fitness(inputs, stresses):
+    """
+    {key: [(fitness, input, stresses + [FI, fitness]), ...] best first} of the [P, case, component, output]
+    stresses of P inputs.
+    """
+    fi, fitness = max_stress_criterion.evaluate(ply_stresses(stresses))        # [P, case, component]
+    sorted_results = {}
+    for s, c, key in stress_keys:
+        order = np.argsort(-fitness[:, s, c], kind="stable")
+        sorted_results[key] = [(float(fitness[p, s, c]), inputs[p],
+                                stresses[p, s, c].tolist() + [float(fi[p, s, c]), float(fitness[p, s, c])])
+                               for p in order]
     return sorted_results
 
 #================Calling and Top10% generation=-===============
 def GA():
-    inputs, stress_maps = initial_population(100)
-    sorted_results = FI_and_Fitness(inputs, stress_maps)
+    inputs, stresses = initial_population(100)
+    sorted_results = FI_and_Fitness(inputs, stresses)
     top10_by_key = {}
     for key, all_results in sorted_results.items():
         top_n = max(1, len(all_results) // 10)
@@ -229,8 +292,9 @@ def GA():
 
 #===================Mutation ==================================
 def mutation(top10_by_key, key, n_variants=9):
+    """n_variants mutants of every input in the top 10% of key."""
     indices_to_mutate = [2, 3, 4, 5, 7, 8, 9, 10]
-    new_inputs, new_stress_maps = [], []
+    new_inputs = []
     for _, input_vec, _ in top10_by_key[key]:
         input_list = list(input_vec)
         for _ in range(n_variants):
@@ -238,23 +302,29 @@ def mutation(top10_by_key, key, n_variants=9):
             for idx in indices_to_mutate:
                 mutated[idx] *= random.uniform(0.9, 1.1)
             new_inputs.append(tuple(mutated))
-    for mutated_input in new_inputs:
-        stresses_all_cases = predict_all_cases(mutated_input)
-        stress_dict = {}
-        for case_key in sorted(stresses_all_cases.keys()):
-            case_num = case_key.replace("Case", "")
-            for comp_file in sorted(stresses_all_cases[case_key].keys()):
-                comp_name = comp_file.replace(".csv", "")
-                stress_key = f"stress_{comp_name}_case{case_num}"
-                stress_vals = list(stresses_all_cases[case_key][comp_file].values())
-                stress_dict[stress_key] = stress_vals
-        new_stress_maps.append(stress_dict)
-    sorted_mutated = FI_and_Fitness(new_inputs, new_stress_maps)
-    full_result = defaultdict(list)
-    for k in top10_by_key:
-        full_result[k].extend(top10_by_key[k])
-        full_result[k].extend(sorted_mutated.get(k, []))
-        full_result[k].sort(key=lambda x: x[0], reverse=True)
+    return new_inputs
+
+
+def mutate_generation(top10_by_key):
+    """
+    {key: top 10% + its mutants, best first} for every key. A mutant is only scored against the key it was
+    made for, so the mutants of all keys are predicted together in one call, each through its own
+    (case, component) RSM (predict_keys), and get FI and fitness in one pass.
+    """
+    batch_inputs, batch_keys = [], []
+    for key in top10_by_key:
+        new_inputs = mutation(top10_by_key, key)
+        batch_inputs.extend(new_inputs)
+        batch_keys.extend([key] * len(new_inputs))
+    full_result = {key: list(top10) for key, top10 in top10_by_key.items()}
+    if batch_inputs:
+        stresses = predict_keys(batch_inputs, batch_keys)
+        fi, fitness = max_stress_criterion.evaluate(ply_stresses(stresses))
+        for n, key in enumerate(batch_keys):
+            full_result[key].append((float(fitness[n]), batch_inputs[n],
+                                     stresses[n].tolist() + [float(fi[n]), float(fitness[n])]))
+    for key in full_result:
+        full_result[key].sort(key=lambda x: x[0], reverse=True)
     return full_result
 
 # ============================ Iteration LOOP ======================================
@@ -267,9 +337,9 @@ def run_evolution(max_iters=100, convergence_threshold=1e-8):
     for iteration in range(max_iters):
         print(f"\n===== Generation {iteration + 1} =====")
         improved = False
+        sorted_mutated = mutate_generation(top10_by_key)
         for key in top10_by_key:
             prev_best = top10_by_key[key][0][0] if top10_by_key[key] else 0.0
-            sorted_mutated = mutation(top10_by_key, key)
             top_n = max(1, len(sorted_mutated[key]) // 10)
             new_top10 = sorted_mutated[key][:top_n]
             new_best = new_top10[0][0]
@@ -281,6 +351,10 @@ def run_evolution(max_iters=100, convergence_threshold=1e-8):
             else:
                 stagnant_counter[key] += 1
             print(f"▶️ {key}: Best fitness = {new_best:.6f}, Δ = {new_best - prev_best:.2e}")
+        if use_eval_cache:
+            print(f"💾 Evaluation cache: {cached_predictor.hits} hits, {cached_predictor.misses} misses "
+                  f"({cached_predictor.hit_rate:.1%}), {len(cached_predictor)} entries, "
+                  f"{cached_predictor.nbytes / 2**20:.0f} MB")
         if (iteration + 1) % 1 == 0:
             save_top10_to_csv(top10_by_key, iteration + 1)
         if not improved and all(stagnant_counter[k] >= max_stagnant_generations for k in top10_by_key):
@@ -293,6 +367,83 @@ def run_evolution(max_iters=100, convergence_threshold=1e-8):
             print(f"  {i+1}. Fitness = {fitness:.6f} | Input = {input_vec}")
     return top10_by_key
 
+# ============================ Shared population LOOP ======================================
+def run_shared_evolution(max_iters=100, convergence_threshold=1e-8):
+    """
+    One population for all keys: every candidate is predicted once for every (case, component) and ranked by
+    shared_ranking, the best 10 of every ranking survive (fea_ga/evolution.py).
+    """
+    rng = np.random.default_rng(seed)
+    ga = SharedPopulationGA(predictor, max_stress_criterion, stress_keys, design_space, ranking=shared_ranking)
+    ga.initialize(100, rng)
+    names = ga.group_names
+    stagnant_counter = np.zeros(len(names), dtype=int)
+    max_stagnant_generations = 10
+
+    for iteration in range(max_iters):
+        print(f"\n===== Generation {iteration + 1} =====")
+        prev_best = ga.best_scores()
+        ga.step(rng)
+        new_best = ga.best_scores()
+        improved = np.abs(new_best - prev_best) > convergence_threshold
+        stagnant_counter = np.where(improved, 0, stagnant_counter + 1)
+        for name, best, delta in zip(names, new_best, new_best - prev_best):
+            print(f"▶️ {name}: Best fitness = {best:.6f}, Δ = {delta:.2e}")
+        print(f"🔎 {len(ga.inputs)} survivors, {ga.evaluations} candidates evaluated in total")
+        save_top10_to_csv(ga.top_by_key(), iteration + 1)
+        if not improved.any() and (stagnant_counter >= max_stagnant_generations).all():
+            print("\n✅ Convergence achieved across all rankings.")
+            break
+    top10_by_key = ga.top_by_key()
+    save_top10_to_csv(top10_by_key, 'final')
+    scores = ga.scores(ga.fitness)
+    for g, name in enumerate(names):
+        print(f"\n📌 Final Top 5 for {name}:")
+        for i, p in enumerate(np.argsort(-scores[:, g], kind="stable")[:5]):
+            print(f"  {i+1}. Fitness = {scores[p, g]:.6f} | Input = {tuple(ga.inputs[p].tolist())}")
+    return top10_by_key
+
+# ============================ Island LOOP ======================================
+def run_island_evolution(max_iters=100, convergence_threshold=1e-8):
+    """
+    The "shared" engine on `workers` islands, one process each, with their own seeded random streams. The best
+    n_migrants of every island move along migration_topology every migration_interval generations
+    (fea_ga/islands.py). The same seed and number of workers give the same result.
+    """
+    ga = SharedPopulationGA(predictor, max_stress_criterion, stress_keys, design_space, ranking=shared_ranking)
+    names = ga.group_names
+    stagnant_counter = np.zeros(len(names), dtype=int)
+    max_stagnant_generations = 10
+    with IslandGA(predictor, max_stress_criterion, stress_keys, design_space, n_islands=workers, seed=seed,
+                  topology=migration_topology, migration_interval=migration_interval, n_migrants=n_migrants,
+                  ranking=shared_ranking) as islands:
+        print(f"🔎 {workers} islands, {migration_topology} migration of {n_migrants} every {migration_interval} generations")
+        prev_best = None
+        while islands.generation < max_iters:
+            island_best = islands.evolve(min(migration_interval, max_iters - islands.generation))
+            new_best = island_best.max(axis=0)
+            print(f"\n===== Generation {islands.generation} =====")
+            if prev_best is not None:
+                improved = np.abs(new_best - prev_best) > convergence_threshold
+                stagnant_counter = np.where(improved, 0, stagnant_counter + migration_interval)
+            for name, best, island in zip(names, new_best, island_best.argmax(axis=0)):
+                print(f"▶️ {name}: Best fitness = {best:.6f} (island {island})")
+            print(f"🔎 {islands.evaluations} candidates evaluated in total")
+            prev_best = new_best
+            ga.inputs, ga.fi, ga.fitness, _ = islands.population()
+            save_top10_to_csv(ga.top_by_key(), islands.generation)
+            if (stagnant_counter >= max_stagnant_generations).all():
+                print("\n✅ Convergence achieved across all rankings.")
+                break
+    top10_by_key = ga.top_by_key()
+    save_top10_to_csv(top10_by_key, 'final')
+    scores = ga.scores(ga.fitness)
+    for g, name in enumerate(names):
+        print(f"\n📌 Final Top 5 for {name}:")
+        for i, p in enumerate(np.argsort(-scores[:, g], kind="stable")[:5]):
+            print(f"  {i+1}. Fitness = {scores[p, g]:.6f} | Input = {tuple(ga.inputs[p].tolist())}")
+    return top10_by_key
+
 #==========================Data Saving ===========================================
 def save_top10_to_csv(top10_by_key, iteration):
     out_dir = "Evolution_Results"
@@ -311,4 +462,11 @@ def save_top10_to_csv(top10_by_key, iteration):
 
 # ================================ MAIN ENTRY ======================================
 if __name__ == "__main__":
-    final_top = run_evolution(max_iters=100)
+    if engine == "per_key":
+        final_top = run_evolution(max_iters=100)
+    elif engine == "shared":
+        final_top = run_shared_evolution(max_iters=100)
+    elif engine == "islands":
+        final_top = run_island_evolution(max_iters=100)
+    else:
+        sys.exit(f"❌ Unknown engine {engine!r}, use \"per_key\", \"shared\" or \"islands\"")
@@ -0,0 +1,103 @@
+"""
+Benchmark of the Island Model GA
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Fits a synthetic RSM bank of realistic size (n_cases x n_components quadratic RSMs of 18 stresses, same
+inputs as '3_Final_GA_RSM.py') and runs fea_ga.islands.IslandGA on 1, 2, 4, ... up to max_workers processes:
+
+- every island has the same population and runs the same generations, so the ideal is a constant time and
+  a throughput (candidates predicted and scored per second) growing with the number of islands
+- start up (spawning the workers, attaching the shared memory, first population) is timed on its own
+- the same seed and number of islands is run twice and must give the same population
+
+Changes:
+- max_workers on line 32 to the number of cores of the machine
+- n_cases, n_components on lines 33-34 to the size of your Forces1.csv and component list
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.evolution import DesignSpace
+from fea_ga.failure import MaxStressCriterion
+from fea_ga.islands import IslandGA
+from fea_ga.rsm import CompiledPredictor, fit_bank
+
+max_workers = os.cpu_count()
+n_cases = 6
+n_components = 58
+n_generations = 10
+migration_interval = 5
+ranking = "per_key"
+seed = 0
+
+design_space = DesignSpace(
+    n_inputs=11,
+    fixed={0: 200, 1: 10, 6: 20},
+    uniform={2: (0.7*20, 1.3*20), 3: (0.7*60, 1.3*60), 4: (0.85*150, 1.15*150), 5: (0.7*25, 1.3*25)},
+    fractions=[7, 8, 9],
+    count=(10, 10, 100),
+    mutated=[2, 3, 4, 5, 7, 8, 9, 10],
+)
+allowables = [513e6, 513e6, 50e6, -437e6, -437e6, -150e6, 120e6, 55e6, 55e6]
+
+
+def synthetic_predictor(rng, n_design_points=400):
+    """Quadratic RSMs fitted to random quadratic responses, stresses of the order of the allowables."""
+    X = design_space.sample(n_design_points, rng)
+    Z = (X - X.mean(axis=0)) / np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)
+    Z = Z[:, X.std(axis=0) > 0]
+    base = np.hstack([Z, Z ** 2])
+    sets = {}
+    for case in range(n_cases):
+        for component in range(n_components):
+            Y = base @ rng.normal(0.0, 2e7, (base.shape[1], 18)) + rng.normal(0.0, 5e7, 18)
+            sets[(f"Case{case + 1}", f"le_{component + 1}")] = (X, Y)
+    names = [f"Ply{p}_S{s}" for p in (1, 2, 3) for s in ("X", "Y", "Z", "XY", "YZ", "XZ")]
+    bank = fit_bank(sets, [f"x{i}" for i in range(X.shape[1])], names, degree=2)
+    return CompiledPredictor(bank)
+
+
+def run(predictor, keys, n_islands):
+    criterion = MaxStressCriterion(allowables)
+    start = time.perf_counter()
+    with IslandGA(predictor, criterion, keys, design_space, n_islands=n_islands, seed=seed,
+                  migration_interval=migration_interval, ranking=ranking) as islands:
+        started = time.perf_counter()
+        islands.evolve(n_generations)
+        evolved = time.perf_counter()
+        population = islands.population()
+        evaluations = islands.evaluations
+    return started - start, evolved - started, evaluations, population
+
+
+if __name__ == "__main__":
+    predictor = synthetic_predictor(np.random.default_rng(seed))
+    keys = [(s, c, f"stress_{component}_case{s + 1}") for s in range(n_cases)
+            for c, component in enumerate(predictor.component_names)]
+    print(f"📖 {len(keys)} keys, {len(predictor.terms)} terms, coefficients "
+          f"{(predictor.weights.nbytes + predictor.pair_weights.nbytes) / 2**20:.1f} MB in shared memory")
+
+    # --- Reproducibility ---
+    first = run(predictor, keys, 2)[3]
+    second = run(predictor, keys, 2)[3]
+    assert all(np.array_equal(a, b) for a, b in zip(first, second)), "❌ Same seed, different populations"
+    print("✅ Same seed and number of islands give the same population")
+
+    # --- Scaling ---
+    counts = sorted({1, max_workers} | {2 ** k for k in range(1, 8) if 2 ** k < max_workers})
+    print(f"\n⏱ {n_generations} generations, migration every {migration_interval}, ranking {ranking!r}")
+    print(f"{'islands':>8} {'start s':>8} {'evolve s':>9} {'cand./s':>10} {'speedup':>8} {'efficiency':>10}")
+    reference = None
+    for n_islands in counts:
+        startup, elapsed, evaluations, _ = run(predictor, keys, n_islands)
+        throughput = evaluations / elapsed
+        reference = reference or throughput
+        print(f"{n_islands:>8} {startup:>8.2f} {elapsed:>9.2f} {throughput:>10.0f} {throughput / reference:>8.2f} "
+              f"{throughput / reference / n_islands:>10.0%}")
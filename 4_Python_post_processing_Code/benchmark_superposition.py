@@ -0,0 +1,133 @@
+"""
+Benchmark of the Node Level Superposition
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Writes one synthetic design point bundle of realistic size into a temp folder (full model export of
+n_nodes nodes, 58 components of n_component_nodes nodes, 6 load cases) and
+
+- checks fea_ga.superposition.node_envelopes against a plain loop over cases and components
+- measures the peak memory of one design point for a small and a large force table, which stays at
+  one design point plus one block of cases (block_mb) whatever the number of cases
+- runs n_sample design points (hard links of the same bundle, so the bundle is read from the disk cache)
+  on `workers` processes like '1_Superposition.py' with mode = "nodes", and extrapolates to the
+  n_design_points of the whole dataset: time, memory of all workers, size of the Superposition store
+
+Changes:
+- n_nodes, n_component_nodes on line 36 and 37 to the size of your own exports
+- n_design_points, n_cases on line 39 and 40 to the size of the dataset and of Forces1.csv
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.components import ComponentIndex
+from fea_ga.dp_bundle import STRESS_LABELS, BUNDLE_FOLDER, BUNDLE_NAME, bundle_path, design_point_fields
+from fea_ga.superposition import node_envelopes, superpose_design_point
+
+n_nodes = 50_000                    # nodes per stress export (full model export)
+n_component_nodes = 300             # nodes per .node file
+n_components = 58
+n_design_points = 4000              # design points of the dataset
+n_cases = 10                        # rows of Forces1.csv
+large_n_cases = 2000                # force table for the memory check
+n_sample = 64                       # design points actually run
+workers = os.cpu_count()
+block_mb = 256
+
+
+# =================== Synthetic bundle ===================
+def write_synthetic_bundle(dp_path, rng):
+    node_ids = np.sort(rng.choice(np.arange(1, 10 * n_nodes), n_nodes, replace=False))
+    stress = rng.normal(0.0, 1e8, (6, n_nodes, len(STRESS_LABELS))).astype(np.float32)
+    components = [np.sort(rng.choice(node_ids, n_component_nodes, replace=False)) for _ in range(n_components)]
+    os.makedirs(os.path.join(dp_path, BUNDLE_FOLDER))
+    np.savez(
+        bundle_path(dp_path)[:-len(".npz")],
+        node_ids=node_ids,
+        loads=np.arange(1, 7),
+        labels=np.array(STRESS_LABELS),
+        stress=stress,
+        component_names=np.array([f"le_{i + 1}" for i in range(n_components)]),
+        component_offsets=np.arange(n_components + 1, dtype=np.int64) * n_component_nodes,
+        component_nodes=np.concatenate(components),
+    )
+    return [f"le_{i + 1}" for i in range(n_components)]
+
+
+def loop_envelopes(components, node_ids, unit_fields, multipliers):
+    """Reference: every case and component on its own."""
+    unit_fields = np.asarray(unit_fields, dtype=np.float64)
+    maxima = np.full((len(multipliers), len(components), unit_fields.shape[2]), np.nan)
+    minima = maxima.copy()
+    for c, weights in enumerate(multipliers):
+        field = np.tensordot(weights, unit_fields, axes=1)
+        for k, nodes in enumerate(components.values()):
+            values = field[np.isin(node_ids, nodes)]
+            maxima[c, k], minima[c, k] = values.max(axis=0), values.min(axis=0)
+    return maxima, minima
+
+
+def peak_memory(dp_path, multipliers, names):
+    tracemalloc.start()
+    superpose_design_point(dp_path, multipliers, names, block_bytes=block_mb * 2**20)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    multipliers = rng.normal(0.0, 10.0, (n_cases, 6))
+    with tempfile.TemporaryDirectory() as folder:
+        first_dp = os.path.join(folder, "dp0")
+        names = write_synthetic_bundle(first_dp, rng)
+        bundle_mb = os.path.getsize(bundle_path(first_dp)) / 2**20
+
+        # --- Regression check ---
+        components, node_ids, unit_fields = design_point_fields(first_dp)
+        new_max, new_min = node_envelopes(ComponentIndex(components), np.asarray(node_ids), unit_fields, multipliers)
+        old_max, old_min = loop_envelopes(components, np.asarray(node_ids), unit_fields, multipliers)
+        scale = np.abs(old_max).max()
+        assert np.allclose(new_max, old_max, rtol=0, atol=1e-9 * scale), "❌ Max differs"
+        assert np.allclose(new_min, old_min, rtol=0, atol=1e-9 * scale), "❌ Min differs"
+        print("✅ node_envelopes gives the same max/min as the loop over cases and components")
+
+        # --- Memory of one design point ---
+        small_peak = peak_memory(first_dp, multipliers, names)
+        large_peak = peak_memory(first_dp, rng.normal(0.0, 10.0, (large_n_cases, 6)), names)
+
+        # --- Throughput on the worker pool ---
+        dp_paths = [first_dp]
+        for i in range(1, n_sample):
+            dp_path = os.path.join(folder, f"dp{i}")
+            os.makedirs(os.path.join(dp_path, BUNDLE_FOLDER))
+            os.link(bundle_path(first_dp), os.path.join(dp_path, BUNDLE_FOLDER, BUNDLE_NAME))
+            dp_paths.append(dp_path)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(superpose_design_point, dp_paths, [multipliers] * n_sample,
+                                    [names] * n_sample))
+        elapsed = time.perf_counter() - start
+        assert all(np.array_equal(result, results[0][0], equal_nan=True) for result, _ in results)
+
+    per_dp = elapsed / n_sample
+    store_gb = n_design_points * n_cases * n_components * len(STRESS_LABELS) * 4 / 2**30
+    print(f"\n⏱ One design point: {n_nodes} nodes x 6 loads x {len(STRESS_LABELS)} stresses "
+          f"(bundle {bundle_mb:.0f} MB), {n_components} components of {n_component_nodes} nodes")
+    print(f"  peak memory    : {small_peak / 2**20:8.1f} MB with {n_cases} cases | "
+          f"{large_peak / 2**20:8.1f} MB with {large_n_cases} cases (block_mb = {block_mb})")
+    print(f"  {n_sample} design points on {workers} workers : {elapsed:8.2f} s, {per_dp * 1e3:.1f} ms per design point")
+    print(f"\n📊 {n_design_points} design points x {n_cases} cases")
+    print(f"  time           : {per_dp * n_design_points / 60:8.1f} min (warm disk cache, reading "
+          f"{n_design_points * bundle_mb / 1024:.0f} GB of bundles cold takes longer)")
+    print(f"  memory         : {workers * small_peak / 2**30:8.2f} GB for {workers} workers, one design point each")
+    print(f"  store on disk  : {store_gb:8.2f} GB (memory mapped, not held in memory)")
@@ -0,0 +1,12 @@
+"""
+Shared helpers for the FEA + GA design optimisation pipeline
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The numbered stage scripts import from here when the same logic is needed in more than one stage.
+Every stage script puts the repository root on sys.path before importing, e.g.
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from fea_ga.layup import generate_layups
+"""
@@ -0,0 +1,84 @@
+"""
+Parsers for the Ansys Text Exports
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+- Mechanical result exports ('stresses_load_N/*.txt'): one header line, then whitespace separated
+  columns, node number first. Parsed by the C reader of np.loadtxt instead of the pandas python engine.
+- NWRITE node files ('Nodes/*.node'): fixed width lines, node number right aligned in the first field,
+  which may run straight into a negative coordinate ("  1234-0.12E+01"). The node field is decoded for
+  all lines at once from the raw bytes; files that are not fixed width fall back to a line loop.
+
+Both return typed numpy arrays. 'benchmark_parser.py' in 3_Python_post_preparation_codes times them
+against the old pandas path and checks that the values are the same.
+"""
+
+import numpy as np
+
+
+def _header_lines(path):
+    with open(path, "rb") as f:
+        first = f.readline().split()
+    return 0 if first and first[0].isdigit() else 1
+
+
+def read_stress_export(path, value_column=1):
+    """(node_ids int64, values float64) of one Mechanical text export."""
+    data = np.loadtxt(path, skiprows=_header_lines(path), usecols=(0, value_column), ndmin=2)
+    return data[:, 0].astype(np.int64), data[:, 1]
+
+
+def read_stress_exports(paths, value_column=1):
+    """
+    Several exports of the same result set side by side.
+    Returns (node_ids, values[n_nodes, n_files]), NaN where a node is missing in one export.
+    """
+    exports = [read_stress_export(path, value_column) for path in paths]
+    first_ids = exports[0][0] if exports else np.zeros(0, dtype=np.int64)
+    if all(np.array_equal(ids, first_ids) for ids, _ in exports):
+        return first_ids, np.column_stack([values for _, values in exports])
+    node_ids = np.unique(np.concatenate([ids for ids, _ in exports]))
+    values = np.full((len(node_ids), len(exports)), np.nan)
+    for j, (ids, column) in enumerate(exports):
+        values[np.searchsorted(node_ids, ids), j] = column
+    return node_ids, values
+
+
+def _fixed_width_nodes(raw):
+    line_len = int(np.argmax(raw == 10)) + 1
+    if line_len < 2 or raw.size % line_len or not (raw[line_len - 1::line_len] == 10).all():
+        return None
+    rows = raw.reshape(-1, line_len)
+    first = rows[0]
+    is_digit = (first >= 48) & (first <= 57)
+    if not is_digit.any():
+        return None
+    start = int(np.argmax(is_digit))
+    width = start + int(np.argmax(~is_digit[start:]))
+    field = rows[:, :width]
+    digits = field.astype(np.int64) - 48
+    digits[field == 32] = 0
+    if ((digits < 0) | (digits > 9)).any() or (field[:, width - 1] == 32).any():
+        return None
+    return digits @ (10 ** np.arange(width - 1, -1, -1, dtype=np.int64))
+
+
+def read_node_file(path):
+    """Node numbers of an NWRITE .node file as an int64 array."""
+    raw = np.fromfile(path, dtype=np.uint8)
+    if raw.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    node_ids = _fixed_width_nodes(raw)
+    if node_ids is not None:
+        return node_ids
+    node_ids = []
+    for line in raw.tobytes().decode("ascii", errors="replace").splitlines():
+        tokens = line.split()
+        if not tokens:
+            continue
+        try:
+            node_ids.append(int(tokens[0].split('-')[0]))
+        except ValueError:
+            raise ValueError(f"❌ Could not parse line: {line.strip()}")
+    return np.array(node_ids, dtype=np.int64)
@@ -0,0 +1,86 @@
+"""
+Node to Component Index of a Design Point
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The .node files of one design point flattened into one label array: for every (component, node) membership
+the component number, next to the node id. Components share their boundary nodes, so a node can appear
+under several labels. The index is built once per design point and gives the max/min of every component
+for a load case in one gather + reduceat over the stress matrix, instead of one isin filter and one CSV per
+component.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ComponentIndex:
+    """Inverted node -> component index built from {component name: node ids}."""
+
+    def __init__(self, components):
+        self.names = list(components)
+        nodes = [np.unique(np.asarray(ids, dtype=np.int64)) for ids in components.values()]
+        sizes = np.array([len(ids) for ids in nodes], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.nodes = np.concatenate(nodes) if nodes else np.zeros(0, dtype=np.int64)
+        self.labels = np.repeat(np.arange(len(self.names), dtype=np.int32), sizes)
+        self._rows_cache = (None, None)
+
+    def __len__(self):
+        return len(self.names)
+
+    def rows(self, node_ids):
+        """Row of every membership in a stress matrix with these node ids, -1 where the node is not exported."""
+        cached_ids, cached_rows = self._rows_cache
+        if cached_ids is not None and np.array_equal(cached_ids, node_ids):
+            return cached_rows
+        node_ids = np.asarray(node_ids)
+        rows = np.full(len(self.nodes), -1, dtype=np.int64)
+        if len(node_ids):
+            order = np.argsort(node_ids, kind="stable")
+            sorted_ids = node_ids[order]
+            pos = np.minimum(np.searchsorted(sorted_ids, self.nodes), len(order) - 1)
+            found = sorted_ids[pos] == self.nodes
+            rows[found] = order[pos[found]]
+        self._rows_cache = (node_ids.copy(), rows)
+        return rows
+
+    def members(self, node_ids, values):
+        """(rows, labels) of the memberships that have at least one stress value, grouped by component."""
+        rows = self.rows(node_ids)
+        has_values = ~np.isnan(values).all(axis=1)
+        keep = (rows >= 0) & has_values[rows]
+        return rows[keep], self.labels[keep]
+
+    def reduce(self, node_ids, values):
+        """
+        Max and min of every component in one pass. values is (n_nodes, n_columns) in node_ids order.
+        Returns (names, max[n, n_columns], min[n, n_columns]) of the components with matching nodes.
+        """
+        rows, labels = self.members(node_ids, values)
+        counts = np.bincount(labels, minlength=len(self.names))
+        present = np.flatnonzero(counts)
+        names = [self.names[i] for i in present]
+        if not len(rows):
+            empty = np.zeros((0, values.shape[1]), dtype=values.dtype)
+            return names, empty, empty
+        starts = (np.cumsum(counts) - counts)[present]
+        gathered = values[rows]
+        return names, np.fmax.reduceat(gathered, starts, axis=0), np.fmin.reduceat(gathered, starts, axis=0)
+
+    def component_rows(self, node_ids, values):
+        """{component name: sorted rows of its nodes}, for writing the node level tables."""
+        rows, labels = self.members(node_ids, values)
+        bounds = np.searchsorted(labels, np.arange(len(self.names) + 1))
+        return {name: np.sort(rows[bounds[i]:bounds[i + 1]])
+                for i, name in enumerate(self.names) if bounds[i + 1] > bounds[i]}
+
+
+def summary_frame(names, maxima, minima, labels):
+    """stress_summary.csv layout: Component '<name>.csv', then '<label>_max', '<label>_min' per label."""
+    columns = {"Component": [f"{name}.csv" for name in names]}
+    for j, label in enumerate(labels):
+        columns[f"{label}_max"] = maxima[:, j]
+        columns[f"{label}_min"] = minima[:, j]
+    return pd.DataFrame(columns).sort_values("Component", kind="stable").reset_index(drop=True)
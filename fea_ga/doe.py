@@ -0,0 +1,169 @@
+"""
+Packed Design Of Experiments (DOE) Storage
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The wide 'sobol_composites_10_to_100_plies.csv' stores 100 ply_angle_* and 100 ply_active_* columns per
+row, mostly zero padding. The packed .npz keeps the same information as:
+
+    design_points   (n,)        int64       dp index, the row is "dp{index}" in Ansys
+    geometry        (n, g)      float64     extrusion, angle_1, radius_small, ... in geometry_names order
+    geometry_names  (g,)        str
+    ply_angles      (sum n_i,)  int8        all ply stacks back to back
+    ply_offsets     (n + 1,)    int64       stack i is ply_angles[ply_offsets[i]:ply_offsets[i + 1]]
+
+Every stage reads the DOE through load_doe(), which accepts both the .npz and the old wide CSV.
+export_ansys_csv() writes the wide layout again, only for pasting into the Ansys parameter set.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+
+# Column order of the design points table in Ansys (before the ply columns)
+GEOMETRY_COLUMNS = [
+    "extrusion", "angle_1", "radius_small", "radius_large",
+    "distance_between_circles", "frame_fillet_radius", "angle_2",
+]
+
+
+class DOE:
+    """Design points with their geometry and ragged ply stacks."""
+
+    def __init__(self, design_points, geometry, geometry_names, ply_angles, ply_offsets):
+        self.design_points = np.asarray(design_points, dtype=np.int64)
+        self.geometry = np.asarray(geometry, dtype=np.float64).reshape(len(self.design_points), -1)
+        self.geometry_names = [str(name) for name in geometry_names]
+        self.ply_angles = np.asarray(ply_angles, dtype=np.int8)
+        self.ply_offsets = np.asarray(ply_offsets, dtype=np.int64)
+        if len(self.ply_offsets) != len(self.design_points) + 1:
+            raise ValueError("❌ ply_offsets must have one entry more than design_points.")
+        if self.geometry.shape[1] != len(self.geometry_names):
+            raise ValueError("❌ geometry columns and geometry_names do not match.")
+
+    def __len__(self):
+        return len(self.design_points)
+
+    @property
+    def dp_names(self):
+        return [f"dp{i}" for i in self.design_points]
+
+    @property
+    def ply_counts(self):
+        return np.diff(self.ply_offsets)
+
+    @property
+    def max_plies(self):
+        return int(self.ply_counts.max()) if len(self) else 0
+
+    def stack(self, i):
+        return self.ply_angles[self.ply_offsets[i]:self.ply_offsets[i + 1]]
+
+    def column(self, name):
+        return self.geometry[:, self.geometry_names.index(name)]
+
+    def padded(self, max_plies=None, rows=slice(None)):
+        """Wide (angles, active) int8 matrices, zero padded to max_plies columns."""
+        max_plies = self.max_plies if max_plies is None else max_plies
+        counts = self.ply_counts[rows]
+        starts = self.ply_offsets[:-1][rows]
+        active = np.arange(max_plies) < counts[:, None]
+        angles = np.zeros((len(counts), max_plies), dtype=np.int8)
+        angles[active] = self.ply_angles[(starts[:, None] + np.arange(max_plies))[active]]
+        return angles, active.astype(np.int8)
+
+    def take(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        counts = self.ply_counts[rows]
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        starts = np.repeat(self.ply_offsets[rows], counts)
+        local = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+        return DOE(self.design_points[rows], self.geometry[rows], self.geometry_names,
+                   self.ply_angles[starts + local], offsets)
+
+    def geometry_frame(self):
+        df = pd.DataFrame(self.geometry, columns=self.geometry_names)
+        df.insert(0, "Design Points", self.dp_names)
+        return df
+
+    def to_wide_frame(self, max_plies=None):
+        """Same table as the old wide CSV: Design Points, geometry, ply_angle_*, ply_active_*."""
+        angles, active = self.padded(max_plies)
+        n_cols = angles.shape[1]
+        wide = pd.DataFrame(
+            np.hstack([angles, active]),
+            columns=[f"ply_angle_{i+1}" for i in range(n_cols)] + [f"ply_active_{i+1}" for i in range(n_cols)],
+        )
+        return pd.concat([self.geometry_frame(), wide], axis=1)
+
+
+def concat_doe(first, second):
+    if first.geometry_names != second.geometry_names:
+        raise ValueError("❌ Cannot join DOEs with different geometry columns.")
+    return DOE(
+        np.concatenate([first.design_points, second.design_points]),
+        np.vstack([first.geometry, second.geometry]),
+        first.geometry_names,
+        np.concatenate([first.ply_angles, second.ply_angles]),
+        np.concatenate([first.ply_offsets, first.ply_offsets[-1] + second.ply_offsets[1:]]),
+    )
+
+
+def doe_from_padded(design_points, geometry, geometry_names, angles, active):
+    """Pack wide (angles, active) matrices, active plies must come first in every row."""
+    active = np.asarray(active).astype(bool)
+    counts = active.sum(axis=1)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return DOE(design_points, geometry, geometry_names, np.asarray(angles)[active].astype(np.int8), offsets)
+
+
+def save_doe(doe, path):
+    np.savez_compressed(
+        path,
+        format_version=FORMAT_VERSION,
+        design_points=doe.design_points,
+        geometry=doe.geometry,
+        geometry_names=np.array(doe.geometry_names),
+        ply_angles=doe.ply_angles,
+        ply_offsets=doe.ply_offsets,
+    )
+
+
+def _truthy(values):
+    return np.isin(np.asarray(values).astype(str), ["1", "True", "TRUE", "true", "'True", "1.0"])
+
+
+def _load_wide_csv(path):
+    df = pd.read_csv(path)
+    angle_cols = [c for c in df.columns if c.startswith("ply_angle")]
+    active_cols = [c for c in df.columns if c.startswith("ply_active")]
+    geometry_names = [c for c in df.columns if c not in angle_cols + active_cols and c != "Design Points"]
+    if "Design Points" in df.columns:
+        design_points = df["Design Points"].astype(str).str.replace("dp", "", regex=False).astype(np.int64)
+    else:
+        design_points = np.arange(len(df))
+    angles = df[angle_cols].fillna(0).to_numpy().astype(np.int64)
+    active = _truthy(df[active_cols].to_numpy())
+    return doe_from_padded(design_points, df[geometry_names].to_numpy(dtype=np.float64),
+                           geometry_names, angles, active)
+
+
+def load_doe(path):
+    """Read a DOE from the packed .npz or from the old wide CSV."""
+    if os.path.splitext(path)[1].lower() == ".npz":
+        with np.load(path) as data:
+            return DOE(data["design_points"], data["geometry"], data["geometry_names"],
+                       data["ply_angles"], data["ply_offsets"])
+    return _load_wide_csv(path)
+
+
+def export_ansys_csv(doe, path, max_plies=None):
+    """Wide CSV for pasting into the Ansys parameter set, active flags written as True/False."""
+    df = doe.to_wide_frame(max_plies)
+    active_cols = [c for c in df.columns if c.startswith("ply_active")]
+    df[active_cols] = df[active_cols].astype(bool)
+    df.to_csv(path, index=False)
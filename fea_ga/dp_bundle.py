@@ -0,0 +1,176 @@
+"""
+Packed Design Point Bundle
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+One file per design point instead of 'Nodes/' plus six 'stresses_load_N/' folders of text exports:
+
+    Bundle/dp_bundle.npz
+        node_ids            (n_nodes,)                  int64   nodes of the stress exports, sorted
+        loads               (n_loads,)                  int64   load case numbers
+        labels              (18,)                       str     Ply1_SX ... Ply3_SXZ
+        stress              (n_loads, n_nodes, 18)      float32 NaN where a node is missing in an export
+        component_names     (n_comp,)                   str     le_1, le_r_2, ... (from the .node files)
+        component_offsets   (n_comp + 1,)               int64
+        component_nodes     (sum of sizes,)             int64   node ids of component i are
+                                                                component_nodes[offsets[i]:offsets[i + 1]]
+
+By default the arrays are stored uncompressed inside the .npz so open_bundle() can memory map them
+straight out of the zip. compress=True makes smaller files which are read into memory instead.
+"""
+
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from fea_ga.ansys_text import read_node_file, read_stress_exports
+
+BUNDLE_FOLDER = "Bundle"
+BUNDLE_NAME = "dp_bundle.npz"
+
+STRESS_LABELS = [
+    "Ply1_SX", "Ply1_SY", "Ply1_SZ",
+    "Ply1_SXY", "Ply1_SYZ", "Ply1_SXZ",
+    "Ply2_SX", "Ply2_SY", "Ply2_SZ",
+    "Ply2_SXY", "Ply2_SYZ", "Ply2_SXZ",
+    "Ply3_SX", "Ply3_SY", "Ply3_SZ",
+    "Ply3_SXY", "Ply3_SYZ", "Ply3_SXZ"
+]
+
+
+def bundle_path(dp_path):
+    return os.path.join(dp_path, BUNDLE_FOLDER, BUNDLE_NAME)
+
+
+def read_design_point(dp_path, loads=range(1, 7), labels=STRESS_LABELS):
+    """
+    Text exports of one design point folder.
+    Returns ({component name: node ids}, node_ids, stress[load, node, label]) with the loads in the given order.
+    """
+    node_dir = os.path.join(dp_path, "Nodes")
+    node_files = sorted(f for f in os.listdir(node_dir) if f.endswith(".node"))
+    components = {f[:-len(".node")]: read_node_file(os.path.join(node_dir, f)) for f in node_files}
+
+    exports = {}
+    for load in loads:
+        stress_dir = os.path.join(dp_path, f"stresses_load_{load}")
+        stress_files = sorted(f for f in os.listdir(stress_dir) if f.endswith(".txt"))
+        if len(stress_files) < len(labels):
+            raise ValueError(f"❌ Only {len(stress_files)} stress files found in {stress_dir}. Expected {len(labels)}.")
+        exports[load] = read_stress_exports([os.path.join(stress_dir, f) for f in stress_files[:len(labels)]])
+
+    node_ids = np.unique(np.concatenate([ids for ids, _ in exports.values()]))
+    stress = np.full((len(exports), len(node_ids), len(labels)), np.nan, dtype=np.float32)
+    for i, (ids, values) in enumerate(exports.values()):
+        stress[i, np.searchsorted(node_ids, ids)] = values
+    return components, node_ids, stress
+
+
+def pack_design_point(dp_path, loads=range(1, 7), labels=STRESS_LABELS, compress=False, out_path=None):
+    """Pack the text exports of one design point folder into a bundle, returns the bundle path."""
+    components, node_ids, stress = read_design_point(dp_path, loads, labels)
+
+    out_path = out_path or bundle_path(dp_path)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    save = np.savez_compressed if compress else np.savez
+    tmp_path = out_path + ".part.npz"
+    save(
+        tmp_path,
+        node_ids=node_ids,
+        loads=np.array(list(loads), dtype=np.int64),
+        labels=np.array(labels),
+        stress=stress,
+        component_names=np.array(list(components)),
+        component_offsets=np.concatenate([[0], np.cumsum([len(c) for c in components.values()])]).astype(np.int64),
+        component_nodes=(np.concatenate(list(components.values())) if components
+                         else np.zeros(0, dtype=np.int64)),
+    )
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+# =========================== Reading bundles ===========================
+def _mmap_member(path, info):
+    # Offset of the .npy data of a stored (uncompressed) zip member
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_len = int.from_bytes(local_header[26:28], "little")
+        extra_len = int.from_bytes(local_header[28:30], "little")
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject or 0 in shape:
+        return None
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+class DPBundle:
+    """Arrays of one bundle, memory mapped when the members are stored uncompressed."""
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        arrays = {}
+        with zipfile.ZipFile(path) as zf:
+            infos = {info.filename[:-len(".npy")]: info for info in zf.infolist()}
+        if mmap:
+            for name, info in infos.items():
+                if info.compress_type == zipfile.ZIP_STORED:
+                    mapped = _mmap_member(path, info)
+                    if mapped is not None:
+                        arrays[name] = mapped
+        missing = [name for name in infos if name not in arrays]
+        if missing:
+            with np.load(path) as data:
+                for name in missing:
+                    arrays[name] = data[name]
+        self.node_ids = arrays["node_ids"]
+        self.loads = [int(load) for load in arrays["loads"]]
+        self.labels = [str(label) for label in arrays["labels"]]
+        self.stress = arrays["stress"]
+        self.component_names = [str(name) for name in arrays["component_names"]]
+        self.component_offsets = arrays["component_offsets"]
+        self.component_nodes = arrays["component_nodes"]
+
+    def components(self):
+        """{component name: node ids}, same content as the Nodes/*.node files."""
+        return {name: np.asarray(self.component_nodes[self.component_offsets[i]:self.component_offsets[i + 1]])
+                for i, name in enumerate(self.component_names)}
+
+    def load_stress(self, load):
+        """(n_nodes, 18) stress of one load case."""
+        return self.stress[self.loads.index(load)]
+
+    def stress_frame(self, load):
+        """Same table as the text path: index Node, one column per stress label."""
+        df = pd.DataFrame(np.asarray(self.load_stress(load)), columns=self.labels,
+                          index=pd.Index(np.asarray(self.node_ids), name="Node"))
+        return df.dropna(how="all")
+
+
+def open_bundle(dp_path, mmap=True):
+    """DPBundle of a design point folder, None when it was not packed."""
+    path = bundle_path(dp_path)
+    return DPBundle(path, mmap=mmap) if os.path.exists(path) else None
+
+
+def design_point_fields(dp_path, loads=range(1, 7)):
+    """
+    ({component name: node ids}, node_ids, stress[load, node, 18]) of one design point, from the bundle when
+    it was packed (loads in the given order), from the text exports otherwise.
+    """
+    bundle = open_bundle(dp_path)
+    if bundle is None:
+        return read_design_point(dp_path, loads)
+    missing = [load for load in loads if load not in bundle.loads]
+    if missing:
+        raise ValueError(f"❌ Load cases {missing} not in {bundle.path}")
+    return bundle.components(), bundle.node_ids, bundle.stress[[bundle.loads.index(load) for load in loads]]
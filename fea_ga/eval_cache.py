@@ -0,0 +1,153 @@
+"""
+Quantized LRU Cache of Predicted Stresses
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The GA predicts every new candidate, also when the same design (an elite that survived, a mutant that came
+back to the same ply count n with a step below what matters) was predicted before. CachedPredictor wraps a
+CompiledPredictor (fea_ga/rsm.py) with the same calls and keeps what was predicted:
+
+    cached(X)                               [P, case, component, output] like predictor(X)
+    cached.predict_pairs(X, cases, comps)   [P, output] like predictor.predict_pairs
+
+Every input row is looked up by its quantized value round(x / tolerance) per input (tolerance 0: the exact
+value), so rows closer than half a tolerance share one entry and get the stresses of the first of them that
+was predicted. Rows repeated inside one call are predicted once. A full prediction also answers the single
+(case, component) lookups of the same design.
+
+Stresses are kept, not FI or fitness, so the entries stay valid when the failure criterion or the allowables
+change; only a new RSM needs a new cache. The cache holds at most max_bytes, the least recently used entries
+are dropped first. An entry is counted with its key and Python objects: a full entry (case x component x
+output floats, 58 x 10 x 18 x 8 B) is about 84 kB, a pair entry (output floats) about 0.5 kB, so the same
+limit holds whichever calls fill it. hits / misses count rows answered from the cache and rows predicted.
+
+A lookup costs about as much as predicting one (case, component) of a row (a few us), so the cache pays
+off when rows repeat: a population that has converged, coarse tolerances, or full predictions of every case
+and component. With the GA's mutation of every input by U(0.9, 1.1) exact and near repeats are rare.
+"""
+
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+ENTRY_OVERHEAD = 100                                            # bytes of an OrderedDict slot, besides key and value
+
+
+class CachedPredictor:
+    """LRU cache of a CompiledPredictor keyed on the quantized input vector, see the module docstring."""
+
+    def __init__(self, predictor, tolerance=0.0, max_bytes=256 * 2**20):
+        self.predictor = predictor
+        self.shape = predictor.shape
+        self.case_names = predictor.case_names
+        self.component_names = predictor.component_names
+        self.output_names = predictor.output_names
+        self.trained = predictor.trained
+        self.tolerance = np.broadcast_to(np.asarray(tolerance, dtype=np.float64), predictor.mean.shape).copy()
+        if (self.tolerance < 0).any():
+            raise ValueError(f"❌ Tolerances must be >= 0, got {self.tolerance}")
+        self._step = np.where(self.tolerance > 0, self.tolerance, 1.0)
+        self.max_bytes = max_bytes
+        self.nbytes = 0                                         # entries, keys and values
+        self._entries = OrderedDict()                           # key -> stresses, least recently used first
+        self._n_full = 0                                        # entries of __call__, [case, component, output]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+        self._n_full = 0
+        self.hits = self.misses = 0
+
+    def quantize(self, X, pairs=None):
+        """
+        One bytes key per row of X: round(x / tolerance) where tolerance > 0, x itself elsewhere, followed by the
+        (case, component) pair index of the row when pairs are given.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        steps = np.where(self.tolerance > 0, np.floor(X / self._step + 0.5), X) + 0.0     # + 0.0: no -0.0
+        if pairs is not None:
+            steps = np.column_stack([steps, pairs])
+        steps = np.ascontiguousarray(steps)
+        return steps.view(np.dtype((np.void, steps.shape[1] * steps.itemsize))).ravel().tolist()
+
+    @staticmethod
+    def _entry_bytes(key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD
+
+    def _get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def _cached(self, keys, shape, predict, fallback=None):
+        """
+        [rows, *shape] values of the keys: found ones from the cache (or fallback(row)), the first row of every
+        missing key from predict(rows), which are then kept.
+        """
+        hit_rows, hit_values, first, miss_rows, miss_slots, missing = [], [], [], [], [], {}
+        for p, key in enumerate(keys):
+            slot = missing.get(key)
+            if slot is None:
+                value = self._get(key)
+                if value is None and fallback is not None:
+                    value = fallback(p)
+                if value is not None:
+                    hit_rows.append(p)
+                    hit_values.append(value)
+                    continue
+                slot = missing[key] = len(first)
+                first.append(p)
+            miss_rows.append(p)
+            miss_slots.append(slot)
+
+        out = np.empty((len(keys),) + tuple(shape))
+        if hit_rows:
+            out[hit_rows] = np.array(hit_values)
+        if first:
+            values = predict(first)
+            out[miss_rows] = values[miss_slots]
+            for key, value in zip(missing, values):
+                value = value.copy()                            # own memory, not a view keeping the batch alive
+                self._entries[key] = value
+                self.nbytes += self._entry_bytes(key, value)
+            self._n_full += len(first) if values.ndim == 4 else 0
+            while self.nbytes > self.max_bytes and self._entries:
+                key, value = self._entries.popitem(last=False)
+                self.nbytes -= self._entry_bytes(key, value)
+                self._n_full -= value.ndim == 3
+        self.misses += len(first)
+        self.hits += len(keys) - len(first)
+        return out
+
+    def __call__(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return self._cached(self.quantize(X), self.shape, lambda rows: self.predictor(X[rows]))
+
+    def predict_pairs(self, X, cases, components):
+        X = np.asarray(X, dtype=np.float64)
+        cases = np.asarray(cases, dtype=np.int64)
+        components = np.asarray(components, dtype=np.int64)
+        pairs = cases * self.shape[1] + components
+        fallback = None
+        if self._n_full:                                        # full predictions of the same inputs
+            full_keys = self.quantize(X)
+
+            def fallback(p):
+                full = self._get(full_keys[p])
+                return None if full is None else full[cases[p], components[p]]
+
+        return self._cached(self.quantize(X, pairs), self.shape[2:], lambda rows: self.predictor.predict_pairs(
+            X[rows], cases[rows], components[rows]), fallback)
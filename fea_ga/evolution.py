@@ -0,0 +1,196 @@
+"""
+Shared Population GA Engine
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The GA of '3_Final_GA_RSM.py' keeps one top 10% per (case, component) key and mutates every key on its own,
+so the same geometry is predicted again under every key it is good for. SharedPopulationGA keeps one
+population for all keys instead:
+
+    inputs  [P, n_inputs]   design vectors
+    fi      [P, K]          Maximum Stress FI of every candidate for every key
+    fitness [P, K]
+
+Every generation the survivors are mutated and each mutant is predicted once, for every case and component
+(CompiledPredictor, in blocks of block_bytes), and scored for every key (MaxStressCriterion). The pool of
+survivors and mutants is then ranked by one of
+
+    "per_key"   the fitness of every key on its own (one ranking per key, like the per key GA)
+    "per_case"  the worst key of every case (one ranking per case)
+    "worst"     the worst key of the whole frame (one ranking)
+    callable    ranking(fitness [P, K]) -> scores [P] or [P, G], higher is better
+
+and the best elite_size of every ranking survive, a candidate that is among the best of several rankings
+only once. Stresses are not kept for the population, top_by_key predicts them again for the few candidates
+that are reported.
+
+DesignSpace draws and mutates the design vectors with a numpy Generator, so a run is repeatable from its seed.
+"""
+
+import numpy as np
+
+from fea_ga.failure import ply_stresses
+
+RANKINGS = ("per_key", "per_case", "worst")
+
+
+class DesignSpace:
+    """
+    How design vectors are drawn and mutated.
+    fixed {index: value}, uniform {index: (low, high)}, fractions: indices of the layup fractions (sorted
+    uniform cuts of [0, 1]), count (index, low, high): integer ply count, mutated: indices scaled by
+    U(mutation_range) in a mutation.
+    """
+
+    def __init__(self, n_inputs, fixed, uniform, fractions, count, mutated, mutation_range=(0.9, 1.1)):
+        self.n_inputs = n_inputs
+        self.fixed = dict(fixed)
+        self.uniform = dict(uniform)
+        self.fractions = list(fractions)
+        self.count = count
+        self.mutated = list(mutated)
+        self.mutation_range = mutation_range
+
+    def sample(self, n, rng):
+        """[n, n_inputs] random design vectors."""
+        X = np.zeros((n, self.n_inputs))
+        for i, value in self.fixed.items():
+            X[:, i] = value
+        for i, (low, high) in self.uniform.items():
+            X[:, i] = rng.uniform(low, high, n)
+        if self.fractions:
+            cuts = np.sort(rng.random((n, len(self.fractions) - 1)), axis=1)
+            X[:, self.fractions] = np.diff(cuts, axis=1, prepend=0.0, append=1.0)
+        index, low, high = self.count
+        X[:, index] = rng.integers(low, high, n, endpoint=True)
+        return X
+
+    def mutate(self, X, n_variants, rng):
+        """n_variants mutants of every row of X, the mutants of row i in rows i * n_variants ..."""
+        mutants = np.repeat(np.asarray(X, dtype=np.float64), n_variants, axis=0)
+        low, high = self.mutation_range
+        mutants[:, self.mutated] *= rng.uniform(low, high, (len(mutants), len(self.mutated)))
+        return mutants
+
+
+class SharedPopulationGA:
+    """One population scored for every key, see the module docstring."""
+
+    def __init__(self, predictor, criterion, keys, design_space, ranking="per_key", elite_size=10, n_variants=9,
+                 block_bytes=256 * 2**20):
+        self.predictor = predictor
+        self.criterion = criterion
+        self.keys = list(keys)                                  # [(case index, component index, key name)]
+        self.key_names = [key for _, _, key in self.keys]
+        self.key_cases = np.array([s for s, _, _ in self.keys], dtype=np.int64)
+        self.key_components = np.array([c for _, c, _ in self.keys], dtype=np.int64)
+        self.design_space = design_space
+        if not callable(ranking) and ranking not in RANKINGS:
+            raise ValueError(f"❌ Unknown ranking {ranking!r}, use one of {RANKINGS} or a function")
+        self.ranking = ranking
+        self.elite_size = elite_size
+        self.n_variants = n_variants
+        n_case, n_comp, n_out = predictor.shape
+        self.block_rows = max(1, block_bytes // (n_case * n_comp * n_out * 8))
+        self.inputs = np.zeros((0, design_space.n_inputs))
+        self.fi = np.zeros((0, len(self.keys)))
+        self.fitness = np.zeros((0, len(self.keys)))
+        self.evaluations = 0
+
+    # ---------------- scoring ----------------
+    def evaluate(self, X):
+        """(FI, fitness) [P, K] of P design vectors, every one predicted once for all cases and components."""
+        X = np.asarray(X, dtype=np.float64)
+        fi = np.empty((len(X), len(self.keys)))
+        fitness = np.empty_like(fi)
+        for start in range(0, len(X), self.block_rows):
+            stresses = self.predictor(X[start:start + self.block_rows])
+            block_fi, block_fitness = self.criterion.evaluate(ply_stresses(stresses))    # [rows, case, component]
+            rows = slice(start, start + len(stresses))
+            fi[rows] = block_fi[:, self.key_cases, self.key_components]
+            fitness[rows] = block_fitness[:, self.key_cases, self.key_components]
+        self.evaluations += len(X)
+        return fi, fitness
+
+    def scores(self, fitness):
+        """[P, G] ranking scores of a [P, K] fitness array, higher is better."""
+        if callable(self.ranking):
+            scores = np.asarray(self.ranking(fitness), dtype=np.float64)
+            return scores.reshape(len(fitness), -1)
+        if self.ranking == "per_key":
+            return fitness
+        if self.ranking == "worst":
+            return fitness.min(axis=1, keepdims=True)
+        cases = np.unique(self.key_cases)
+        return np.stack([fitness[:, self.key_cases == s].min(axis=1) for s in cases], axis=1)
+
+    @property
+    def group_names(self):
+        """Name of every ranking column of scores(), also before there is a population."""
+        if self.ranking == "per_key":
+            return list(self.key_names)
+        if self.ranking == "worst":
+            return ["worst"]
+        if self.ranking == "per_case":
+            names = {s: key.rsplit("_case", 1)[-1] for s, _, key in self.keys}
+            return [f"case{names[s]}" for s in np.unique(self.key_cases)]
+        return [f"score{g}" for g in range(self.scores(np.zeros((1, len(self.keys)))).shape[1])]
+
+    def _select(self, scores):
+        """Rows of the best elite_size of every ranking column, each row once, in row order."""
+        best = np.argsort(-scores, axis=0, kind="stable")[:self.elite_size]
+        return np.unique(best)
+
+    # ---------------- evolution ----------------
+    def initialize(self, n, rng):
+        """Random population of n candidates, reduced to the survivors of every ranking."""
+        inputs = self.design_space.sample(n, rng)
+        fi, fitness = self.evaluate(inputs)
+        self._keep(inputs, fi, fitness)
+
+    def step(self, rng):
+        """One generation: mutants of every survivor, scored once, survivors chosen from both."""
+        mutants = self.design_space.mutate(self.inputs, self.n_variants, rng)
+        fi, fitness = self.evaluate(mutants)
+        self._keep(np.vstack([self.inputs, mutants]), np.vstack([self.fi, fi]), np.vstack([self.fitness, fitness]))
+
+    def _keep(self, inputs, fi, fitness):
+        rows = self._select(self.scores(fitness))
+        self.inputs, self.fi, self.fitness = inputs[rows], fi[rows], fitness[rows]
+
+    def best_rows(self, n):
+        """Rows of the n candidates with the best place in any ranking column, ties in row order."""
+        scores = self.scores(self.fitness)
+        order = np.argsort(-scores, axis=0, kind="stable")
+        place = np.empty_like(order)
+        place[order, np.arange(scores.shape[1])] = np.arange(len(scores))[:, None]
+        return np.argsort(place.min(axis=1), kind="stable")[:n]
+
+    def immigrate(self, inputs, fi, fitness):
+        """Add candidates scored elsewhere on the same keys, the survivors are chosen again."""
+        known = {row.tobytes() for row in self.inputs}
+        new = np.array([row.tobytes() not in known for row in inputs], dtype=bool)
+        if new.any():
+            self._keep(np.vstack([self.inputs, inputs[new]]), np.vstack([self.fi, fi[new]]),
+                       np.vstack([self.fitness, fitness[new]]))
+
+    def best_scores(self):
+        """[G] best score of every ranking column in the current population."""
+        return self.scores(self.fitness).max(axis=0)
+
+    def top_by_key(self, n=None):
+        """
+        {key: [(fitness, input, stresses + [FI, fitness]), ...] best first}, the n best of the population for
+        every key (default elite_size), in the layout of the per key GA.
+        """
+        n = n or self.elite_size
+        top = np.argsort(-self.fitness, axis=0, kind="stable")[:n]          # [n, K]
+        stresses = self.predictor.predict_pairs(self.inputs[top.ravel()], np.tile(self.key_cases, len(top)),
+                                                np.tile(self.key_components, len(top))).reshape(len(top), len(self.keys), -1)
+        result = {}
+        for k, key in enumerate(self.key_names):
+            result[key] = [(float(self.fitness[p, k]), tuple(self.inputs[p].tolist()),
+                            stresses[r, k].tolist() + [float(self.fi[p, k]), float(self.fitness[p, k])])
+                           for r, p in enumerate(top[:, k])]
+        return result
@@ -0,0 +1,90 @@
+"""
+Maximum Stress Failure Index and Fitness of Whole Populations
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The Maximum Stress criterion of '3_Final_GA_RSM.py' on arrays instead of one Python loop per six values:
+
+    FI = max over plies and stress components of |S| / allowable,
+         the tensile allowable for S >= 0 and the compressive one for S < 0 (shear: the same both ways)
+
+With t = 1 / tensile and c = -1 / |compressive| this is max(S * t, S * c): for S >= 0 the first term is the
+ratio and the second one is <= 0, for S < 0 the other way round, so there is no abs and no branch. t and c
+only depend on the stress component, so the plies are reduced first: max(max_ply(S) * t, min_ply(S) * c).
+The stresses are read in blocks of rows that fit in the cache, turned so every pass runs along the rows, and
+reduced straight into the FI array. The stress array is never written to.
+
+fitness() is compute_fitness of the GA on an FI array: exp(-sharpness * FI) up to FI = 1, the penalty
+exp(-sharpness * (1 + (FI - 1)^penalty_power)) above, clipped to [min_fitness, 1].
+"""
+
+import numpy as np
+
+# Order of the allowables vector
+ALLOWABLE_NAMES = ["Tensile_X", "Tensile_Y", "Tensile_Z", "Compressive_X", "Compressive_Y", "Compressive_Z",
+                   "Shear_XY", "Shear_YZ", "Shear_XZ"]
+STRESS_COMPONENTS = ["SX", "SY", "SZ", "SXY", "SYZ", "SXZ"]
+
+
+class MaxStressCriterion:
+    """criterion(stress [..., ply, 6]) -> FI [...]; stress components SX, SY, SZ, SXY, SYZ, SXZ."""
+
+    def __init__(self, allowables, block_bytes=2**20):
+        allowables = np.asarray(allowables, dtype=np.float64)
+        if allowables.shape != (len(ALLOWABLE_NAMES),):
+            raise ValueError(f"❌ Expected {len(ALLOWABLE_NAMES)} allowables ({', '.join(ALLOWABLE_NAMES)}), "
+                             f"got shape {allowables.shape}")
+        tensile, compressive, shear = allowables[0:3], np.abs(allowables[3:6]), allowables[6:9]
+        self.inverse_tensile = 1.0 / np.concatenate([tensile, shear])
+        self.inverse_compressive = -1.0 / np.concatenate([compressive, shear])
+        self.block_bytes = block_bytes
+
+    def __call__(self, stress):
+        stress = np.asarray(stress)
+        n_comp = len(STRESS_COMPONENTS)
+        if stress.ndim < 2 or stress.shape[-1] != n_comp:
+            raise ValueError(f"❌ Stress must be [..., ply, {n_comp}], got shape {stress.shape}")
+        dtype = stress.dtype if stress.dtype in (np.float32, np.float64) else np.dtype(np.float64)
+        leading, n_ply = stress.shape[:-2], stress.shape[-2]
+        rows = stress.reshape(-1, n_ply, n_comp)
+        fi = np.empty(len(rows), dtype=dtype)
+
+        # Blocks turned to [ply, component, row]: every pass runs along rows, not over 6 or 18 values at a time
+        inverse_tensile = self.inverse_tensile.astype(dtype)[:, None]
+        inverse_compressive = self.inverse_compressive.astype(dtype)[:, None]
+        block = max(1, self.block_bytes // (n_ply * n_comp * dtype.itemsize))
+        buffer = np.empty((n_ply, n_comp, min(block, len(rows))), dtype=dtype)
+        highest, lowest = np.empty_like(buffer[0]), np.empty_like(buffer[0])
+        for start in range(0, len(rows), block):
+            values = rows[start:start + block]
+            n = len(values)
+            plies, hi, lo = buffer[..., :n], highest[:, :n], lowest[:, :n]
+            plies[...] = values.transpose(1, 2, 0)
+            np.max(plies, axis=0, out=hi)
+            np.min(plies, axis=0, out=lo)
+            np.multiply(hi, inverse_tensile, out=hi)
+            np.multiply(lo, inverse_compressive, out=lo)
+            np.maximum(hi, lo, out=hi)
+            np.max(hi, axis=0, out=fi[start:start + n])
+        return fi.reshape(leading)
+
+    def evaluate(self, stress, **fitness_options):
+        """(FI, fitness) arrays of a [..., ply, 6] stress array."""
+        fi = self(stress)
+        return fi, fitness(fi, **fitness_options)
+
+
+def fitness(fi, min_fitness=1e-6, sharpness=8, penalty_power=2.5):
+    """Fitness of an FI array, same values as compute_fitness of one FI."""
+    fi = np.maximum(fi, 1e-6)
+    exponent = np.minimum(fi, 1) + np.maximum(fi - 1, 0) ** penalty_power     # FI, 1 + (FI - 1)^p above 1
+    return np.clip(np.exp(-sharpness * exponent), min_fitness, 1.0)
+
+
+def ply_stresses(stresses):
+    """[..., outputs] stresses of the RSMs (Ply1_SX ... PlyN_SXZ) as a [..., ply, 6] view."""
+    n_out = stresses.shape[-1]
+    if n_out % len(STRESS_COMPONENTS):
+        raise ValueError(f"❌ {n_out} stress outputs is not a whole number of plies of {len(STRESS_COMPONENTS)}")
+    return stresses.reshape(stresses.shape[:-1] + (n_out // len(STRESS_COMPONENTS), len(STRESS_COMPONENTS)))
@@ -0,0 +1,169 @@
+"""
+Layup Features of the Design Points
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The RSM cannot take ply stacks of different length, so every stack is described by a fixed set of
+numbers. All descriptors work on the ragged stacks of the packed DOE (ply_angles + ply_offsets), the
+wide ply_angle_* / ply_active_* table is converted to that form first. Each descriptor is a few bincount
+passes over the flat ply arrays, no loop over design points or plies.
+
+    fractions           frac_0_deg, frac_45_deg, frac_90_deg, num_active_plies   (the RSM inputs)
+    lamination          lam_A1..lam_A4, lam_D1..lam_D4  in-plane and bending lamination parameters
+    outer_ply           outer_ply_angle                 angle of the first ply
+    stacking_moments    d_frac_0_deg, d_frac_45_deg, d_frac_90_deg
+                                                        fractions weighted by the bending stiffness
+                                                        share of every ply (outer plies count more)
+
+A new descriptor is a function of a PlyArrays returning {column name: array}, added to DESCRIPTORS.
+"""
+
+import numpy as np
+import pandas as pd
+
+RSM_FEATURES = ["frac_0_deg", "frac_45_deg", "frac_90_deg", "num_active_plies"]
+
+
+class PlyArrays:
+    """Flat per-ply arrays of a block of stacks, shared by all descriptors."""
+
+    def __init__(self, ply_angles, ply_offsets):
+        self.offsets = np.asarray(ply_offsets, dtype=np.int64)
+        self.counts = np.diff(self.offsets)
+        self.n = len(self.counts)
+        self.angles = np.asarray(ply_angles)[self.offsets[0]:self.offsets[-1]]
+        self._local = self.offsets - self.offsets[0]
+        self._row = None
+        self._bending = None
+
+    @property
+    def row(self):
+        """Stack number of every ply."""
+        if self._row is None:
+            self._row = np.repeat(np.arange(self.n), self.counts)
+        return self._row
+
+    def row_count(self, mask):
+        """Number of plies per stack where mask is True."""
+        counts = np.zeros(self.n, dtype=np.int64)
+        filled = self.counts > 0
+        if filled.any():
+            counts[filled] = np.add.reduceat(mask, self._local[:-1][filled], dtype=np.int64)
+        return counts
+
+    def row_sum(self, values):
+        """Sum of a per-ply array over every stack."""
+        return np.bincount(self.row, weights=values, minlength=self.n)
+
+    def row_mean(self, values):
+        return self.row_sum(values) / np.maximum(self.counts, 1)
+
+    def row_fraction(self, mask):
+        return self.row_count(mask) / np.maximum(self.counts, 1)
+
+    @property
+    def bending_weight(self):
+        """Share of every ply in the bending stiffness, (z_top^3 - z_bottom^3) / 2 with z in [-1, 1]."""
+        if self._bending is None:
+            h = np.maximum(self.counts[self.row], 1)
+            position = np.arange(len(self.row)) - self._local[:-1][self.row]
+            z_bottom = -1.0 + 2.0 * position / h
+            z_top = z_bottom + 2.0 / h
+            self._bending = (z_top ** 3 - z_bottom ** 3) / 2.0
+        return self._bending
+
+
+def _fractions(plies):
+    return {
+        "frac_0_deg": plies.row_fraction(plies.angles == 0),
+        "frac_45_deg": plies.row_fraction(np.abs(plies.angles) == 45),
+        "frac_90_deg": plies.row_fraction(plies.angles == 90),
+        "num_active_plies": plies.counts,
+    }
+
+
+def _lamination(plies):
+    theta = np.deg2rad(plies.angles.astype(np.float64))
+    trig = [np.cos(2 * theta), np.sin(2 * theta), np.cos(4 * theta), np.sin(4 * theta)]
+    columns = {f"lam_A{i + 1}": plies.row_mean(t) for i, t in enumerate(trig)}
+    columns.update({f"lam_D{i + 1}": plies.row_sum(plies.bending_weight * t) for i, t in enumerate(trig)})
+    return columns
+
+
+def _outer_ply(plies):
+    outer = np.zeros(plies.n)
+    has_plies = plies.counts > 0
+    outer[has_plies] = plies.angles[plies._local[:-1][has_plies]]
+    return {"outer_ply_angle": outer}
+
+
+def _stacking_moments(plies):
+    w = plies.bending_weight
+    return {
+        "d_frac_0_deg": plies.row_sum(w * (plies.angles == 0)),
+        "d_frac_45_deg": plies.row_sum(w * (np.abs(plies.angles) == 45)),
+        "d_frac_90_deg": plies.row_sum(w * (plies.angles == 90)),
+    }
+
+
+DESCRIPTORS = {
+    "fractions": _fractions,
+    "lamination": _lamination,
+    "outer_ply": _outer_ply,
+    "stacking_moments": _stacking_moments,
+}
+
+
+def stack_features(ply_angles, ply_offsets, descriptors=("fractions",)):
+    """{column name: array} of the ragged stacks, one value per stack."""
+    plies = PlyArrays(ply_angles, ply_offsets)
+    columns = {}
+    for name in descriptors:
+        columns.update(DESCRIPTORS[name](plies))
+    return columns
+
+
+def padded_features(angles, active, descriptors=("fractions",)):
+    """Same for wide (angles, active) matrices, the active plies are taken in column order."""
+    angles = np.asarray(angles, dtype=np.float64)
+    active = (np.asarray(active, dtype=np.float64) == 1) & ~np.isnan(angles)
+    offsets = np.concatenate([[0], np.cumsum(active.sum(axis=1))])
+    return stack_features(angles[active], offsets, descriptors)
+
+
+def wide_frame_features(df, descriptors=("fractions",)):
+    """Features of the old wide table (ply_angle_* / ply_active_* columns)."""
+    angle_cols = [col for col in df.columns if col.startswith("ply_angle")]
+    active_cols = [col for col in df.columns if col.startswith("ply_active")]
+    return padded_features(df[angle_cols].to_numpy(dtype=np.float64),
+                           df[active_cols].to_numpy(dtype=np.float64), descriptors)
+
+
+def doe_feature_frames(doe, descriptors=("fractions",), chunk_size=100_000):
+    """Yields (Design Points, geometry, features) tables of chunk_size design points at a time."""
+    for start in range(0, len(doe), chunk_size):
+        stop = min(start + chunk_size, len(doe))
+        columns = stack_features(doe.ply_angles, doe.ply_offsets[start:stop + 1], descriptors)
+        df = pd.DataFrame(doe.geometry[start:stop], columns=doe.geometry_names)
+        df.insert(0, "Design Points", [f"dp{i}" for i in doe.design_points[start:stop]])
+        for name, values in columns.items():
+            df[name] = values
+        yield df
+
+
+def csv_feature_frames(path, descriptors=("fractions",), chunk_size=100_000):
+    """Same from a wide CSV, read chunk_size rows at a time."""
+    for chunk in pd.read_csv(path, chunksize=chunk_size, float_precision="round_trip"):
+        columns = wide_frame_features(chunk, descriptors)
+        df = chunk[[col for col in chunk.columns if not col.startswith(("ply_angle", "ply_active"))]]
+        df = df.reset_index(drop=True)
+        for name, values in columns.items():
+            df[name] = values
+        yield df
+
+
+def rsm_inputs(doe):
+    """The 11 RSM inputs (geometry, 0/45/90 fractions, ply count) of every design point in a DOE."""
+    columns = stack_features(doe.ply_angles, doe.ply_offsets)
+    return np.column_stack([doe.geometry] + [columns[name] for name in RSM_FEATURES])
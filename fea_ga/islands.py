@@ -0,0 +1,203 @@
+"""
+Island Model GA on Several Processes
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+IslandGA runs n_islands SharedPopulationGA (fea_ga/evolution.py), one per worker process, each on its own
+population and its own random stream (SeedSequence(seed).spawn(n_islands)). Every migration_interval
+generations the islands stop, each sends its n_migrants best candidates with their scores, and every island
+takes in the migrants of its sources in the topology:
+
+    "ring"      island i receives from island i - 1
+    "all"       every island receives from all the others
+    "none"      no migration, independent runs
+    {i: [j, ...]}  island i receives from the islands listed
+
+The workers only ever see the RSM coefficients through shared memory (rsm.share_predictor): the compiled
+predictor is copied into it once by the main process and attached without a copy by every worker, so
+starting 16 workers does not pickle 16 coefficient banks.
+
+The islands only exchange candidates at the end of an epoch, always in island order, so a run depends only on
+the seed and the number of islands, not on which process finishes first.
+
+The workers are started with "spawn" on every platform, which imports the main script again in every
+worker: keep what the script does at import light and the rest under `if __name__ == "__main__":`.
+Every worker is limited to one BLAS thread, the islands are the parallelism.
+"""
+
+import multiprocessing as mp
+import os
+import traceback
+
+import numpy as np
+
+from fea_ga.evolution import SharedPopulationGA
+from fea_ga.rsm import attach_predictor, share_predictor
+
+TOPOLOGIES = ("ring", "all", "none")
+BLAS_THREAD_VARIABLES = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"]
+
+
+def migration_sources(topology, n_islands):
+    """{island: [islands it receives migrants from]} of a topology name or mapping."""
+    if isinstance(topology, dict):
+        return {i: [int(j) for j in topology.get(i, [])] for i in range(n_islands)}
+    if topology == "ring":
+        return {i: [(i - 1) % n_islands] if n_islands > 1 else [] for i in range(n_islands)}
+    if topology == "all":
+        return {i: [j for j in range(n_islands) if j != i] for i in range(n_islands)}
+    if topology == "none":
+        return {i: [] for i in range(n_islands)}
+    raise ValueError(f"❌ Unknown migration topology {topology!r}, use one of {TOPOLOGIES} or a dict")
+
+
+def _island(conn, spec, criterion, keys, design_space, ga_options, seed_sequence, population_size):
+    """Worker process: one island, driven by the commands of IslandGA over conn."""
+    predictor, blocks = attach_predictor(spec)
+    ga = None
+    try:
+        rng = np.random.default_rng(seed_sequence)
+        ga = SharedPopulationGA(predictor, criterion, keys, design_space, **ga_options)
+        ga.initialize(population_size, rng)
+        conn.send(None)
+        while True:
+            command, argument = conn.recv()
+            if command == "evolve":
+                for _ in range(argument):
+                    ga.step(rng)
+                conn.send((ga.best_scores(), ga.evaluations))
+            elif command == "emigrants":
+                rows = ga.best_rows(argument)
+                conn.send((ga.inputs[rows], ga.fi[rows], ga.fitness[rows]))
+            elif command == "immigrants":
+                if argument is not None:
+                    ga.immigrate(*argument)
+                conn.send(None)
+            elif command == "population":
+                conn.send((ga.inputs, ga.fi, ga.fitness))
+            elif command == "stop":
+                break
+    except Exception:
+        conn.send(RuntimeError(traceback.format_exc()))
+    finally:
+        ga = predictor = None                                   # no views left on the shared memory
+        for block in blocks:
+            block.close()
+
+
+class IslandGA:
+    """
+    with IslandGA(...) as islands:
+        islands.evolve(n)       n generations on every island, migrating every migration_interval
+        islands.population()    (inputs, fi, fitness) of all islands, in island order
+    """
+
+    def __init__(self, predictor, criterion, keys, design_space, n_islands, seed=0, topology="ring",
+                 migration_interval=5, n_migrants=2, population_size=100, **ga_options):
+        self.predictor = predictor
+        self.criterion = criterion
+        self.keys = list(keys)
+        self.design_space = design_space
+        self.n_islands = n_islands
+        self.seed = seed
+        self.sources = migration_sources(topology, n_islands)
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.population_size = population_size
+        self.ga_options = ga_options
+        self.generation = 0
+        self.evaluations = 0
+        self._processes, self._connections, self._blocks = [], [], []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        spec, self._blocks = share_predictor(self.predictor)
+        seeds = np.random.SeedSequence(self.seed).spawn(self.n_islands)
+        context = mp.get_context("spawn")
+        saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+        os.environ.update({name: "1" for name in BLAS_THREAD_VARIABLES})         # inherited by the workers
+        try:
+            for island in range(self.n_islands):
+                parent, child = context.Pipe()
+                process = context.Process(target=_island, daemon=True, args=(
+                    child, spec, self.criterion, self.keys, self.design_space, self.ga_options, seeds[island],
+                    self.population_size))
+                process.start()
+                child.close()
+                self._processes.append(process)
+                self._connections.append(parent)
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        self._receive_all()                                     # initial populations
+
+    def stop(self):
+        for conn in self._connections:
+            try:
+                conn.send(("stop", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._processes, self._connections, self._blocks = [], [], []
+
+    def _receive_all(self):
+        replies = [conn.recv() for conn in self._connections]
+        for island, reply in enumerate(replies):
+            if isinstance(reply, Exception):
+                raise RuntimeError(f"❌ Island {island} failed:\n{reply}")
+        return replies
+
+    def _all(self, command, arguments):
+        """Send one command to every island (they work in parallel), replies in island order."""
+        for conn, argument in zip(self._connections, arguments):
+            conn.send((command, argument))
+        return self._receive_all()
+
+    def evolve(self, n_generations):
+        """
+        n_generations more generations on every island, migrating whenever the total reaches a multiple of
+        migration_interval. Returns [island, G] best scores of every ranking column at the end.
+        """
+        best = None
+        while n_generations > 0:
+            epoch = min(n_generations, self.migration_interval - self.generation % self.migration_interval)
+            replies = self._all("evolve", [epoch] * self.n_islands)
+            best = np.array([scores for scores, _ in replies])
+            self.evaluations = sum(evaluations for _, evaluations in replies)
+            self.generation += epoch
+            n_generations -= epoch
+            if self.generation % self.migration_interval == 0:
+                self.migrate()
+        return best
+
+    def migrate(self):
+        """Best n_migrants of every island to the islands that receive from it."""
+        emigrants = self._all("emigrants", [self.n_migrants] * self.n_islands)
+        arguments = []
+        for island in range(self.n_islands):
+            sources = self.sources[island]
+            arguments.append(tuple(np.vstack([emigrants[j][part] for j in sources]) for part in range(3))
+                             if sources else None)
+        self._all("immigrants", arguments)
+
+    def population(self):
+        """(inputs, fi, fitness) of every island stacked in island order, and the island of every row."""
+        replies = self._all("population", [None] * self.n_islands)
+        islands = np.concatenate([np.full(len(inputs), i) for i, (inputs, _, _) in enumerate(replies)])
+        return tuple(np.vstack([reply[part] for reply in replies]) for part in range(3)) + (islands,)
@@ -0,0 +1,141 @@
+"""
+Ledger of Processed (dp, load) Pairs
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Every stage after the Ansys run keeps an append-only 'ledger.jsonl' in its output folder, one line per
+(dp, load) it has processed:
+
+    {"dp": 12, "load": 3, "signature": "<sha1>", "time": "..."}
+
+- 1_Extract.py signs the source files of a (dp, load): the .node files plus the stresses_load_N exports,
+  or the packed bundle. The signature is a SHA-1 over name, size and mtime of every file, or over the file
+  contents with content=True. A (dp, load) whose signature is in the ledger is not extracted again.
+- The later stages record the signature they consumed from the ledger of the stage before. A dp is
+  pending for them when it is complete upstream and any of its loads has a different signature than the
+  one they used, so new and re-extracted design points are picked up and nothing else is touched.
+
+Later lines win, so re-processing a (dp, load) just appends a new line. A line cut off by a crash is
+ignored and that (dp, load) is processed again.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from fea_ga.dp_bundle import bundle_path
+
+LEDGER_NAME = "ledger.jsonl"
+CHUNK_SIZE = 1 << 20
+
+
+def _listing(folder, suffix):
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(suffix)]
+
+
+def files_signature(paths, content=False):
+    """SHA-1 over (name, size, mtime) of the files, or over their contents with content=True."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        if content:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        else:
+            stat = os.stat(path)
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def source_files(dp_path, load):
+    """Files 1_Extract.py reads for one (dp, load), empty when the load case is missing."""
+    bundle = bundle_path(dp_path)
+    if os.path.exists(bundle):
+        return [bundle]
+    stress_files = _listing(os.path.join(dp_path, f"stresses_load_{load}"), ".txt")
+    if not stress_files:
+        return []
+    return _listing(os.path.join(dp_path, "Nodes"), ".node") + stress_files
+
+
+def source_signature(dp_path, load, content=False):
+    """Signature of the Ansys output of one (dp, load), None when it is missing."""
+    paths = source_files(dp_path, load)
+    return files_signature(paths, content) if paths else None
+
+
+def derived_signature(signature, salt):
+    """Signature of an output made from an input signature plus stage settings (e.g. a force table)."""
+    return hashlib.sha1(f"{signature}:{salt}".encode()).hexdigest() if salt else signature
+
+
+class Ledger:
+    """(dp, load) -> signature record of one stage, kept in <folder>/ledger.jsonl."""
+
+    def __init__(self, folder, name=LEDGER_NAME):
+        self.folder = folder
+        self.path = os.path.join(folder, name)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue            # a line cut off by a crash, that (dp, load) is done again
+                    self.entries[(entry["dp"], entry["load"])] = entry
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def signature(self, dp, load):
+        entry = self.entries.get((dp, load))
+        return entry["signature"] if entry else None
+
+    def record_many(self, items):
+        """Append [(dp, load, signature)] with one write and fsync."""
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        lines = []
+        for dp, load, signature in items:
+            entry = {"dp": int(dp), "load": int(load), "signature": signature, "time": now}
+            self.entries[(entry["dp"], entry["load"])] = entry
+            lines.append(json.dumps(entry, sort_keys=True) + "\n")
+        if not lines:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, dp, load, signature):
+        self.record_many([(dp, load, signature)])
+
+    def dps(self, loads):
+        """Design points that have every load recorded, sorted."""
+        recorded = {dp for dp, _ in self.entries}
+        return sorted(dp for dp in recorded if all((dp, load) in self.entries for load in loads))
+
+    def pending(self, source, loads, salt=""):
+        """
+        Design points complete in the source ledger that this stage has not consumed with the same
+        signatures. Returns (new, changed), both sorted.
+        """
+        new, changed = [], []
+        for dp in source.dps(loads):
+            expected = [derived_signature(source.signature(dp, load), salt) for load in loads]
+            consumed = [self.signature(dp, load) for load in loads]
+            if consumed == expected:
+                continue
+            (changed if any(s is not None for s in consumed) else new).append(dp)
+        return new, changed
+
+    def record_consumed(self, source, dps, loads, salt=""):
+        """Mark dps as done with the source signatures they were made from."""
+        self.record_many([(dp, load, derived_signature(source.signature(dp, load), salt))
+                          for dp in dps for load in loads])
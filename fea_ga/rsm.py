@@ -0,0 +1,530 @@
+"""
+Bank of Response Surface Models
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+The RSM of '3_Final_GA_RSM.py' is PolynomialFeatures(degree=2) + LinearRegression, one model per stress
+output of every (case, component). All of them are least squares fits against the same inputs, so the
+whole bank is trained here with one design matrix and one lstsq per set of training rows:
+
+- The inputs are standardized first (they run from about 0.3 to 200, which makes the quadratic terms
+  badly conditioned), inputs that are constant in the training data (ext, a1, a2) are left out.
+- (case, component) pairs with the same training rows, which is all of them when every design point has
+  every component, share one design matrix and are solved together with all their outputs as the
+  columns of the right-hand side.
+- The result is one coefficient tensor coef[set, component, feature, output] plus the R2 of the train and
+  test split, so predicting every output of every (case, component) for P inputs is one (P x F) @ (F x ...)
+  product (RSMBank.predict).
+
+The trained bank is kept in a versioned artifact (CACHE_NAME, see cached_fit): coefficients, feature names,
+scores and the signature of the data of every (case, component) pair. The next run loads it instead of
+training, and only the pairs whose data changed are read and fitted again.
+
+Every (case, component) can also have its own model: degree, "ols" / "ridge" / "lasso" and alpha, picked per
+component by the k-fold cross validation of '2_RSM_test.py' (SELECTION_NAME). All of them are coefficients
+on the same standardized inputs and the terms of a lower degree come first, so the bank stays one tensor of
+the highest degree with zeros for the terms a model does not use.
+
+CompiledPredictor keeps that product ready for the GA: the coefficients stacked once into an
+(F x case*component*output) matrix, with the load multipliers folded in when the bank was trained on the
+unit loads (case coef = sum over loads of M[case, load] * load coef, as the RSM is linear in its targets).
+When every candidate only needs one (case, component), as the mutants of one key do, predict_pairs runs
+each candidate through its own pair's coefficients instead of all of them.
+share_predictor / attach_predictor put those arrays in shared memory once, so the worker processes of the
+island GA (fea_ga/islands.py) all read the same coefficients instead of a pickled copy each.
+
+With the default OLS the predictions are those of the per output LinearRegression on the same split, up to
+round off.
+"""
+
+import json
+import os
+import warnings
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+CACHE_NAME = "rsm_bank.npz"
+CACHE_VERSION = 1
+BANK_ARRAYS = ["mean", "scale", "active", "coef", "trained", "r2_train", "r2_test", "n_train"]
+REGULARIZATIONS = ("ols", "ridge", "lasso")
+SELECTION_NAME = "rsm_selection.json"
+
+
+def polynomial_terms(n_inputs, degree=2):
+    """Input index tuples of the polynomial terms up to degree, intercept () first, same order as PolynomialFeatures."""
+    terms = [()]
+    for k in range(1, degree + 1):
+        terms.extend(combinations_with_replacement(range(n_inputs), k))
+    return terms
+
+
+def term_name(term, input_names):
+    """'r1', 'r1^2', 'r1 r2', '1' for the intercept (get_feature_names_out style)."""
+    if not term:
+        return "1"
+    parts = []
+    for i in sorted(set(term)):
+        power = term.count(i)
+        parts.append(input_names[i] if power == 1 else f"{input_names[i]}^{power}")
+    return " ".join(parts)
+
+
+def design_matrix(Z, terms):
+    """[n, n_terms] products of the standardized inputs Z [n, n_inputs]."""
+    Phi = np.empty((len(Z), len(terms)))
+    column = {term: j for j, term in enumerate(terms)}
+    for j, term in enumerate(terms):
+        if not term:
+            Phi[:, j] = 1.0
+        elif len(term) == 1:
+            Phi[:, j] = Z[:, term[0]]
+        else:
+            Phi[:, j] = Z[:, term[0]] * Phi[:, column[term[1:]]]
+    return Phi
+
+
+def _varies(X):
+    """Inputs that are not constant in X."""
+    return X.std(axis=0) > 1e-12 * np.maximum(np.abs(X.mean(axis=0)), 1.0)
+
+
+def input_standardization(X):
+    """(mean, scale, active) of the inputs X: inputs that are constant in X are left out (active False)."""
+    mean, std = X.mean(axis=0), X.std(axis=0)
+    active = _varies(X)
+    return mean, np.where(active, std, 1.0), active
+
+
+def r2_scores(Y, Y_pred):
+    """R2 of every column, NaN where Y is constant."""
+    ss_res = ((Y - Y_pred) ** 2).sum(axis=0)
+    ss_tot = ((Y - Y.mean(axis=0)) ** 2).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ss_tot > 0, 1.0 - ss_res / ss_tot, np.nan)
+
+
+def solve(Phi, Y, regularization="ols", alpha=0.0):
+    """
+    Coefficients [F, n_outputs] of Y ~ Phi, the first column of Phi being the intercept.
+    "ridge" and "lasso" penalize alpha * (sum w^2 | sum |w|) like sklearn's Ridge / Lasso, on the outputs
+    scaled to unit variance so one alpha fits every stress, the intercept is not penalized.
+    """
+    if regularization == "ols":
+        return np.linalg.lstsq(Phi, Y, rcond=None)[0]
+    if regularization not in REGULARIZATIONS:
+        raise ValueError(f"❌ Unknown regularization {regularization!r}, use one of {REGULARIZATIONS}")
+    y_mean = Y.mean(axis=0)
+    y_scale = np.where(Y.std(axis=0) > 0, Y.std(axis=0), 1.0)
+    P = Phi[:, 1:]
+    p_mean = P.mean(axis=0)
+    P_centered, Y_scaled = P - p_mean, (Y - y_mean) / y_scale
+    if regularization == "ridge":
+        gram = P_centered.T @ P_centered + alpha * np.eye(P.shape[1])
+        W = np.linalg.lstsq(gram, P_centered.T @ Y_scaled, rcond=None)[0]
+    else:
+        from sklearn.exceptions import ConvergenceWarning
+        from sklearn.linear_model import Lasso
+        lasso = Lasso(alpha=alpha, fit_intercept=False, max_iter=20000, precompute=True)
+        with warnings.catch_warnings():             # small alphas on cubic terms stop at max_iter, the CV scores tell
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            W = lasso.fit(P_centered, Y_scaled).coef_.reshape(Y.shape[1], -1).T
+    W = W * y_scale
+    return np.vstack([y_mean - p_mean @ W, W])
+
+
+class RSMBank:
+    """coef[set, component, feature, output] of the polynomial RSMs, on standardized inputs."""
+
+    def __init__(self, set_names, component_names, input_names, output_names, mean, scale, active, degree,
+                 coef, trained, r2_train, r2_test, n_train):
+        self.set_names = list(set_names)
+        self.component_names = list(component_names)
+        self.input_names = list(input_names)
+        self.output_names = list(output_names)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.active = np.asarray(active, dtype=bool)
+        self.degree = int(degree)
+        self.coef = coef
+        self.trained = trained
+        self.r2_train = r2_train
+        self.r2_test = r2_test
+        self.n_train = n_train
+        self.terms = polynomial_terms(int(self.active.sum()), self.degree)
+
+    @property
+    def feature_names(self):
+        names = [name for name, used in zip(self.input_names, self.active) if used]
+        return [term_name(term, names) for term in self.terms]
+
+    def set_index(self, name):
+        return self.set_names.index(str(name))
+
+    def component_index(self, name):
+        return self.component_names.index(str(name))
+
+    def features(self, X):
+        """[P, F] design matrix of P raw input rows."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        return design_matrix(((X - self.mean) / self.scale)[:, self.active], self.terms)
+
+    def predict(self, X):
+        """[P, set, component, output] predictions of P raw input rows, NaN for pairs that were not trained."""
+        Phi = self.features(X)
+        n_set, n_comp, n_feat, n_out = self.coef.shape
+        flat = self.coef.transpose(2, 0, 1, 3).reshape(n_feat, -1)
+        return (Phi @ flat).reshape(len(Phi), n_set, n_comp, n_out)
+
+
+def fit_bank(training_sets, input_names, output_names, degree=2, test_size=0.2, random_state=42,
+             standardization=None, models=None):
+    """
+    Train the RSMs of {(set name, component name): (X [n, n_inputs], Y [n, n_outputs])}, with the same
+    train/test split as train_test_split(X, Y, test_size, random_state) of every pair.
+    standardization (mean, scale, active) of an existing bank is used instead of the one of the data.
+    models {(set name, component name): (degree, regularization, alpha)} replaces the OLS of the given degree
+    for these pairs. The bank has the highest degree of all of them: the terms of a lower degree are the first
+    ones of a higher degree, the others get zero coefficients.
+    """
+    from sklearn.model_selection import train_test_split      # seconds to import, not needed for a cached bank
+
+    set_names = list(dict.fromkeys(set_name for set_name, _ in training_sets))
+    component_names = list(dict.fromkeys(component for _, component in training_sets))
+    n_out = len(output_names)
+    models = models or {}
+    default_model = (degree, "ols", 0.0)
+    degree = max([degree] + [model[0] for model in models.values()])
+
+    splits, split_rows = {}, {}
+    for key, (X, Y) in training_sets.items():
+        X, Y = np.asarray(X, dtype=np.float64), np.asarray(Y, dtype=np.float64)
+        if Y.shape[1] != n_out:
+            raise ValueError(f"❌ {key} has {Y.shape[1]} outputs, expected {n_out}.")
+        if len(X) not in split_rows:                # the split only depends on the number of rows
+            split_rows[len(X)] = train_test_split(np.arange(len(X)), test_size=test_size, random_state=random_state)
+        train, test = split_rows[len(X)]
+        splits[key] = (X[train], Y[train], X[test], Y[test])
+
+    if standardization is None:
+        mean, scale, active = input_standardization(np.vstack([X_train for X_train, _, _, _ in splits.values()]))
+    else:
+        mean, scale, active = standardization
+    terms = polynomial_terms(int(active.sum()), degree)
+
+    coef = np.full((len(set_names), len(component_names), len(terms), n_out), np.nan)
+    r2_train = np.full((len(set_names), len(component_names), n_out), np.nan)
+    r2_test = np.full_like(r2_train, np.nan)
+    trained = np.zeros((len(set_names), len(component_names)), dtype=bool)
+    n_train = np.zeros((len(set_names), len(component_names)), dtype=np.int64)
+
+    # Pairs trained on the same rows with the same model share the design matrix and one solve
+    groups = {}
+    for key, (X_train, _, X_test, _) in splits.items():
+        model = tuple(models.get(key, default_model))
+        groups.setdefault((X_train.tobytes(), X_test.tobytes(), model), []).append(key)
+    for (_, _, (model_degree, regularization, alpha)), keys in groups.items():
+        X_train, _, X_test, _ = splits[keys[0]]
+        n_terms = len(polynomial_terms(int(active.sum()), model_degree))
+        Phi_train = design_matrix(((X_train - mean) / scale)[:, active], terms[:n_terms])
+        Phi_test = design_matrix(((X_test - mean) / scale)[:, active], terms[:n_terms])
+        Y_train = np.hstack([splits[key][1] for key in keys])
+        solution = solve(Phi_train, Y_train, regularization, alpha)
+        train_scores = r2_scores(Y_train, Phi_train @ solution)
+        test_scores = (r2_scores(np.hstack([splits[key][3] for key in keys]), Phi_test @ solution)
+                       if len(X_test) > 1 else np.full(Y_train.shape[1], np.nan))
+        for g, (set_name, component) in enumerate(keys):
+            s, c, cols = set_names.index(set_name), component_names.index(component), slice(g * n_out, (g + 1) * n_out)
+            coef[s, c, :n_terms], coef[s, c, n_terms:] = solution[:, cols], 0.0
+            r2_train[s, c], r2_test[s, c] = train_scores[cols], test_scores[cols]
+            trained[s, c] = True
+            n_train[s, c] = len(X_train)
+
+    return RSMBank(set_names, component_names, input_names, output_names, mean, scale, active, degree,
+                   coef, trained, r2_train, r2_test, n_train)
+
+
+# =========================== Model selection ===========================
+def cross_validate(X, Y, models, k_folds=5, random_state=42, timing_rows=1000):
+    """
+    k-fold cross validation of every model (degree, regularization, alpha) on one (X, Y), on the same folds.
+    Returns one dict per model: out of fold R2 and RMSE of every output, fit seconds per fold and predict
+    seconds of timing_rows input rows (feature expansion and product, what the GA pays per candidate).
+    """
+    from time import perf_counter
+    from sklearn.model_selection import KFold
+
+    X, Y = np.asarray(X, dtype=np.float64), np.asarray(Y, dtype=np.float64)
+    active = _varies(X)
+    Z = ((X - X.mean(axis=0)) / np.where(active, X.std(axis=0), 1.0))[:, active]
+    folds = list(KFold(n_splits=k_folds, shuffle=True, random_state=random_state).split(Z))
+    Z_timing = np.resize(Z, (timing_rows, Z.shape[1]))
+
+    results = []
+    for degree, regularization, alpha in models:
+        terms = polynomial_terms(Z.shape[1], degree)
+        Y_pred, fit_seconds = np.empty_like(Y), 0.0
+        for train, test in folds:
+            start = perf_counter()
+            solution = solve(design_matrix(Z[train], terms), Y[train], regularization, alpha)
+            fit_seconds += perf_counter() - start
+            Y_pred[test] = design_matrix(Z[test], terms) @ solution
+        start = perf_counter()
+        design_matrix(Z_timing, terms) @ solution
+        predict_seconds = perf_counter() - start
+        results.append({
+            "degree": degree, "regularization": regularization, "alpha": alpha, "n_terms": len(terms),
+            "r2": r2_scores(Y, Y_pred), "rmse": np.sqrt(((Y - Y_pred) ** 2).mean(axis=0)),
+            "fit_seconds": fit_seconds / k_folds, "predict_seconds": predict_seconds,
+        })
+    return results
+
+
+def save_selection(path, selection, settings):
+    """Write {component: (degree, regularization, alpha)} chosen by '2_RSM_test.py' with the CV settings."""
+    with open(path, "w") as f:
+        json.dump({"version": CACHE_VERSION, "settings": settings,
+                   "components": {component: {"degree": int(degree), "regularization": regularization,
+                                              "alpha": float(alpha)}
+                                  for component, (degree, regularization, alpha) in selection.items()}},
+                  f, indent=2)
+
+
+def load_selection(path):
+    """{component: (degree, regularization, alpha)} of save_selection, None when there is no file."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        components = json.load(f)["components"]
+    return {component: (model["degree"], model["regularization"], model["alpha"])
+            for component, model in components.items()}
+
+
+# =========================== Cached bank ===========================
+def save_bank(path, bank, signatures, settings, untrainable=None):
+    """Write the bank with the data signatures and settings it was trained with, replaced in one step."""
+    meta = {
+        "version": CACHE_VERSION,
+        "settings": settings,
+        "set_names": bank.set_names,
+        "component_names": bank.component_names,
+        "input_names": bank.input_names,
+        "output_names": bank.output_names,
+        "feature_names": bank.feature_names,
+        "degree": bank.degree,
+        "signatures": [[s, c, signature] for (s, c), signature in signatures.items()],
+        "untrainable": [[s, c, signature] for (s, c), signature in (untrainable or {}).items()],
+    }
+    tmp_path = path + ".part.npz"
+    np.savez(tmp_path, meta=np.array(json.dumps(meta)), **{name: getattr(bank, name) for name in BANK_ARRAYS})
+    os.replace(tmp_path, path)
+
+
+def load_bank(path):
+    """(bank, signatures, settings, untrainable) of a saved bank, None when there is none or of another version."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CACHE_VERSION:
+                return None
+            arrays = {name: data[name] for name in BANK_ARRAYS}
+    except Exception as e:
+        print(f"⚠️ Unreadable RSM cache {path}, training again: {e}")
+        return None
+    bank = RSMBank(meta["set_names"], meta["component_names"], meta["input_names"], meta["output_names"],
+                   arrays["mean"], arrays["scale"], arrays["active"], meta["degree"], arrays["coef"],
+                   arrays["trained"], arrays["r2_train"], arrays["r2_test"], arrays["n_train"])
+    signatures = {(s, c): signature for s, c, signature in meta["signatures"]}
+    untrainable = {(s, c): signature for s, c, signature in meta["untrainable"]}
+    return bank, signatures, meta["settings"], untrainable
+
+
+def merge_banks(keys, banks):
+    """One bank over keys [(set, component)], every pair taken from the first of banks that trained it."""
+    set_names = list(dict.fromkeys(s for s, _ in keys))
+    component_names = list(dict.fromkeys(c for _, c in keys))
+    first = banks[0]
+    n_feat, n_out = first.coef.shape[2:]
+    coef = np.full((len(set_names), len(component_names), n_feat, n_out), np.nan)
+    r2_train = np.full((len(set_names), len(component_names), n_out), np.nan)
+    r2_test = np.full_like(r2_train, np.nan)
+    trained = np.zeros((len(set_names), len(component_names)), dtype=bool)
+    n_train = np.zeros((len(set_names), len(component_names)), dtype=np.int64)
+    for set_name, component in keys:
+        for bank in banks:
+            if set_name in bank.set_names and component in bank.component_names:
+                i, j = bank.set_index(set_name), bank.component_index(component)
+                if bank.trained[i, j]:
+                    s, c = set_names.index(set_name), component_names.index(component)
+                    coef[s, c], r2_train[s, c], r2_test[s, c] = bank.coef[i, j], bank.r2_train[i, j], bank.r2_test[i, j]
+                    trained[s, c], n_train[s, c] = True, bank.n_train[i, j]
+                    break
+    return RSMBank(set_names, component_names, first.input_names, first.output_names, first.mean, first.scale,
+                   first.active, first.degree, coef, trained, r2_train, r2_test, n_train)
+
+
+def cached_fit(path, sources, degree=2, test_size=0.2, random_state=42, settings=None, models=None):
+    """
+    fit_bank with the bank cached in path (None: no cache).
+    sources is {(set, component): (signature, load)}, load() -> (X, Y, input_names, output_names) or None
+    when the pair cannot be trained. Only pairs whose signature differs from the cached one are loaded and
+    fitted, on the standardization of the cached bank. Everything is trained again when the settings,
+    the models, the input/output names or the constant inputs changed. Returns (bank, keys of the pairs
+    trained now).
+    """
+    models = {key: (int(d), str(r), float(a)) for key, (d, r, a) in (models or {}).items() if key in sources}
+    settings = dict(settings or {}, degree=degree, test_size=test_size, random_state=random_state,
+                    models=[[s, c, d, r, a] for (s, c), (d, r, a) in sorted(models.items())])
+    cached = load_bank(path)
+    if cached is not None and cached[2] != settings:
+        cached = None
+    old_bank, old_signatures, _, old_untrainable = cached if cached is not None else (None, {}, None, {})
+
+    def load_sets(keys):
+        sets, names, untrainable = {}, None, {}
+        for key in keys:
+            signature, load = sources[key]
+            result = load()
+            if result is None:
+                untrainable[key] = signature
+            else:
+                X, Y, input_names, output_names = result
+                sets[key] = (np.asarray(X, dtype=np.float64), np.asarray(Y, dtype=np.float64))
+                names = names or ([str(n) for n in input_names], [str(n) for n in output_names])
+        return sets, names, untrainable
+
+    unchanged = [key for key, (signature, _) in sources.items()
+                 if old_signatures.get(key, old_untrainable.get(key)) == signature]
+    changed = [key for key in sources if key not in unchanged]
+    sets, names, untrainable = load_sets(changed)
+    untrainable.update({key: old_untrainable[key] for key in unchanged if key in old_untrainable})
+
+    if old_bank is not None and sets:
+        same_names = names == (old_bank.input_names, old_bank.output_names)
+        X_train = np.vstack([X for X, _ in sets.values()])
+        if not same_names or (_varies(X_train) & ~old_bank.active).any():
+            print("⚠️ Inputs or outputs of the RSM data changed, training every pair again")
+            old_bank = None
+            more_sets, _, more_untrainable = load_sets(unchanged)
+            sets.update(more_sets)
+            untrainable.update(more_untrainable)
+            changed = list(sources)
+
+    if sets:
+        standardization = None if old_bank is None else (old_bank.mean, old_bank.scale, old_bank.active)
+        new_bank = fit_bank(sets, names[0], names[1], degree, test_size, random_state, standardization, models)
+        banks = [new_bank] + ([old_bank] if old_bank is not None else [])
+    elif old_bank is not None:
+        banks = [old_bank]
+    else:
+        raise ValueError("❌ No usable training data for the RSM bank.")
+    trained_keys = [key for key in sources if key not in untrainable]
+    bank = merge_banks(trained_keys, banks)
+
+    if path and (changed or old_bank is None or set(old_signatures) != set(trained_keys)):
+        save_bank(path, bank, {key: sources[key][0] for key in trained_keys}, settings, untrainable)
+    return bank, [key for key in changed if key in sets]
+
+
+class CompiledPredictor:
+    """
+    predictor(X) -> [P, case, component, output] of P raw input rows, one feature expansion and one matmul.
+    With multipliers M [case, set] every case is the weighted sum of the bank's sets (the unit loads).
+    """
+
+    def __init__(self, bank, multipliers=None, case_names=None):
+        self.bank = bank
+        coef = bank.coef
+        if multipliers is None:
+            self.case_names = list(bank.set_names)
+            self.trained = bank.trained.copy()
+        else:
+            multipliers = np.asarray(multipliers, dtype=np.float64)
+            coef = np.einsum("cs,skfo->ckfo", multipliers, np.nan_to_num(coef))
+            self.case_names = list(case_names) if case_names is not None else [f"Case{i + 1}" for i in range(len(coef))]
+            self.trained = np.repeat(bank.trained.all(axis=0, keepdims=True), len(coef), axis=0)
+            coef[~self.trained] = np.nan
+        self.component_names = list(bank.component_names)
+        self.output_names = list(bank.output_names)
+        self.mean, self.scale, self.active, self.terms = bank.mean, bank.scale, bank.active, bank.terms
+        self.shape = coef.shape[:2] + coef.shape[3:]
+        self.weights = np.ascontiguousarray(coef.transpose(2, 0, 1, 3).reshape(coef.shape[2], -1))
+        self.pair_weights = np.ascontiguousarray(coef.reshape((-1,) + coef.shape[2:]))     # [case*comp, F, out]
+
+    def features(self, X):
+        """[P, F] design matrix of P raw input rows."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        return design_matrix(((X - self.mean) / self.scale)[:, self.active], self.terms)
+
+    def __call__(self, X):
+        Phi = self.features(X)
+        return (Phi @ self.weights).reshape((len(Phi),) + self.shape)
+
+    def predict_pairs(self, X, cases, components):
+        """
+        [P, output] of P raw input rows, row p through the model of (cases[p], components[p]) only.
+        Rows are grouped by pair, one (rows x F) @ (F x output) product per pair, all of them in one batched
+        matmul when every pair has the same number of rows.
+        """
+        Phi = self.features(X)
+        pair = np.asarray(cases, dtype=np.int64) * self.shape[1] + np.asarray(components, dtype=np.int64)
+        order = np.argsort(pair, kind="stable")
+        pairs, starts, counts = np.unique(pair[order], return_index=True, return_counts=True)
+        out = np.empty((len(Phi), self.shape[2]))
+        if len(pairs) and (counts == counts[0]).all():
+            grouped = Phi[order].reshape(len(pairs), counts[0], Phi.shape[1])
+            out[order] = np.matmul(grouped, self.pair_weights[pairs]).reshape(len(Phi), -1)
+        else:
+            for p, start, count in zip(pairs, starts, counts):
+                rows = order[start:start + count]
+                out[rows] = Phi[rows] @ self.pair_weights[p]
+        return out
+
+
+# =========================== Shared memory ===========================
+SHARED_ARRAYS = ["weights", "pair_weights", "mean", "scale", "active", "trained"]
+
+
+def share_predictor(predictor):
+    """
+    Copy the arrays of a CompiledPredictor into shared memory once, for worker processes to attach_predictor
+    instead of getting their own pickled copy. Returns (spec, blocks): spec is small and goes to the workers,
+    the owner keeps blocks open while they run and then closes and unlinks them.
+    """
+    from multiprocessing import shared_memory
+
+    spec = {"case_names": predictor.case_names, "component_names": predictor.component_names,
+            "output_names": predictor.output_names, "shape": predictor.shape,
+            "terms": [list(term) for term in predictor.terms], "arrays": {}}
+    blocks = []
+    for name in SHARED_ARRAYS:
+        array = np.ascontiguousarray(getattr(predictor, name))
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        spec["arrays"][name] = (block.name, array.shape, array.dtype.str)
+        blocks.append(block)
+    return spec, blocks
+
+
+def attach_predictor(spec):
+    """CompiledPredictor reading the shared memory of share_predictor, nothing copied. Returns (predictor, blocks)."""
+    from multiprocessing import shared_memory
+
+    predictor = CompiledPredictor.__new__(CompiledPredictor)
+    predictor.bank = None
+    predictor.case_names = list(spec["case_names"])
+    predictor.component_names = list(spec["component_names"])
+    predictor.output_names = list(spec["output_names"])
+    predictor.shape = tuple(spec["shape"])
+    predictor.terms = [tuple(term) for term in spec["terms"]]
+    blocks = []
+    for name, (block_name, shape, dtype) in spec["arrays"].items():
+        block = shared_memory.SharedMemory(name=block_name)
+        array = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        setattr(predictor, name, array)
+        blocks.append(block)
+    return predictor, blocks
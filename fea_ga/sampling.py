@@ -0,0 +1,171 @@
+"""
+Incremental and Adaptive DOE Sampling
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Two ways of adding design points to an existing DOE without starting over:
+
+- extend:   continue the same scrambled Sobol stream. The stream is fully defined by its seed and the
+            number of points already drawn, both kept in a small JSON state file next to the DOE.
+
+- adaptive: score a large candidate pool against the RSM bank (same data, inputs and polynomial model as
+            '3_Final_GA_RSM.py': the terms and standardization of fea_ga/rsm.py, constant inputs left
+            out) and keep only the K candidates where the surrogate is least certain.
+
+Adaptive scores:
+- "variance"  OLS prediction variance  s2 * x'(X'X)^-1 x, relative to each output's variance and taken
+              as the worst over all (case, component, output). Points are picked one at a time and the
+              information matrix is updated after each pick, so one batch does not pile up in one corner.
+- "loo"       the same variance, weighted by the leave-one-out error of the nearest training point,
+              so regions where the RSM already misses its own data are preferred.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from scipy.stats import qmc
+
+from fea_ga.rsm import design_matrix, input_standardization, polynomial_terms
+from fea_ga.stress_store import open_store
+
+INPUT_COLS = slice(1, 12)                   # same input/output split as the RSM scripts
+OUTPUT_COLS = slice(12, None)
+
+
+# =========================== Sobol stream state ===========================
+def sobol_stream(dimension, seed, num_generated=0):
+    """Scrambled Sobol sampler fast-forwarded past the points already used."""
+    sampler = qmc.Sobol(d=dimension, scramble=True, seed=seed)
+    if num_generated:
+        sampler.fast_forward(num_generated)
+    return sampler
+
+
+def save_sobol_state(path, seed, dimension, num_generated, param_bounds):
+    with open(path, "w") as f:
+        json.dump({"seed": int(seed), "dimension": int(dimension), "num_generated": int(num_generated),
+                   "param_bounds": {k: list(v) for k, v in param_bounds.items()}}, f, indent=2)
+
+
+def load_sobol_state(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+# =========================== RSM training data ===========================
+def read_named_training_sets(base_path):
+    """
+    ({(case, component): (X, Y)}, input names, output names) of the Superposition folder, filtered like
+    the GA training. Sliced from Superposition/stress_store when it exists, otherwise read from the
+    CaseX/*.csv files.
+    """
+    store = open_store(base_path)
+    if store is not None:
+        sets = {(case, component): store.training_arrays(case, component)
+                for case in store.load_names for component in store.component_names}
+        sets = {key: (X, Y) for key, (X, Y) in sets.items() if len(X) >= 10}
+        if not sets:
+            raise ValueError(f"❌ No usable training data found in {store.path}")
+        return sets, list(store.feature_names), list(store.stat_names)
+
+    sets, names = {}, None
+    for case_dir in sorted(d for d in os.listdir(base_path) if d.startswith("Case")):
+        case_path = os.path.join(base_path, case_dir)
+        for comp_file in sorted(f for f in os.listdir(case_path) if f.endswith(".csv")):
+            data = pd.read_csv(os.path.join(case_path, comp_file), on_bad_lines='skip')
+            if data.shape[1] < 13 or len(data) < 10:
+                continue
+            sets[(case_dir, comp_file[:-len(".csv")])] = (data.iloc[:, INPUT_COLS].to_numpy(float),
+                                                          data.iloc[:, OUTPUT_COLS].to_numpy(float))
+            names = names or (list(data.columns[INPUT_COLS]), list(data.columns[OUTPUT_COLS]))
+    if not sets:
+        raise ValueError(f"❌ No usable training data found in {base_path}")
+    return sets, names[0], names[1]
+
+
+def read_training_sets(base_path):
+    """(X, Y) arrays of every (case, component) of the Superposition folder, filtered like the GA training."""
+    return list(read_named_training_sets(base_path)[0].values())
+
+
+# =========================== Uncertainty scoring ===========================
+class _WhitenedDesign:
+    """RSM design matrix of one training set (fea_ga/rsm.py), whitened so that leverage(x) = |z(x)|^2."""
+
+    def __init__(self, X, Y, degree=2):
+        self.mean, self.scale, self.active = input_standardization(X)
+        self.terms = polynomial_terms(int(self.active.sum()), degree)
+        Phi = self.features(X)
+        U, s, Vt = np.linalg.svd(Phi, full_matrices=False)
+        keep = s > s[0] * 1e-10
+        self.projection = Vt[keep].T / s[keep]
+        Zt = Phi @ self.projection
+        residual = Y - Zt @ (Zt.T @ Y)
+        dof = max(len(X) - int(keep.sum()), 1)
+        y_var = np.where(Y.var(axis=0) > 0, Y.var(axis=0), 1.0)
+        self.relative_s2 = (residual ** 2).sum(axis=0) / dof / y_var
+        self.weight = self.relative_s2.max()
+        h = (Zt ** 2).sum(axis=1)
+        loo = residual / np.maximum(1.0 - h, 1e-12)[:, None]
+        self.loo_error = np.abs(loo / np.sqrt(y_var)).max(axis=1)
+        self.tree = cKDTree(self.standardize(X))
+
+    def standardize(self, X):
+        return ((X - self.mean) / self.scale)[:, self.active]
+
+    def features(self, X):
+        return design_matrix(self.standardize(X), self.terms)
+
+    def whiten(self, X):
+        return self.features(X) @ self.projection
+
+
+class AdaptiveSampler:
+    """
+    Pick the next design points from a candidate pool by RSM prediction uncertainty. degree is the polynomial
+    degree of the RSMs, 2 like '3_Final_GA_RSM.py'.
+    """
+
+    def __init__(self, training_sets, score="variance", degree=2):
+        if score not in ("variance", "loo"):
+            raise ValueError(f"❌ Unknown score '{score}', use 'variance' or 'loo'.")
+        self.score = score
+        # Components trained on the same design points share one design matrix
+        groups = {}
+        for X, Y in training_sets:
+            groups.setdefault(X.tobytes(), []).append((X, Y))
+        self.designs = [_WhitenedDesign(members[0][0], np.hstack([Y for _, Y in members]), degree)
+                        for members in groups.values()]
+
+    def select(self, X_candidates, k):
+        """Indices of k candidates, chosen greedily with the information matrix updated after each pick."""
+        k = min(k, len(X_candidates))
+        Zs, M_invs, leverage, weights = [], [], [], []
+        for design in self.designs:
+            Z = design.whiten(X_candidates)
+            w = np.full(len(Z), design.weight)
+            if self.score == "loo":
+                _, nearest = design.tree.query(design.standardize(X_candidates))
+                w = w * (1.0 + design.loo_error[nearest])
+            Zs.append(Z)
+            M_invs.append(np.eye(Z.shape[1]))
+            leverage.append((Z ** 2).sum(axis=1))
+            weights.append(w)
+
+        chosen = []
+        for _ in range(k):
+            score = np.max([w * lev for w, lev in zip(weights, leverage)], axis=0)
+            score[chosen] = -np.inf
+            best = int(np.argmax(score))
+            chosen.append(best)
+            # Sherman-Morrison: the picked point is added to every design's information matrix
+            for g, Z in enumerate(Zs):
+                u = M_invs[g] @ Z[best]
+                denom = 1.0 + Z[best] @ u
+                leverage[g] -= (Z @ u) ** 2 / denom
+                M_invs[g] -= np.outer(u, u) / denom
+        return np.array(chosen, dtype=np.int64)
@@ -0,0 +1,244 @@
+"""
+Memory-mapped Stress Store
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+One folder instead of one CSV per (load, component), shared by '3_Combination.py' (loads) and
+'1_Superposition.py' / '3_Final_GA_RSM.py' (cases):
+
+    stress_store/
+        meta.json           axis names, feature names, number of design points
+        design_points.bin   int64   (n_dp,)                                     dp index, "dp{index}"
+        features.bin        float64 (n_dp, n_features)                          RSM inputs of the dp
+        stress.bin          float32 (n_dp, n_load, n_component, n_stat)         NaN where missing
+
+The .bin files are raw arrays without header, so new design points are appended to the end of the files
+and nothing already written is touched. meta.json is replaced after the data is on disk: rows past n_dp
+(from a crash while appending) are not part of the store and get cut off by the next append. Design
+points that are already in the store are overwritten in place.
+
+Readers slice the memory map, e.g. store.stress[:, store.load_index("Case1")] is every dp of one case.
+Writers with more data than fits in memory reserve() the rows and fill store.stress block by block.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STORE_FOLDER = "stress_store"
+FORMAT_VERSION = 1
+META_NAME = "meta.json"
+FILES = {"design_points": np.int64, "features": np.float64, "stress": np.float32}
+
+
+def store_path(stage_folder):
+    return os.path.join(stage_folder, STORE_FOLDER)
+
+
+def dp_index(name):
+    """int dp index of a 'dpX' name."""
+    return int(str(name).strip()[2:])
+
+
+def _write_meta(path, meta):
+    tmp = os.path.join(path, META_NAME + ".part")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(path, META_NAME))
+
+
+class StressStore:
+    """[dp, load, component, statistic] stresses plus the RSM inputs of every dp."""
+
+    def __init__(self, path, mode="r"):
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, META_NAME)) as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"❌ {path} has store version {self.meta['version']}, expected {FORMAT_VERSION}.")
+        self.load_names = self.meta["load_names"]
+        self.component_names = self.meta["component_names"]
+        self.stat_names = self.meta["stat_names"]
+        self.feature_names = self.meta["feature_names"]
+        self._map()
+
+    @classmethod
+    def create(cls, path, load_names, component_names, stat_names, feature_names):
+        os.makedirs(path, exist_ok=True)
+        for name in FILES:
+            open(os.path.join(path, f"{name}.bin"), "wb").close()
+        _write_meta(path, {
+            "version": FORMAT_VERSION,
+            "n_dp": 0,
+            "load_names": [str(n) for n in load_names],
+            "component_names": [str(n) for n in component_names],
+            "stat_names": [str(n) for n in stat_names],
+            "feature_names": [str(n) for n in feature_names],
+        })
+        return cls(path, mode="r+")
+
+    def _shape(self, name, n_dp):
+        return {
+            "design_points": (n_dp,),
+            "features": (n_dp, len(self.feature_names)),
+            "stress": (n_dp, len(self.load_names), len(self.component_names), len(self.stat_names)),
+        }[name]
+
+    def _map(self):
+        n_dp = self.meta["n_dp"]
+        for name, dtype in FILES.items():
+            shape = self._shape(name, n_dp)
+            if n_dp == 0 or 0 in shape:
+                array = np.zeros(shape, dtype=dtype)
+            else:
+                array = np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype, mode=self.mode, shape=shape)
+            setattr(self, name, array)
+        self._rows = {int(dp): i for i, dp in enumerate(self.design_points)}
+        self._inputs_digest = None
+
+    def __len__(self):
+        return self.meta["n_dp"]
+
+    def __contains__(self, dp):
+        return int(dp) in self._rows
+
+    @property
+    def dp_names(self):
+        return [f"dp{dp}" for dp in self.design_points]
+
+    def load_index(self, name):
+        return self.load_names.index(str(name))
+
+    def component_index(self, name):
+        return self.component_names.index(str(name))
+
+    def rows(self, dps):
+        return np.array([self._rows[int(dp)] for dp in dps], dtype=np.int64)
+
+    def write(self, design_points, features, stress, component_names=None):
+        """
+        Store [len(dps), load, component, stat] stresses. Components are matched by name when
+        component_names is given; components the store does not have raise ValueError.
+        """
+        if self.mode == "r":
+            raise ValueError("❌ Store opened read only.")
+        design_points = np.asarray(design_points, dtype=np.int64)
+        features = np.asarray(features, dtype=np.float64).reshape(len(design_points), len(self.feature_names))
+        stress = np.asarray(stress, dtype=np.float32)
+        if component_names is not None and list(component_names) != self.component_names:
+            unknown = [name for name in component_names if name not in self.component_names]
+            if unknown:
+                raise ValueError(f"❌ Components not in the store {self.path}: {', '.join(unknown)}")
+            aligned = np.full(stress.shape[:2] + (len(self.component_names),) + stress.shape[3:], np.nan,
+                              dtype=np.float32)
+            aligned[:, :, [self.component_names.index(name) for name in component_names]] = stress
+            stress = aligned
+
+        known = np.array([int(dp) in self._rows for dp in design_points], dtype=bool)
+        if known.any():
+            rows = self.rows(design_points[known])
+            self.features[rows] = features[known]
+            self.stress[rows] = stress[known]
+            self.flush()
+
+        new = ~known
+        if new.any():
+            self._append(design_points[new], features[new], stress[new])
+
+    def reserve(self, design_points, features):
+        """
+        Rows of the design points for filling stress in place (store.stress[rows, ...] = block).
+        New design points are appended with NaN stress, written one dp at a time.
+        """
+        if self.mode == "r":
+            raise ValueError("❌ Store opened read only.")
+        design_points = np.asarray(design_points, dtype=np.int64)
+        features = np.asarray(features, dtype=np.float64).reshape(len(design_points), len(self.feature_names))
+        known = np.array([int(dp) in self._rows for dp in design_points], dtype=bool)
+        if known.any():
+            self.features[self.rows(design_points[known])] = features[known]
+            self.flush()
+        if (~known).any():
+            self._append(design_points[~known], features[~known], None)
+        return self.rows(design_points)
+
+    def flush(self):
+        self._inputs_digest = None                      # features may have been overwritten in place
+        for name in FILES:
+            array = getattr(self, name)
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def _append(self, design_points, features, stress):
+        # stress None appends NaN rows
+        n_dp = self.meta["n_dp"]
+        for name in FILES:
+            setattr(self, name, None)               # Windows does not resize files that are mapped
+        nan_row = np.full(self._shape("stress", 1), np.nan, dtype=np.float32).tobytes()
+        for name, block in (("design_points", design_points), ("features", features), ("stress", stress)):
+            file_path = os.path.join(self.path, f"{name}.bin")
+            stored_bytes = n_dp * int(np.prod(self._shape(name, 1))) * np.dtype(FILES[name]).itemsize
+            with open(file_path, "r+b") as f:
+                if os.path.getsize(file_path) != stored_bytes:
+                    f.truncate(stored_bytes)        # rows of an append cut off by a crash
+                f.seek(stored_bytes)
+                if block is None:
+                    for _ in range(len(design_points)):
+                        f.write(nan_row)
+                else:
+                    f.write(np.ascontiguousarray(block, dtype=FILES[name]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.meta["n_dp"] = n_dp + len(design_points)
+        _write_meta(self.path, self.meta)
+        self._map()
+
+    def signature(self, load, component):
+        """SHA-1 of the design points, inputs and stresses of one (load, component), to tell when its data changed."""
+        if self._inputs_digest is None:
+            digest = hashlib.sha1()
+            for array in (self.design_points, self.features):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._inputs_digest = digest
+        digest = self._inputs_digest.copy()
+        digest.update(np.ascontiguousarray(self.stress[:, self.load_index(load), self.component_index(component)]).tobytes())
+        return digest.hexdigest()
+
+    def frame(self, load, component):
+        """The old Component_stresses / Superposition CSV of one (load, component): dp, inputs, stresses."""
+        values = np.asarray(self.stress[:, self.load_index(load), self.component_index(component)],
+                            dtype=np.float64)
+        has_row = ~np.isnan(values).all(axis=1)
+        df = pd.DataFrame(np.asarray(self.features)[has_row], columns=self.feature_names)
+        df.insert(0, "Design Points", [f"dp{dp}" for dp in np.asarray(self.design_points)[has_row]])
+        return pd.concat([df, pd.DataFrame(values[has_row], columns=self.stat_names)], axis=1)
+
+    def training_arrays(self, load, component):
+        """(X, Y) of one (load, component) without the dp name column, only dps that have stresses."""
+        values = np.asarray(self.stress[:, self.load_index(load), self.component_index(component)],
+                            dtype=np.float64)
+        has_row = ~np.isnan(values).all(axis=1)
+        return np.asarray(self.features)[has_row], values[has_row]
+
+
+def open_store(stage_folder, mode="r"):
+    """StressStore of a stage folder (Component_stresses, Superposition), None when there is none."""
+    path = store_path(stage_folder)
+    return StressStore(path, mode) if os.path.exists(os.path.join(path, META_NAME)) else None
+
+
+def open_or_create_store(stage_folder, load_names, component_names, stat_names, feature_names):
+    store = open_store(stage_folder, mode="r+")
+    if store is None:
+        return StressStore.create(store_path(stage_folder), load_names, component_names, stat_names, feature_names)
+    for axis, names in (("load_names", load_names), ("stat_names", stat_names), ("feature_names", feature_names)):
+        if list(names) != getattr(store, axis):
+            raise ValueError(f"❌ {axis} differ from the existing store {store.path}, move it away to start a new one.")
+    return store
@@ -0,0 +1,140 @@
+"""
+Superposition of Unit Load Stresses
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Stress is linear in the load, so every row of the force table is a weighted sum of the six unit load
+cases. With the multipliers of all rows as a matrix M [case, load] the whole table is one matrix product
+
+    case_stress[dp, case, component, stat] = sum_load  M[case, load] * unit_stress[dp, load, component, stat]
+
+done in blocks of chunk_cases rows and chunk_dps design points straight into the memory mapped
+stress store, so a load spectrum of tens of thousands of rows never has to be in memory at once.
+
+Forces1.csv columns are Nx, Ny, Nxy, Mx, My, Mxy; the unit load cases of the Ansys model are
+load1..3 = Mx, My, Mxy per 100 and load4..6 = Nx, Ny, Nxy per 1000 (LOAD_COLUMNS).
+
+Two ways to superpose:
+
+- superpose_store: the per component extrema of the unit loads (Component_stresses store) are summed.
+  Fast, but the extrema of different loads can sit at different nodes, so the sum is only an estimate
+  of the extreme of the combined field.
+- node_envelopes: the node fields of the unit loads (dp bundle or text exports) are superposed first and
+  the max/min of every component taken from the combined field, which is the correct envelope. Only the
+  nodes that belong to a component are gathered, and the cases are done in blocks of at most block_bytes,
+  so the memory is one design point plus one block whatever the number of cases.
+"""
+
+import numpy as np
+import pandas as pd
+
+from fea_ga.components import ComponentIndex
+from fea_ga.dp_bundle import design_point_fields
+
+# (Forces1.csv column, scale) of load1 ... load6
+LOAD_COLUMNS = [(3, 100), (4, 100), (5, 100), (0, 1000), (1, 1000), (2, 1000)]
+
+
+def multiplier_matrix(forces_df, load_columns=LOAD_COLUMNS):
+    """M [case, load] from a force table, one case per row."""
+    forces = forces_df.to_numpy(dtype=np.float64)
+    return np.column_stack([forces[:, column] / scale for column, scale in load_columns])
+
+
+def dominant_stress(stress, stat_names):
+    """
+    The one of every '<name>_max' / '<name>_min' pair with the larger magnitude (the max on a tie).
+    Returns (names, dominant[..., n_names]).
+    """
+    max_cols = [i for i, name in enumerate(stat_names) if name.endswith("_max")]
+    names = [stat_names[i][:-len("_max")] for i in max_cols]
+    min_cols = [stat_names.index(name + "_min") for name in names]
+    return names, dominant(stress[..., max_cols], stress[..., min_cols])
+
+
+def dominant(maxima, minima):
+    """Element wise the one of max and min with the larger magnitude, the max on a tie."""
+    return np.where(np.abs(maxima) >= np.abs(minima), maxima, minima)
+
+
+def dominant_frame(df, n_leading=12):
+    """
+    A Component_stresses table (dp, inputs, '<name>_max', '<name>_min', ...) in the layout of a
+    Superposition table: the first n_leading columns, then the dominant of every max/min pair.
+    """
+    stat_names = list(df.columns[n_leading:])
+    names, values = dominant_stress(df.iloc[:, n_leading:].to_numpy(dtype=np.float64), stat_names)
+    return pd.concat([df.iloc[:, :n_leading].reset_index(drop=True), pd.DataFrame(values, columns=names)], axis=1)
+
+
+def superpose(unit_stress, multipliers):
+    """[dp, load, component, stat] unit stresses and M [case, load] -> [dp, case, component, stat]."""
+    n_dp, n_load = unit_stress.shape[:2]
+    flat = unit_stress.reshape(n_dp, n_load, -1)
+    return (multipliers @ flat).reshape((n_dp, len(multipliers)) + unit_stress.shape[2:])
+
+
+def superpose_store(unit_store, unit_rows, multipliers, case_store, case_rows, loads=range(1, 7),
+                    chunk_cases=64, chunk_dps=512):
+    """
+    Superpose the dominant unit load stresses of unit_store rows into case_store rows (reserved with
+    case_store.reserve), chunk_dps design points x chunk_cases cases at a time.
+    """
+    load_index = [unit_store.load_index(f"load{load}") for load in loads]
+    for d0 in range(0, len(unit_rows), chunk_dps):
+        dps = slice(d0, min(d0 + chunk_dps, len(unit_rows)))
+        unit = np.asarray(unit_store.stress[unit_rows[dps]], dtype=np.float64)[:, load_index]
+        _, unit_dominant = dominant_stress(unit, unit_store.stat_names)
+        for c0 in range(0, len(multipliers), chunk_cases):
+            cases = slice(c0, min(c0 + chunk_cases, len(multipliers)))
+            case_store.stress[case_rows[dps], cases] = superpose(unit_dominant, multipliers[cases])
+    case_store.flush()
+
+
+def node_envelopes(index, node_ids, unit_fields, multipliers, block_bytes=256 * 2**20):
+    """
+    Max and min of every component of the superposed node fields of one design point.
+    unit_fields [load, node, label] in node_ids order with the loads in the column order of M [case, load].
+    Returns (max, min) [case, component, label] in index.names order, NaN for components without nodes.
+    A node missing in a load export is NaN in the combined field of that label and skipped by the max/min.
+    """
+    n_load, _, n_label = unit_fields.shape
+    maxima = np.full((len(multipliers), len(index), n_label), np.nan)
+    minima = np.full_like(maxima, np.nan)
+
+    rows = index.rows(node_ids)
+    keep = rows >= 0
+    rows, labels = rows[keep], index.labels[keep]
+    if not len(rows):
+        return maxima, minima
+    counts = np.bincount(labels, minlength=len(index))
+    present = np.flatnonzero(counts)
+    starts = (np.cumsum(counts) - counts)[present]
+
+    members = np.asarray(unit_fields[:, rows], dtype=np.float64).reshape(n_load, -1)
+    chunk_cases = max(1, block_bytes // members[0].nbytes)
+    for c0 in range(0, len(multipliers), chunk_cases):
+        cases = slice(c0, min(c0 + chunk_cases, len(multipliers)))
+        fields = (multipliers[cases] @ members).reshape(-1, len(rows), n_label)
+        maxima[cases, present] = np.fmax.reduceat(fields, starts, axis=1)
+        minima[cases, present] = np.fmin.reduceat(fields, starts, axis=1)
+        del fields                                  # one block alive at a time
+    return maxima, minima
+
+
+def superpose_design_point(dp_path, multipliers, component_names, loads=range(1, 7), block_bytes=256 * 2**20):
+    """
+    Node level superposition of one design point folder (bundle or text exports).
+    Returns the dominant of the envelope [case, component, label] float32 with the components in
+    component_names order (NaN where the design point does not have one), and a list of warnings.
+    """
+    components, node_ids, unit_fields = design_point_fields(dp_path, loads)
+    index = ComponentIndex(components)
+    maxima, minima = node_envelopes(index, np.asarray(node_ids), unit_fields, multipliers, block_bytes)
+    result = np.full((len(multipliers), len(component_names), maxima.shape[2]), np.nan, dtype=np.float32)
+    position = {name: k for k, name in enumerate(index.names)}
+    found = [j for j, name in enumerate(component_names) if name in position]
+    result[:, found] = dominant(maxima, minima)[:, [position[component_names[j]] for j in found]]
+    warnings = [f"⚠️ {name} not in the node files of {dp_path}" for name in component_names if name not in position]
+    return result, warnings
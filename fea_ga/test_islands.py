@@ -0,0 +1,86 @@
+"""
+Checks of the Island Model GA
+--------------------------------------------------
+Author: Pranav Deshpande
+Date: July 2025
+
+Plain Python on a small synthetic RSM bank, no stress store needed (also collected by pytest):
+
+    python fea_ga/test_islands.py
+
+- A ranking function, as shared_ranking of '3_Final_GA_RSM.py' allows, names its columns before there is a
+  population and runs on the islands (it is sent to the workers, so it lives at module level).
+- The same seed and number of islands give the same population.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fea_ga.evolution import DesignSpace, SharedPopulationGA
+from fea_ga.failure import MaxStressCriterion
+from fea_ga.islands import IslandGA
+from fea_ga.rsm import CompiledPredictor, fit_bank
+
+design_space = DesignSpace(
+    n_inputs=11,
+    fixed={0: 200, 1: 10, 6: 20},
+    uniform={2: (0.7*20, 1.3*20), 3: (0.7*60, 1.3*60), 4: (0.85*150, 1.15*150), 5: (0.7*25, 1.3*25)},
+    fractions=[7, 8, 9],
+    count=(10, 10, 100),
+    mutated=[2, 3, 4, 5, 7, 8, 9, 10],
+)
+allowables = [513e6, 513e6, 50e6, -437e6, -437e6, -150e6, 120e6, 55e6, 55e6]
+
+
+def mean_and_worst(fitness):
+    """Ranking function: mean and worst fitness of every candidate over all keys."""
+    return np.column_stack([fitness.mean(axis=1), fitness.min(axis=1)])
+
+
+def synthetic_setup(n_cases=2, n_components=3, seed=0):
+    rng = np.random.default_rng(seed)
+    X = design_space.sample(80, rng)
+    Z = (X - X.mean(axis=0)) / np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)
+    base = np.hstack([Z, Z ** 2])
+    sets = {(f"Case{s + 1}", f"le_{c + 1}"): (X, base @ rng.normal(0.0, 2e7, (base.shape[1], 18)))
+            for s in range(n_cases) for c in range(n_components)}
+    names = [f"Ply{p}_S{s}" for p in (1, 2, 3) for s in ("X", "Y", "Z", "XY", "YZ", "XZ")]
+    predictor = CompiledPredictor(fit_bank(sets, [f"x{i}" for i in range(11)], names, degree=2))
+    keys = [(s, c, f"stress_{component}_case{s + 1}") for s in range(n_cases)
+            for c, component in enumerate(predictor.component_names)]
+    return predictor, MaxStressCriterion(allowables), keys
+
+
+def run_islands(predictor, criterion, keys, n_islands=2):
+    with IslandGA(predictor, criterion, keys, design_space, n_islands=n_islands, seed=3, migration_interval=2,
+                  population_size=40, ranking=mean_and_worst) as islands:
+        best = islands.evolve(3)
+        return best, islands.population()
+
+
+def test_ranking_function_names_before_population():
+    predictor, criterion, keys = synthetic_setup()
+    ga = SharedPopulationGA(predictor, criterion, keys, design_space, ranking=mean_and_worst)
+    assert ga.group_names == ["score0", "score1"], ga.group_names
+
+
+def test_islands_with_ranking_function():
+    predictor, criterion, keys = synthetic_setup()
+    names = SharedPopulationGA(predictor, criterion, keys, design_space, ranking=mean_and_worst).group_names
+    best, (inputs, fi, fitness, island) = run_islands(predictor, criterion, keys)
+    assert best.shape == (2, len(names)), best.shape
+    assert fi.shape == fitness.shape == (len(inputs), len(keys))
+    assert set(island.tolist()) == {0, 1}
+
+    again = run_islands(predictor, criterion, keys)[1]
+    assert all(np.array_equal(a, b) for a, b in zip((inputs, fi, fitness, island), again))
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")